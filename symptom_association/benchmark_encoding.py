@@ -0,0 +1,107 @@
+"""
+Encoding Benchmark
+Compares the legacy iterrows one-hot encoder with the vectorized
+preprocess_dataset path on a resampled copy of dataset.csv.
+
+Usage:
+    python benchmark_encoding.py                 # 1M rows, legacy timed on a 20k sample
+    python benchmark_encoding.py --rows 200000 --legacy-rows 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from real_data_loader import encode_symptom_matrix, preprocess_dataset
+
+
+def legacy_preprocess(df_main):
+    """The original row-by-row encoder, kept here as the benchmark baseline"""
+    disease_col = df_main.columns[0]
+    symptom_cols = [col for col in df_main.columns if col != disease_col]
+
+    df_processed = df_main.copy()
+    df_processed = df_processed.fillna('')
+
+    all_symptoms = set()
+    for col in symptom_cols:
+        symptoms = df_processed[col].unique()
+        all_symptoms.update([s.strip() for s in symptoms if s and s.strip()])
+    all_symptoms = sorted(list(all_symptoms))
+
+    binary_data = []
+    for idx, row in df_processed.iterrows():
+        disease = row[disease_col]
+        patient_symptoms = []
+        for col in symptom_cols:
+            symptom = str(row[col]).strip()
+            if symptom and symptom != '' and symptom != 'nan':
+                patient_symptoms.append(symptom)
+
+        binary_row = {'patient_id': f'P{idx+1:04d}', 'disease': disease}
+        for symptom in all_symptoms:
+            binary_row[symptom] = 1 if symptom in patient_symptoms else 0
+        binary_data.append(binary_row)
+
+    return pd.DataFrame(binary_data), all_symptoms
+
+
+def make_workload(n_rows, data_path='data/dataset.csv', seed=42):
+    """Resample dataset.csv rows (with replacement) up to n_rows"""
+    df = pd.read_csv(data_path)
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(df), size=n_rows)
+    return df.iloc[picks].reset_index(drop=True)
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark one-hot symptom encoding")
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help='rows for the vectorized run (default: 1M)')
+    parser.add_argument('--legacy-rows', type=int, default=20_000,
+                        help='rows for the legacy run; its time is scaled linearly to --rows')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("ENCODING BENCHMARK")
+    print("=" * 70)
+
+    df_big = make_workload(args.rows)
+    symptom_cols = list(df_big.columns[1:])
+    print(f"[*] Workload: {df_big.shape[0]:,} rows x {len(symptom_cols)} symptom columns")
+
+    # Correctness check on the legacy-sized sample first
+    df_small = df_big.iloc[:args.legacy_rows]
+    t_legacy, (legacy_df, legacy_symptoms) = time_call(legacy_preprocess, df_small)
+    new_df, new_symptoms = preprocess_dataset(df_small)
+    pd.testing.assert_frame_equal(new_df, legacy_df, check_dtype=False)
+    assert new_symptoms == legacy_symptoms
+    print(f"\n[OK] Vectorized output matches legacy on {len(df_small):,} rows")
+
+    t_encode, _ = time_call(encode_symptom_matrix, df_big, symptom_cols)
+    t_full, _ = time_call(preprocess_dataset, df_big)
+    t_legacy_scaled = t_legacy * args.rows / len(df_small)
+
+    print("\n" + "-" * 70)
+    report = [
+        (f"Legacy iterrows ({len(df_small):,} rows)", f"{t_legacy:.2f}s"),
+        (f"Legacy scaled to {args.rows:,} rows", f"{t_legacy_scaled:.2f}s (linear estimate)"),
+        ("encode_symptom_matrix", f"{t_encode:.2f}s"),
+        ("preprocess_dataset (full frame)", f"{t_full:.2f}s"),
+        ("Speedup (full frame)", f"{t_legacy_scaled / t_full:.0f}x"),
+    ]
+    for label, value in report:
+        print(f"{label + ':':<36} {value}")
+    print("-" * 70)
+
+
+if __name__ == "__main__":
+    main()
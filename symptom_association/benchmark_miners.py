@@ -0,0 +1,306 @@
+"""
+Miner Benchmark Suite
+Times every frequent itemset miner backend over a dataset size x density x
+min_support matrix and saves machine-readable results, so runs can be
+compared across commits.
+
+Timing runs in this process with perf_counter: WARMUPS untimed runs, then
+REPEATS timed runs summarised as median and IQR. Memory is measured
+separately, one child process per cell: the child maps the workload from a
+.stm file, records its peak RSS, mines once and reports the RSS growth.
+tracemalloc is never enabled, so it does not slow the timed runs.
+
+Workloads resample dataset.csv rows (see benchmark_encoding.make_workload);
+a density below 1.0 drops that fraction of each patient's symptoms at random.
+
+Usage:
+    python benchmark_miners.py                                 # default matrix
+    python benchmark_miners.py --rows 5000 50000 --supports 0.1 0.05 --miners eclat fpgrowth
+    python benchmark_miners.py --output benchmarks/new.json --compare benchmarks/old.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue as queue_module
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmark_encoding import make_workload
+from matrix_file import MatrixFile, MatrixFileWriter
+from miners import MINERS
+from real_data_loader import build_transaction_matrix
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, memory is not measured
+    resource = None
+
+
+ROWS = [5000, 50000]
+DENSITIES = [1.0, 0.5]
+SUPPORTS = [0.2, 0.1, 0.05]
+WARMUPS = 1
+REPEATS = 5
+MAX_SECONDS = 30.0  # A cell whose warmup exceeds this is timed once, not REPEATS times
+MEMORY_TIMEOUT = 600.0  # A memory child still running after this is killed
+REGRESSION_THRESHOLD = 1.10  # Median slowdown flagged by --compare
+DEFAULT_OUTPUT = 'benchmarks/miners.json'
+
+
+# ==================== WORKLOADS ====================
+def build_workload(n_rows, density=1.0, data_path='data/dataset.csv', seed=42):
+    """
+    TransactionMatrix of n_rows resampled patients at the given density
+
+    n_rows=None uses the dataset as recorded, without resampling.
+    """
+    df_main = pd.read_csv(data_path) if n_rows is None else make_workload(n_rows, data_path, seed=seed)
+    tm = build_transaction_matrix(df_main)
+    if density < 1.0:
+        keep = np.random.default_rng(seed + 1).random(tm.matrix.shape) < density
+        tm.matrix &= keep
+    return tm.drop_empty()
+
+
+def _peak_rss_mb():
+    """High-water RSS of this process in MB"""
+    # Linux keeps ru_maxrss across exec, so a spawned child would report the
+    # parent's peak; VmHWM belongs to the child's own address space
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+# ==================== MEASUREMENT ====================
+def time_miner(miner, df, min_support, warmups=WARMUPS, repeats=REPEATS, max_seconds=MAX_SECONDS):
+    """Median/IQR of repeated perf_counter timings after warmup runs"""
+    mine = MINERS[miner]
+    times = []
+    n_itemsets = None
+    for run in range(warmups + repeats):
+        start = time.perf_counter()
+        n_itemsets = len(mine(df, min_support=min_support, use_colnames=True))
+        elapsed = time.perf_counter() - start
+        if run >= warmups:
+            times.append(elapsed)
+        elif elapsed > max_seconds:
+            # Too slow to repeat; the warmup is the only sample
+            times.append(elapsed)
+            break
+
+    q25, median, q75 = np.percentile(times, [25, 50, 75])
+    return {
+        'itemsets': n_itemsets,
+        'times_s': [round(t, 6) for t in times],
+        'median_s': round(float(median), 6),
+        'iqr_s': round(float(q75 - q25), 6),
+        'min_s': round(min(times), 6),
+    }
+
+
+def _memory_child(miner, matrix_path, min_support, queue):
+    try:
+        df = MatrixFile(matrix_path).to_matrix().to_frame()
+        baseline = _peak_rss_mb()
+        MINERS[miner](df, min_support=min_support, use_colnames=True)
+        peak = _peak_rss_mb()
+        queue.put({'peak_rss_mb': round(peak, 2), 'rss_growth_mb': round(peak - baseline, 2)})
+    except Exception as e:
+        queue.put(f"{type(e).__name__}: {e}")
+
+
+def measure_memory(miner, matrix_path, min_support, timeout=MEMORY_TIMEOUT):
+    """
+    Peak RSS of one mining run in a fresh child process
+
+    Returns {'peak_rss_mb', 'rss_growth_mb'}: the child's high-water RSS and
+    how far mining raised it above the loaded workload. matrix_path is the
+    workload as a .stm file, so building it never sets the baseline peak.
+    A child that raises, dies (e.g. OOM-killed) or exceeds timeout seconds
+    yields {'memory_error': reason} instead.
+    """
+    if resource is None:
+        return {}
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    child = ctx.Process(target=_memory_child, args=(miner, matrix_path, min_support, queue))
+    child.start()
+    deadline = time.perf_counter() + timeout
+    result = None
+    while result is None:
+        try:
+            result = queue.get(timeout=1.0)
+        except queue_module.Empty:
+            if child.exitcode is not None:
+                result = f"child exited with code {child.exitcode} before reporting"
+            elif time.perf_counter() > deadline:
+                child.terminate()
+                result = f"no result within {timeout:.0f}s"
+    child.join()
+    if isinstance(result, str):
+        print(f"     [!] Memory run failed: {result}")
+        return {'memory_error': result}
+    return result
+
+
+# ==================== SUITE ====================
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(miners=None, rows=ROWS, densities=DENSITIES, supports=SUPPORTS,
+              warmups=WARMUPS, repeats=REPEATS, max_seconds=MAX_SECONDS,
+              memory=True, data_path='data/dataset.csv'):
+    """
+    Benchmark every miner on every (rows, density, support) cell
+
+    Returns {'meta': {...}, 'results': [...]}, one result per cell and miner.
+    """
+    import mlxtend
+
+    miners = miners or sorted(MINERS)
+    results = []
+    workdir = tempfile.mkdtemp(prefix='benchmark_miners_')
+    matrix_path = os.path.join(workdir, 'workload.stm')
+    try:
+        for n_rows in rows:
+            for density in densities:
+                tm = build_workload(n_rows, density, data_path)
+                df = tm.to_frame()
+                actual_density = tm.density
+                if memory:
+                    writer = MatrixFileWriter(matrix_path, tm.symptoms)
+                    writer.append(tm.matrix, tm.diseases, tm.patient_ids)
+                    writer.close()
+                print(f"\n[*] {tm.n_rows:,} rows x {tm.n_items} symptoms, "
+                      f"density {actual_density:.3f}")
+                for min_support in supports:
+                    for miner in miners:
+                        result = {'miner': miner, 'rows': n_rows, 'density': density,
+                                  'actual_density': round(actual_density, 4),
+                                  'min_support': min_support}
+                        result.update(time_miner(miner, df, min_support, warmups, repeats,
+                                                 max_seconds))
+                        if memory:
+                            result.update(measure_memory(miner, matrix_path, min_support))
+                        results.append(result)
+
+                        memory_text = (f"+{result['rss_growth_mb']:.1f} MB "
+                                       f"(peak {result['peak_rss_mb']:.0f})"
+                                       if 'rss_growth_mb' in result else
+                                       'memory failed' if 'memory_error' in result else '')
+                        print(f"     support {min_support:<5} {miner:<15} {result['median_s']:9.4f}s "
+                              f"(IQR {result['iqr_s']:.4f}s, n={len(result['times_s'])}) "
+                              f"{result['itemsets']:>8} itemsets {memory_text}")
+    finally:
+        # Also on failure or Ctrl-C, so no workload file is left behind
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    meta = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'mlxtend': mlxtend.__version__,
+        'warmups': warmups,
+        'repeats': repeats,
+        'data_path': data_path,
+    }
+    return {'meta': meta, 'results': results}
+
+
+def save_results(suite, filepath=DEFAULT_OUTPUT):
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filepath, 'w') as f:
+        json.dump(suite, f, indent=2)
+    print(f"\n[OK] Saved benchmark results to: {filepath}")
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Print per-cell median ratios current / baseline
+
+    A cell is flagged when it is more than threshold slower and the gap is
+    larger than both runs' IQRs (so noisy cells are not reported as changes).
+    Returns the flagged cells.
+    """
+    def key(result):
+        return result['miner'], result['rows'], result['density'], result['min_support']
+
+    before = {key(result): result for result in baseline['results']}
+    regressions = []
+    print(f"\n[*] Compared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for result in current['results']:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        ratio = result['median_s'] / old['median_s'] if old['median_s'] else float('inf')
+        gap = result['median_s'] - old['median_s']
+        flagged = ratio > threshold and gap > max(result['iqr_s'], old['iqr_s'])
+        if flagged:
+            regressions.append(result)
+        miner, n_rows, density, min_support = key(result)
+        print(f"     {miner:<15} rows={str(n_rows):<8} density={density:<4} support={min_support:<5} "
+              f"{old['median_s']:.4f}s -> {result['median_s']:.4f}s ({ratio:.2f}x)"
+              f"{'  [!] REGRESSION' if flagged else ''}")
+    print(f"[OK] {len(regressions)} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the frequent itemset miners")
+    parser.add_argument('--miners', nargs='+', choices=sorted(MINERS), default=None,
+                        help="backends to run (default: all registered)")
+    parser.add_argument('--rows', nargs='+', type=int, default=ROWS)
+    parser.add_argument('--densities', nargs='+', type=float, default=DENSITIES,
+                        help="fraction of each patient's symptoms kept")
+    parser.add_argument('--supports', nargs='+', type=float, default=SUPPORTS)
+    parser.add_argument('--warmups', type=int, default=WARMUPS)
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--max-seconds', type=float, default=MAX_SECONDS,
+                        help="time slower cells once instead of repeating them")
+    parser.add_argument('--no-memory', action='store_true', help="skip the child-process RSS runs")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--compare', metavar='JSON', default=None,
+                        help="earlier results to compare medians against")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("MINER BENCHMARK")
+    print("=" * 70)
+
+    suite = run_suite(args.miners, args.rows, args.densities, args.supports,
+                      args.warmups, args.repeats, args.max_seconds, memory=not args.no_memory)
+    save_results(suite, args.output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(json.load(f), suite)
+
+
+if __name__ == "__main__":
+    main()
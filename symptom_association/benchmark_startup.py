@@ -0,0 +1,133 @@
+"""
+CLI Startup Benchmark
+Times how long symptom_analysis_updated takes to become usable, in fresh
+interpreters, and checks that headless runs never import the plotting stacks.
+
+Each command runs in a new subprocess (so nothing is already imported):
+WARMUPS untimed runs, then REPEATS timed runs summarised as median and IQR.
+'python' is the bare interpreter, the floor every other number includes;
+'mine' is a cold, uncached 'mine' stage run on the encoded matrix (encoded
+first if missing). The run fails (exit code 1) when a command's median
+exceeds its budget or a module from LAZY_MODULES is loaded by importing the
+pipeline or by the mining stage.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --repeats 20 --output benchmarks/startup.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+WARMUPS = 1
+REPEATS = 10
+DEFAULT_OUTPUT = 'benchmarks/startup.json'
+
+# Commands timed, with their median budget in seconds (None = no budget)
+COMMANDS = {
+    'python': ([sys.executable, '-c', 'pass'], None),
+    'import': ([sys.executable, '-c', 'import symptom_analysis_updated'], 1.5),
+    'help': ([sys.executable, 'symptom_analysis_updated.py', '--help'], 1.5),
+    'mine': ([sys.executable, 'symptom_analysis_updated.py', '--no-cache', 'mine'], 2.0),
+}
+
+# Loaded only by the stages that need them (plots.py, the mlxtend miners)
+LAZY_MODULES = ['matplotlib', 'seaborn', 'networkx', 'plotly', 'mlxtend']
+
+# Code run in a fresh interpreter before listing the LAZY_MODULES it loaded
+LAZY_CHECKS = {
+    'import': 'import symptom_analysis_updated',
+    'mine': 'import symptom_analysis_updated as pipeline; pipeline.run_mine(use_cache=False)',
+}
+
+
+def time_command(argv, warmups=WARMUPS, repeats=REPEATS):
+    """Median/IQR wall time of running argv to completion"""
+    times = []
+    for run in range(warmups + repeats):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, check=True)
+        elapsed = time.perf_counter() - start
+        if run >= warmups:
+            times.append(elapsed)
+
+    q25, median, q75 = np.percentile(times, [25, 50, 75])
+    return {
+        'times_s': [round(t, 6) for t in times],
+        'median_s': round(float(median), 6),
+        'iqr_s': round(float(q75 - q25), 6),
+    }
+
+
+def loaded_lazy_modules(statement='import symptom_analysis_updated'):
+    """LAZY_MODULES present in sys.modules after running statement"""
+    code = (f"import json, sys; {statement}; "
+            f"print(json.dumps(sorted({{name.split('.')[0] for name in sys.modules}} & {set(LAZY_MODULES)!r})))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def ensure_encoded():
+    """Encode the dataset (untimed) so the 'mine' command has its input"""
+    from symptom_analysis_updated import PROCESSED_MATRIX
+
+    if not os.path.exists(PROCESSED_MATRIX):
+        print(f"[*] {PROCESSED_MATRIX} missing, encoding the dataset first...")
+        subprocess.run([sys.executable, 'symptom_analysis_updated.py', 'encode'],
+                       stdout=subprocess.DEVNULL, check=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis CLI start-up time")
+    parser.add_argument('--warmups', type=int, default=WARMUPS)
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("STARTUP BENCHMARK")
+    print("=" * 70)
+
+    ensure_encoded()
+    failures = []
+    results = {}
+    for name, (argv, budget) in COMMANDS.items():
+        result = time_command(argv, args.warmups, args.repeats)
+        result['budget_s'] = budget
+        results[name] = result
+        over = budget is not None and result['median_s'] > budget
+        if over:
+            failures.append(f"{name}: median {result['median_s']:.3f}s over budget {budget}s")
+        print(f"   {name:<8} {result['median_s']:7.3f}s (IQR {result['iqr_s']:.3f}s, n={args.repeats})"
+              f"{f'  budget {budget}s' if budget else ''}{'  [!] OVER BUDGET' if over else ''}")
+
+    lazy = {}
+    for name, statement in LAZY_CHECKS.items():
+        lazy[name] = loaded_lazy_modules(statement)
+        if lazy[name]:
+            failures.append(f"{name} loads {', '.join(lazy[name])}")
+        print(f"   Plotting/mlxtend modules loaded by {name}: {', '.join(lazy[name]) or 'none'}")
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump({'commands': results, 'lazy_modules_loaded': lazy, 'failures': failures}, f, indent=2)
+    print(f"\n[OK] Saved startup results to: {args.output}")
+
+    if failures:
+        for failure in failures:
+            print(f"[!] {failure}")
+        sys.exit(1)
+    print("[OK] Start-up within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Bitset Helpers
+Packed uint64 bit vectors (one bit per transaction) with popcount support counting.
+"""
+
+import numpy as np
+
+
+WORD_BITS = 64
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount_words(words):
+        return np.bitwise_count(words)
+else:
+    # NumPy < 2.0: count set bits per byte through a lookup table
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount_words(words):
+        as_bytes = words.view(np.uint8).reshape(words.shape + (8,))
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.uint64)
+
+
+def n_words(n_rows):
+    """Number of uint64 words needed to hold n_rows bits"""
+    return (n_rows + WORD_BITS - 1) // WORD_BITS
+
+
+def pack_columns(matrix):
+    """
+    Pack a (n_rows x n_items) bool matrix column-wise
+
+    Returns a (n_items x n_words) uint64 array: row i is the tidset of item i,
+    bit r set when transaction r contains the item. Padding bits are zero.
+    """
+    matrix = np.asarray(matrix, dtype=bool)
+    n_rows, n_items = matrix.shape
+    width = n_words(n_rows)
+
+    packed = np.zeros((n_items, width * 8), dtype=np.uint8)
+    if n_rows:
+        packed[:, :(n_rows + 7) // 8] = np.packbits(matrix.T, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64, copy=False)
+
+
+def unpack_columns(bits, n_rows):
+    """Inverse of pack_columns: (n_items x n_words) uint64 -> (n_rows x n_items) bool"""
+    as_bytes = np.ascontiguousarray(bits, dtype='<u8').view(np.uint8)
+    unpacked = np.unpackbits(as_bytes, axis=1, count=n_rows, bitorder='little')
+    return unpacked.T.astype(bool)
+
+
+def popcount(bits):
+    """Number of set bits along the last axis"""
+    return _popcount_words(bits).sum(axis=-1, dtype=np.int64)
+
+
+def min_count_for(min_support, n_rows):
+    """
+    Smallest absolute count c with c / n_rows >= min_support
+
+    Uses the same float comparison as mlxtend so the itemsets kept at the
+    threshold boundary are identical.
+    """
+    if n_rows == 0:
+        return 0
+    count = max(int(np.ceil(min_support * n_rows)), 0)
+    while count > 0 and (count - 1) / n_rows >= min_support:
+        count -= 1
+    while count / n_rows < min_support:
+        count += 1
+    return count
@@ -0,0 +1,316 @@
+"""
+Closed and Maximal Itemset Mining
+Condensed representations of the frequent itemsets, plus the non-redundant
+(min-max basis) rules that can be generated from them.
+
+A frequent itemset is closed when no proper superset has the same support,
+and maximal when no proper superset is frequent. Closed itemsets are
+lossless: the support of any frequent itemset is the largest support of a
+closed superset (see ClosedSupports). They are mined with LCM's
+prefix-preserving closure extension over packed tidsets, so each closed set
+is reached exactly once and no duplicate check is needed.
+
+Rules are generated from minimal generators g (no proper subset has the same
+support) to closed itemsets C containing closure(g):
+- exact rules g -> closure(g) - g (confidence 1);
+- approximate rules g -> C - g for closed C strictly containing closure(g).
+Every rule of the full rule set and its metrics can be derived from these,
+while the sub/super-set variants of the same symptom cluster are dropped.
+
+    closed = closed_itemsets(tm, min_support=0.05, use_colnames=True, with_generators=True)
+    rules = basis_rules(closed, min_confidence=0.6, min_lift=1.2)
+"""
+
+import numpy as np
+import pandas as pd
+
+from bitset import pack_columns, popcount, min_count_for
+from vertical import as_vertical
+from rule_metrics import rules_frame
+
+
+def _closure(bits, tidset):
+    """Indices of the items whose tidset contains tidset"""
+    return np.flatnonzero(((bits & tidset) == tidset).all(axis=1))
+
+
+def _all_rows(n_rows):
+    """Packed tidset with every transaction set"""
+    return pack_columns(np.ones((n_rows, 1), dtype=bool))[0]
+
+
+def _mine_closed(bits, min_count, max_len, tidset, out, core=-1, closed=None):
+    """
+    LCM over the items of bits (already restricted to frequent items)
+
+    closed is the closure of tidset. Only extensions e > core are tried and
+    an extension is kept only if its closure adds no item below e, so every
+    closed itemset has a single parent. out gets (items, count, maximal):
+    maximal when no item outside the closed set extends it frequently.
+    """
+    if closed is None:
+        closed = _closure(bits, tidset)
+    in_closed = np.zeros(len(bits), dtype=bool)
+    in_closed[closed] = True
+
+    child_bits = bits & tidset
+    child_counts = popcount(child_bits)
+    extensions = np.flatnonzero((child_counts >= min_count) & ~in_closed)
+
+    if len(closed):
+        out.append((tuple(int(i) for i in closed), int(popcount(tidset)), len(extensions) == 0))
+
+    for e in extensions[extensions > core]:
+        child = _closure(bits, child_bits[e])
+        if (~in_closed[child[child < e]]).any():
+            continue
+        if max_len is not None and len(child) > max_len:
+            continue
+        _mine_closed(bits, min_count, max_len, child_bits[e], out, e, child)
+
+
+def _minimal_generators(bits, min_count, n_rows):
+    """
+    {generator: tidset} for every frequent minimal generator, levelwise
+
+    Generators are downward closed, so level k joins generators of level
+    k - 1 sharing a prefix and keeps those whose every (k-1)-subset is a
+    generator with a strictly larger count.
+    """
+    counts = {(): n_rows}
+    level = {}
+    for item, count in enumerate(popcount(bits)):
+        if min_count <= count < n_rows:
+            counts[(item,)] = int(count)
+            level[(item,)] = bits[item]
+    generators = dict(level)
+
+    while level:
+        by_prefix = {}
+        for itemset in level:
+            by_prefix.setdefault(itemset[:-1], []).append(itemset[-1])
+
+        next_level = {}
+        for prefix, lasts in by_prefix.items():
+            lasts.sort()
+            for i, a in enumerate(lasts):
+                for b in lasts[i + 1:]:
+                    candidate = prefix + (a, b)
+                    subsets = [candidate[:k] + candidate[k + 1:] for k in range(len(candidate))]
+                    if not all(subset in counts for subset in subsets):
+                        continue
+                    tidset = level[prefix + (a,)] & level[prefix + (b,)]
+                    count = int(popcount(tidset))
+                    if count < min_count or any(count == counts[s] for s in subsets):
+                        continue
+                    counts[candidate] = count
+                    next_level[candidate] = tidset
+        generators.update(next_level)
+        level = next_level
+    return generators
+
+
+def _closed_frame(found, n_rows, columns, generators=None):
+    """['support', 'itemsets'(, 'generators')] frame like eclat.itemsets_to_frame"""
+    found = sorted(found, key=lambda entry: (len(entry[0]), entry[0]))
+    name = (lambda i: columns[i]) if columns is not None else (lambda i: i)
+
+    supports = np.array([count for _, count, _ in found], dtype=np.int64) / n_rows if n_rows else []
+    frame = pd.DataFrame({
+        'support': supports,
+        'itemsets': [frozenset(name(i) for i in items) for items, _, _ in found],
+    }, columns=['support', 'itemsets'])
+    if generators is not None:
+        frame['generators'] = [[frozenset(name(i) for i in g) for g in generators.get(items, [])]
+                               for items, _, _ in found]
+    return frame
+
+
+def _mine(df, min_support, max_len, with_generators=False):
+    if not 0.0 < min_support <= 1.0:
+        raise ValueError(f"min_support must be in (0, 1], got {min_support}")
+
+    db = as_vertical(df)
+    bits, columns, n_rows = db.bits, db.symptoms, db.n_rows
+    min_count = max(min_count_for(min_support, n_rows), 1)
+
+    frequent = np.flatnonzero(db.item_counts >= min_count)
+    found = []
+    if n_rows and len(frequent):
+        _mine_closed(bits[frequent], min_count, max_len, _all_rows(n_rows), found)
+    # Back to column indices
+    found = [(tuple(int(frequent[i]) for i in items), count, maximal)
+             for items, count, maximal in found]
+
+    generators = None
+    if with_generators and n_rows and len(frequent):
+        generators = {}
+        sub_bits = bits[frequent]
+        for generator, tidset in _minimal_generators(sub_bits, min_count, n_rows).items():
+            closed = tuple(int(frequent[i]) for i in _closure(sub_bits, tidset))
+            generators.setdefault(closed, []).append(tuple(int(frequent[i]) for i in generator))
+    return found, n_rows, columns, generators
+
+
+def closed_itemsets(df, min_support=0.5, use_colnames=False, max_len=None,
+                    with_generators=False):
+    """
+    Frequent closed itemsets with LCM
+
+    Parameters mirror eclat. with_generators adds a 'generators' column
+    listing each closed itemset's minimal generators (what basis_rules needs).
+    """
+    found, n_rows, columns, generators = _mine(df, min_support, max_len, with_generators)
+    return _closed_frame(found, n_rows, columns if use_colnames else None, generators)
+
+
+def _bits_of(mask):
+    """Positions of the set bits of an int, ascending"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _containing(masks, n_items):
+    """Per item, the int bitmask of the masks (by position) containing it"""
+    containing = [0] * n_items
+    for position, mask in enumerate(masks):
+        for item in _bits_of(mask):
+            containing[item] |= 1 << position
+    return containing
+
+
+def _supersets_of(mask, containing, everything):
+    """Bitmask of the positions whose mask contains mask: AND of its items' tidsets"""
+    found = everything
+    for item in _bits_of(mask):
+        found &= containing[item]
+    return found
+
+
+class ClosedSupports:
+    """
+    Support of any frequent itemset from a closed itemset frame
+
+    support(X) is the largest support among closed supersets of X; None when
+    X has no closed superset (X is not frequent). Closed itemsets are kept
+    in descending support order with a tidset (int bitmask over that order)
+    per item, so a lookup ANDs the tidsets of X's items and takes the lowest
+    bit; lookups are memoized.
+    """
+
+    def __init__(self, closed):
+        self.vocabulary = {}
+        for itemset in closed['itemsets']:
+            for item in itemset:
+                self.vocabulary.setdefault(item, len(self.vocabulary))
+
+        order = np.argsort(-closed['support'].to_numpy(), kind='stable')
+        self.masks = [self.mask(closed['itemsets'].iloc[i]) for i in order]
+        self.supports = [float(closed['support'].iloc[i]) for i in order]
+        self.containing = _containing(self.masks, len(self.vocabulary))
+        self._everything = (1 << len(self.masks)) - 1
+        self._cache = {}
+
+    def mask(self, itemset):
+        """Bitmask of itemset over the vocabulary (None if an item is unknown)"""
+        mask = 0
+        for item in itemset:
+            if item not in self.vocabulary:
+                return None
+            mask |= 1 << self.vocabulary[item]
+        return mask
+
+    def support_of_mask(self, mask):
+        if mask not in self._cache:
+            found = _supersets_of(mask, self.containing, self._everything)
+            self._cache[mask] = self.supports[(found & -found).bit_length() - 1] if found else None
+        return self._cache[mask]
+
+    def __getitem__(self, itemset):
+        mask = self.mask(itemset)
+        return None if mask is None else self.support_of_mask(mask)
+
+
+BASES = ('reduced', 'min-max', 'maximal')
+
+
+def _targets(masks, n_items, basis):
+    """
+    For each closed itemset i, the closed itemsets j its generators lead to
+
+    Always i itself (exact rules). 'min-max' adds every closed proper
+    superset, 'reduced' only the immediate ones (the transitive reduction of
+    the closed lattice: a longer chain's confidence is the product of its
+    edges, so those rules are derivable), 'maximal' only the maximal ones.
+    Supersets come from per-item tidsets over the closed itemsets, so no
+    pair of closed itemsets is compared directly.
+    """
+    containing = _containing(masks, n_items)
+    everything = (1 << len(masks)) - 1
+    # Closed itemsets are distinct, so these are proper supersets
+    supersets = [_supersets_of(mask, containing, everything) & ~(1 << i)
+                 for i, mask in enumerate(masks)]
+    if basis == 'min-max':
+        return [[i] + list(_bits_of(found)) for i, found in enumerate(supersets)]
+    if basis == 'maximal':
+        maximal = sum(1 << i for i, found in enumerate(supersets) if not found)
+        return [[i] + list(_bits_of(found & maximal)) for i, found in enumerate(supersets)]
+
+    targets = []
+    for i, found in enumerate(supersets):
+        # j is immediate unless it is a superset of another superset k of i
+        beyond = 0
+        for k in _bits_of(found):
+            beyond |= supersets[k]
+        targets.append([i] + list(_bits_of(found & ~beyond)))
+    return targets
+
+
+def basis_rules(closed, min_confidence=0.6, min_lift=None, basis='reduced'):
+    """
+    Non-redundant rules from a closed frame with generators
+
+    Exact rules g -> closure(g) - g plus approximate rules g -> C - g towards
+    the closed itemsets C chosen by basis (see _targets). 'reduced' and
+    'min-max' are lossless for support and confidence at min_confidence;
+    'maximal' keeps one rule per generator and symptom cluster. min_lift is
+    applied to the basis rules themselves. Returns an mlxtend-style frame.
+    """
+    if 'generators' not in closed.columns:
+        raise ValueError("basis_rules needs closed_itemsets(..., with_generators=True)")
+    if basis not in BASES:
+        raise ValueError(f"basis must be one of {BASES}, got {basis!r}")
+
+    index = ClosedSupports(closed)
+    itemsets = list(closed['itemsets'])
+    masks = [index.mask(itemset) for itemset in itemsets]
+    supports = closed['support'].to_numpy(dtype=float)
+    targets = _targets(masks, len(index.vocabulary), basis)
+
+    antecedents, consequents = [], []
+    support, antecedent_support, consequent_support = [], [], []
+    for i, generators in enumerate(closed['generators']):
+        for generator in generators:
+            generator_mask = index.mask(generator)
+            for j in targets[i]:
+                consequent_mask = masks[j] & ~generator_mask
+                if consequent_mask == 0:
+                    continue
+                confidence = supports[j] / supports[i]
+                if confidence < min_confidence:
+                    continue
+                consequent_sup = index.support_of_mask(consequent_mask)
+                if min_lift is not None and confidence / consequent_sup < min_lift:
+                    continue
+                antecedents.append(generator)
+                consequents.append(itemsets[j] - generator)
+                support.append(supports[j])
+                antecedent_support.append(supports[i])
+                consequent_support.append(consequent_sup)
+
+    return rules_frame(antecedents, consequents,
+                       np.array(support, dtype=float),
+                       np.array(antecedent_support, dtype=float),
+                       np.array(consequent_support, dtype=float))
@@ -0,0 +1,257 @@
+"""
+Symptom Co-occurrence Counts
+Pairwise counts (rows containing both symptoms) for a symptom subset,
+computed once and shared by the heatmap, 2-itemset mining and lift lookups.
+
+Only the requested columns are counted: an explicit symptom list, the top_n
+most frequent symptoms, or all of them. Rows are accumulated in blocks, so
+chunked sources (a TransactionStore, any iter_chunks() source) are counted
+in bounded memory. Three kernels, picked by input:
+- bool matrices: float32 matrix product per block of BLOCK_ROWS rows, exact
+  since a block's counts stay below 2^24
+- CSR chunks (transaction stores): scipy sparse X.T @ X, cost proportional
+  to the symptom pairs present rather than rows x columns
+- packed tidsets (a vertical.VerticalDatabase): AND + popcount per column
+
+    counts = cooccurrence(tm, top_n=20)
+    counts.to_frame()                      # heatmap input
+    counts.lift('cough', 'high_fever')     # lift lookup
+    counts.frequent_itemsets(0.05)         # 1- and 2-itemsets, no mining
+"""
+
+import numpy as np
+import pandas as pd
+
+from bitset import popcount
+from eclat import itemsets_to_frame
+from transactions import TransactionMatrix
+from vertical import VerticalDatabase
+
+
+BLOCK_ROWS = 1 << 16  # Rows per float32 product (counts stay exact below 2^24)
+CHUNK_ROWS = 1_000_000  # Rows per chunk when streaming a transaction store
+
+
+class CooccurrenceCounts:
+    """
+    Symmetric (k x k) co-occurrence counts over k symptoms
+
+    counts[i, j] is the number of rows containing symptoms i and j; the
+    diagonal holds the single-symptom counts. n_rows counts the non-empty
+    rows seen, so supports match the miners' (which run after drop_empty).
+    """
+
+    def __init__(self, symptoms, counts, n_rows):
+        self.symptoms = list(symptoms)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.n_rows = int(n_rows)
+        self.positions = {symptom: i for i, symptom in enumerate(self.symptoms)}
+
+    @classmethod
+    def from_bits(cls, bits, symptoms, n_rows):
+        """Counts of packed tidsets (n_items x n_words, see bitset.pack_columns)"""
+        k = len(bits)
+        counts = np.zeros((k, k), dtype=np.int64)
+        for i in range(k):
+            counts[i, i:] = popcount(bits[i:] & bits[i])
+        counts = np.triu(counts) + np.triu(counts, 1).T
+        return cls(symptoms, counts, n_rows)
+
+    def __len__(self):
+        return len(self.symptoms)
+
+    @property
+    def item_counts(self):
+        return np.diagonal(self.counts)
+
+    def _position(self, symptom):
+        if symptom not in self.positions:
+            raise ValueError(f"Symptom '{symptom}' was not counted")
+        return self.positions[symptom]
+
+    def count(self, a, b):
+        return int(self.counts[self._position(a), self._position(b)])
+
+    def support(self, a, b=None):
+        """Support of {a} or {a, b}"""
+        b = a if b is None else b
+        return self.count(a, b) / self.n_rows if self.n_rows else 0.0
+
+    def confidence(self, a, b):
+        """Confidence of the rule a -> b"""
+        count_a = self.count(a, a)
+        return self.count(a, b) / count_a if count_a else 0.0
+
+    def lift(self, a, b):
+        """Lift of a -> b (symmetric)"""
+        expected = self.count(a, a) * self.count(b, b)
+        return self.count(a, b) * self.n_rows / expected if expected else 0.0
+
+    def lift_matrix(self):
+        """(k x k) lift of every pair; 0 where a symptom never occurs"""
+        items = self.item_counts.astype(float)
+        expected = np.outer(items, items)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lift = self.counts * float(self.n_rows) / expected
+        return np.where(expected > 0, lift, 0.0)
+
+    def subset(self, symptoms):
+        """Counts restricted to symptoms, in that order"""
+        positions = [self._position(symptom) for symptom in symptoms]
+        return CooccurrenceCounts(symptoms, self.counts[np.ix_(positions, positions)], self.n_rows)
+
+    def top(self, n):
+        """The n most frequent symptoms (ties in column order), most frequent first"""
+        order = np.argsort(-self.item_counts, kind='stable')[:n]
+        return self.subset([self.symptoms[i] for i in order])
+
+    def to_frame(self):
+        """Counts as a symptom x symptom DataFrame (heatmap input)"""
+        return pd.DataFrame(self.counts, index=self.symptoms, columns=self.symptoms)
+
+    def _frequent(self, min_support):
+        if not self.n_rows:
+            return np.zeros(self.counts.shape, dtype=bool)
+        return self.counts / self.n_rows >= min_support
+
+    def frequent_counts(self, min_support):
+        """(number of frequent symptoms, number of frequent pairs)"""
+        frequent = self._frequent(min_support)
+        f1 = int(np.count_nonzero(np.diagonal(frequent)))
+        return f1, int((np.count_nonzero(frequent) - f1) // 2)
+
+    def frequent_itemsets(self, min_support, use_colnames=True, max_len=2):
+        """
+        Frequent 1- and 2-itemsets straight from the counts
+
+        Same ['support', 'itemsets'] frame (and row order) as the miners
+        with max_len=2. Exact only when every symptom was counted.
+        """
+        frequent = self._frequent(min_support)
+        found = [((int(i),), int(self.counts[i, i])) for i in np.flatnonzero(np.diagonal(frequent))]
+        if max_len is None or max_len >= 2:
+            rows, cols = np.nonzero(np.triu(frequent, 1))
+            found.extend(((int(i), int(j)), int(self.counts[i, j])) for i, j in zip(rows, cols))
+        return itemsets_to_frame(found, self.n_rows, self.symptoms if use_colnames else None)
+
+    def __repr__(self):
+        return f"CooccurrenceCounts(symptoms={len(self.symptoms)}, rows={self.n_rows})"
+
+
+class CooccurrenceAccumulator:
+    """
+    Sums co-occurrence counts over chunks of rows
+
+    columns selects (by index) which of the chunks' columns are counted;
+    every chunk must have the same column layout.
+
+        acc = CooccurrenceAccumulator(symptoms, columns)
+        for chunk in store.iter_chunks():
+            acc.add(chunk)
+        counts = acc.result()
+    """
+
+    def __init__(self, symptoms, columns=None):
+        self.columns = (np.arange(len(symptoms)) if columns is None
+                        else np.asarray(columns, dtype=np.int64))
+        self.symptoms = [symptoms[i] for i in self.columns]
+        self.counts = np.zeros((len(self.columns), len(self.columns)), dtype=np.int64)
+        self.n_rows = 0
+
+    def add(self, chunk):
+        """Count a TransactionMatrix, bool matrix or scipy CSR chunk"""
+        if isinstance(chunk, TransactionMatrix):
+            chunk = chunk.matrix
+        if hasattr(chunk, 'tocsr'):
+            self._add_sparse(chunk.tocsr())
+        else:
+            self._add_dense(np.asarray(chunk, dtype=bool))
+
+    def _add_dense(self, matrix):
+        self.n_rows += int(np.count_nonzero(matrix.any(axis=1)))
+        selected = matrix[:, self.columns]
+        for start in range(0, len(selected), BLOCK_ROWS):
+            block = selected[start:start + BLOCK_ROWS].astype(np.float32)
+            self.counts += (block.T @ block).astype(np.int64)
+
+    def _add_sparse(self, matrix):
+        self.n_rows += int(np.count_nonzero(np.diff(matrix.indptr)))
+        selected = matrix[:, self.columns].astype(np.int64)
+        selected.data[:] = 1
+        self.counts += (selected.T @ selected).toarray()
+
+    def result(self):
+        return CooccurrenceCounts(self.symptoms, self.counts, self.n_rows)
+
+
+def select_columns(symptoms, item_counts, subset=None, top_n=None):
+    """
+    Column indices to count: subset (by name, in that order), else the top_n
+    by item count (ties in column order), else all
+    """
+    if subset is not None:
+        positions = {symptom: i for i, symptom in enumerate(symptoms)}
+        missing = [symptom for symptom in subset if symptom not in positions]
+        if missing:
+            raise ValueError(f"Unknown symptoms: {', '.join(map(str, missing))}")
+        return np.array([positions[symptom] for symptom in subset], dtype=np.int64)
+    if top_n is not None:
+        return np.argsort(-np.asarray(item_counts), kind='stable')[:top_n]
+    return np.arange(len(symptoms))
+
+
+def cooccurrence(data, symptoms=None, top_n=None, chunk_rows=CHUNK_ROWS):
+    """
+    Co-occurrence counts of a VerticalDatabase, TransactionMatrix, bool
+    DataFrame or array, or a chunked source (TransactionStore or anything
+    with iter_chunks)
+
+    symptoms restricts the count to those symptoms, top_n to the most
+    frequent ones; by default every symptom is counted.
+    """
+    if isinstance(data, VerticalDatabase):
+        # Supports are relative to all of the database's rows
+        columns = select_columns(data.symptoms, data.item_counts, symptoms, top_n)
+        return CooccurrenceCounts.from_bits(data.bits[columns], [data.symptoms[i] for i in columns],
+                                            data.n_rows)
+
+    if hasattr(data, 'indptr') and hasattr(data, 'code_to_column'):
+        return _store_cooccurrence(data, symptoms, top_n, chunk_rows)
+
+    if hasattr(data, 'iter_chunks'):
+        columns = select_columns(data.symptoms, data.item_counts() if top_n is not None else None,
+                                 symptoms, top_n)
+        accumulator = CooccurrenceAccumulator(data.symptoms, columns)
+        for chunk in data.iter_chunks(chunk_rows):
+            accumulator.add(chunk)
+        return accumulator.result()
+
+    if isinstance(data, TransactionMatrix):
+        matrix, names = data.matrix, data.symptoms
+    elif isinstance(data, pd.DataFrame):
+        matrix, names = data.to_numpy(dtype=bool), list(data.columns)
+    else:
+        matrix = np.asarray(data, dtype=bool)
+        names = list(range(matrix.shape[1]))
+    item_counts = np.count_nonzero(matrix, axis=0) if top_n is not None else None
+    accumulator = CooccurrenceAccumulator(names, select_columns(names, item_counts, symptoms, top_n))
+    accumulator.add(matrix)
+    return accumulator.result()
+
+
+def _store_cooccurrence(store, symptoms, top_n, chunk_rows):
+    """Stream a TransactionStore's CSR arrays chunk by chunk, never densifying"""
+    from scipy import sparse
+
+    columns = select_columns(store.symptoms, store.item_counts() if top_n is not None else None,
+                             symptoms, top_n)
+    accumulator = CooccurrenceAccumulator(store.symptoms, columns)
+    for start in range(0, store.n_rows, chunk_rows):
+        stop = min(start + chunk_rows, store.n_rows)
+        indptr = np.asarray(store.indptr[start:stop + 1])
+        lo, hi = int(indptr[0]), int(indptr[-1])
+        indices = store.code_to_column[store.indices[lo:hi]]
+        chunk = sparse.csr_matrix((np.ones(hi - lo, dtype=np.int8), indices, indptr - lo),
+                                  shape=(stop - start, store.n_items))
+        accumulator.add(chunk)
+    return accumulator.result()
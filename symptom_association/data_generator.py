@@ -5,12 +5,6 @@ Generates realistic symptom-disease associations for testing
 
 import pandas as pd
 import numpy as np
-import random
-from itertools import combinations
-
-# Set random seed for reproducibility
-np.random.seed(42)
-random.seed(42)
 
 # Define comprehensive symptom and disease lists
 SYMPTOMS = [
@@ -112,67 +106,30 @@ if 'facial_pain' not in SYMPTOMS:
     SYMPTOMS.extend(['facial_pain', 'stiffness'])
 
 
-def generate_patient_record(disease, pattern):
-    """Generate a single patient record with symptoms for a disease"""
-    symptoms_present = []
-    
-    # Core symptoms (90% probability each)
-    for symptom in pattern['core']:
-        if random.random() < 0.9:
-            symptoms_present.append(symptom)
-    
-    # Common symptoms (50% probability each)
-    for symptom in pattern['common']:
-        if random.random() < 0.5:
-            symptoms_present.append(symptom)
-    
-    # Rare symptoms (10% probability each)
-    for symptom in pattern['rare']:
-        if random.random() < 0.1:
-            symptoms_present.append(symptom)
+def generate_dataset(n_samples=1000, seed=42):
+    """
+    Generate complete synthetic medical dataset
     
-    # Add 1-2 random noise symptoms (5% probability)
-    if random.random() < 0.05:
-        noise_symptoms = random.sample([s for s in SYMPTOMS if s not in symptoms_present], 
-                                      min(2, len(SYMPTOMS) - len(symptoms_present)))
-        symptoms_present.extend(noise_symptoms)
+    Sampled block-wise by workload_generator from DISEASE_PATTERNS with
+    its own seeded generator, so the global random state is not used.
+    """
+    from workload_generator import generate_matrix
     
-    return symptoms_present
-
-
-def generate_dataset(n_samples=1000):
-    """Generate complete synthetic medical dataset"""
     print(f"Generating {n_samples} patient records...")
     
-    records = []
-    diseases = list(DISEASE_PATTERNS.keys())
-    
-    for i in range(n_samples):
-        # Select random disease
-        disease = random.choice(diseases)
-        pattern = DISEASE_PATTERNS[disease]
-        
-        # Generate symptoms
-        symptoms = generate_patient_record(disease, pattern)
-        
-        # Create record
-        record = {
-            'patient_id': f'P{i+1:04d}',
-            'disease': disease,
-            'num_symptoms': len(symptoms),
-            'symptoms': ','.join(symptoms)
-        }
-        
-        # Add binary columns for each symptom
-        for symptom in SYMPTOMS:
-            record[symptom] = 1 if symptom in symptoms else 0
-        
-        records.append(record)
+    tm = generate_matrix(n_samples, seed=seed)
+    symptom_names = np.array(tm.symptoms, dtype=object)
     
-    df = pd.DataFrame(records)
+    df = pd.DataFrame({
+        'patient_id': [f'P{i+1:04d}' for i in range(n_samples)],
+        'disease': tm.diseases,
+        'num_symptoms': tm.matrix.sum(axis=1),
+        'symptoms': [','.join(symptom_names[row]) for row in tm.matrix],
+    })
+    df = pd.concat([df, pd.DataFrame(tm.matrix.astype(np.int64), columns=tm.symptoms)], axis=1)
     
     print(f"✓ Generated {len(df)} records")
-    print(f"✓ Diseases: {len(diseases)}")
+    print(f"✓ Diseases: {len(DISEASE_PATTERNS)}")
     print(f"✓ Unique symptoms: {len(SYMPTOMS)}")
     print(f"✓ Average symptoms per patient: {df['num_symptoms'].mean():.2f}")
     
@@ -0,0 +1,231 @@
+"""
+ECLAT Frequent Itemset Miner
+Depth-first vertical mining over packed uint64 tidsets.
+
+Drop-in for mlxtend's apriori/fpgrowth:
+
+    from eclat import eclat
+    frequent_itemsets = eclat(df_binary, min_support=0.05, use_colnames=True)
+
+Passing a vertical.VerticalDatabase skips packing the columns.
+
+Pass n_jobs to mine prefix classes in a process pool (see eclat_parallel).
+"""
+
+import os
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from bitset import popcount, min_count_for
+from vertical import as_vertical
+
+
+def _mine_class(prefix, items, bits, counts, min_count, max_len, out):
+    """
+    Mine one prefix equivalence class
+
+    items/counts are 1-D arrays and bits is (len(items) x n_words); every
+    member already extends prefix frequently. Child classes are built with a
+    single vectorized AND + popcount and dropped when the recursion returns,
+    so only the tidsets on the current DFS path are alive at any time.
+    """
+    depth = len(prefix) + 1
+    for i in range(len(items)):
+        itemset = prefix + (int(items[i]),)
+        out.append((itemset, int(counts[i])))
+
+        if max_len is not None and depth >= max_len:
+            continue
+        if i + 1 == len(items):
+            continue
+
+        child_bits = bits[i + 1:] & bits[i]
+        child_counts = popcount(child_bits)
+        keep = child_counts >= min_count
+        if keep.any():
+            _mine_class(itemset, items[i + 1:][keep], child_bits[keep],
+                        child_counts[keep], min_count, max_len, out)
+
+
+def frequent_single_items(bits, min_count, counts=None):
+    """
+    Frequent items of a packed vertical database, ordered by ascending support
+
+    Ascending order keeps the early (large) equivalence classes small, which
+    is the usual ECLAT heuristic. counts are the items' popcounts, if known.
+    """
+    if counts is None:
+        counts = popcount(bits)
+    frequent = np.flatnonzero(counts >= min_count)
+    order = frequent[np.argsort(counts[frequent], kind='stable')]
+    return order, counts[order]
+
+
+def itemsets_to_frame(found, n_rows, columns=None):
+    """
+    Build an mlxtend-style ['support', 'itemsets'] frame
+
+    found is a list of (item index tuple, count). Rows are ordered by itemset
+    length, then by column order, like apriori's output.
+    """
+    found = sorted(found, key=lambda entry: (len(entry[0]), sorted(entry[0])))
+    supports = np.array([count for _, count in found], dtype=np.int64) / n_rows if n_rows else []
+    if columns is None:
+        itemsets = [frozenset(items) for items, _ in found]
+    else:
+        itemsets = [frozenset(columns[i] for i in items) for items, _ in found]
+
+    return pd.DataFrame({'support': supports, 'itemsets': itemsets},
+                        columns=['support', 'itemsets'])
+
+
+def eclat(df, min_support=0.5, use_colnames=False, max_len=None, n_jobs=1):
+    """
+    Find frequent itemsets with bitset ECLAT
+
+    Parameters mirror mlxtend.frequent_patterns.apriori. df may be a bool
+    DataFrame, a TransactionMatrix or a VerticalDatabase. n_jobs > 1 (or -1
+    for all cores) mines in parallel. Returns a DataFrame with columns
+    ['support', 'itemsets'].
+    """
+    if not 0.0 < min_support <= 1.0:
+        raise ValueError(f"min_support must be in (0, 1], got {min_support}")
+
+    db = as_vertical(df)
+    bits, columns, n_rows = db.bits, db.symptoms, db.n_rows
+    min_count = max(min_count_for(min_support, n_rows), 1)
+
+    items, counts = frequent_single_items(bits, min_count, db.item_counts)
+
+    if n_jobs in (-1, None):
+        n_jobs = os.cpu_count() or 1
+    if n_jobs > 1 and len(items) > 1:
+        found = _mine_parallel(bits[items], items, counts, min_count, max_len, n_jobs)
+    else:
+        found = []
+        if len(items):
+            _mine_class((), items, bits[items], counts, min_count, max_len, found)
+
+    return itemsets_to_frame(found, n_rows, columns if use_colnames else None)
+
+
+def eclat_parallel(df, min_support=0.5, use_colnames=False, max_len=None):
+    """eclat() on every core, registered as the 'eclat_parallel' miner"""
+    return eclat(df, min_support, use_colnames, max_len, n_jobs=-1)
+
+
+# ==================== PARALLEL MINING ====================
+# Classes whose estimated work (extensions^2 x words) exceeds this many
+# words are split into one task per second-level prefix.
+SPLIT_CLASS_WORDS = 1 << 16
+
+# Per-worker state, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(shm_name, shape, items, min_count, max_len):
+    # Workers share the parent's resource tracker, so attaching is safe;
+    # only the parent unlinks the block
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker['shm'] = shm
+    _worker['bits'] = np.ndarray(shape, dtype=np.uint64, buffer=shm.buf)
+    _worker['items'] = items
+    _worker['min_count'] = min_count
+    _worker['max_len'] = max_len
+
+
+def _run_task(task):
+    """
+    Mine one task against the shared vertical database
+
+    ('class', i): emit item i and mine its whole prefix class.
+    ('pair', i, j): mine the sub-class with prefix {i, j} (the parent already
+    emitted {i}).
+    """
+    bits, items = _worker['bits'], _worker['items']
+    min_count, max_len = _worker['min_count'], _worker['max_len']
+
+    if task[0] == 'class':
+        start, prefix_bits = task[1] + 1, bits[task[1]]
+        prefix = (int(items[task[1]]),)
+    else:
+        start, prefix_bits = task[2] + 1, bits[task[1]] & bits[task[2]]
+        prefix = (int(items[task[1]]), int(items[task[2]]))
+
+    found = [(prefix, int(popcount(prefix_bits)))]
+    if (max_len is None or max_len > len(prefix)) and start < len(items):
+        child_bits = bits[start:] & prefix_bits
+        child_counts = popcount(child_bits)
+        keep = child_counts >= min_count
+        if keep.any():
+            _mine_class(prefix, items[start:][keep], child_bits[keep],
+                        child_counts[keep], min_count, max_len, found)
+
+    return found
+
+
+def _plan_tasks(bits, counts, min_count, max_len):
+    """
+    Split the search into tasks, largest first
+
+    Classes with few frequent extensions stay whole; heavy ones are broken
+    into second-level prefix tasks so a skewed class cannot serialize the
+    run. Returns (tasks, found_in_parent).
+    """
+    n_items, width = bits.shape
+    planned, found = [], []
+
+    for i in range(n_items):
+        if i + 1 == n_items or max_len == 1:
+            planned.append((0, ('class', i)))
+            continue
+
+        extension_counts = popcount(bits[i + 1:] & bits[i])
+        extensions = np.flatnonzero(extension_counts >= min_count) + i + 1
+        work = len(extensions) * len(extensions) * width
+
+        if work <= SPLIT_CLASS_WORDS or max_len == 2:
+            planned.append((work, ('class', i)))
+        else:
+            found.append(((i,), int(counts[i])))
+            for j in extensions:
+                remaining = n_items - j
+                planned.append((remaining * remaining * width, ('pair', i, int(j))))
+
+    # Longest-processing-time first: idle workers pull the next task from
+    # the shared queue, so big tasks start early and small ones fill gaps
+    planned.sort(key=lambda entry: -entry[0])
+    return [task for _, task in planned], found
+
+
+def _mine_parallel(bits, items, counts, min_count, max_len, n_jobs):
+    """
+    Mine prefix classes in a process pool
+
+    The packed vertical database is copied once into shared memory; tasks
+    only carry item positions. Returns (itemset, count) pairs in column
+    index space, like the serial path.
+    """
+    bits = np.ascontiguousarray(bits)
+    tasks, parent_found = _plan_tasks(bits, counts, min_count, max_len)
+
+    # Parent-emitted prefixes use positions; translate to column indices
+    found = [(tuple(int(items[p]) for p in itemset), count) for itemset, count in parent_found]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(bits.nbytes, 1))
+    try:
+        shared = np.ndarray(bits.shape, dtype=np.uint64, buffer=shm.buf)
+        shared[:] = bits
+
+        with Pool(processes=min(n_jobs, len(tasks)), initializer=_init_worker,
+                  initargs=(shm.name, bits.shape, items, min_count, max_len)) as pool:
+            for task_found in pool.imap_unordered(_run_task, tasks, chunksize=1):
+                found.extend(task_found)
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return found
@@ -1,17 +1,10 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+import os
 
-# Data captured from the interrupted benchmark run
-data = {
-    'Support': [0.20, 0.10, 0.05],
-    'Apriori_Time': [0.0025, 0.0094, 0.0459],
-    'Apriori_Mem': [0.37, 2.68, 20.83],
-    'FP_Growth_Time': [0.0789, 3.6717, 35.5842],
-    'FP_Growth_Mem': [11.15, 11.14, 11.14],
-    'ECLAT_Time': [0.0197, 0.0482, 0.0323],
-    'ECLAT_Mem': [1.16, 3.33, 13.44]
-}
+# Metrics written by compare_algorithms.py (medians of repeated runs)
+METRICS_FILE = 'visualizations/algorithm_metrics.csv'
 
 def plot_individual(supports, times, memory, name, color):
     """Generates individual plots for Time and Memory."""
@@ -35,7 +28,6 @@ def plot_individual(supports, times, memory, name, color):
     
     plt.tight_layout()
     # Ensure directory exists
-    import os
     os.makedirs('visualizations', exist_ok=True)
     filename = f"visualizations/{name.lower().replace('-', '_')}_performance.png"
     plt.savefig(filename, dpi=300)
@@ -43,6 +35,10 @@ def plot_individual(supports, times, memory, name, color):
     plt.close()
 
 def main():
+    if not os.path.exists(METRICS_FILE):
+        print(f"[!] {METRICS_FILE} not found. Run compare_algorithms.py first.")
+        return
+    data = pd.read_csv(METRICS_FILE)
     supports = data['Support']
     
     # 1. Individual Plots
@@ -72,16 +68,12 @@ def main():
     plt.plot(supports, data['ECLAT_Mem'], marker='^', label='ECLAT', linewidth=2, color='red')
     plt.title('Algorithm Memory Usage Comparison', fontsize=14, fontweight='bold')
     plt.xlabel('Minimum Support', fontsize=12)
-    plt.ylabel('Peak Memory (MB)', fontsize=12)
+    plt.ylabel('Peak RSS growth (MB)', fontsize=12)
     plt.legend()
     plt.grid(True, alpha=0.3)
     plt.gca().invert_xaxis()
     plt.savefig('visualizations/algorithm_comparison_memory.png', dpi=300)
     print("[OK] Saved visualizations/algorithm_comparison_memory.png")
 
-    # Save CSV
-    pd.DataFrame(data).to_csv('visualizations/algorithm_metrics.csv', index=False)
-    print("[OK] Metrics saved to visualizations/algorithm_metrics.csv")
-
 if __name__ == "__main__":
     main()
@@ -0,0 +1,289 @@
+"""
+Incremental Rule Maintenance (FUP-style)
+Updates frequent itemsets and rules from newly appended patient records
+without re-mining the whole history.
+
+Support counts are kept for the frequent itemsets and their negative border
+(the minimal infrequent itemsets whose every subset is frequent). An update:
+1. counts the tracked itemsets over the new rows only;
+2. recomputes which of them are frequent at the new total row count;
+3. rescans the history only if a border itemset became frequent, because
+   only then can itemsets that were never counted become frequent.
+Rules are re-enumerated only for itemsets whose counts (or whose subsets'
+counts) changed; the metrics of the others are refreshed in bulk.
+
+    model = IncrementalMiner.from_matrix(tm, min_support=0.05, min_confidence=0.6,
+                                         history_files=['data/processed_medical_data.stm'])
+    model.update(delta_tm, segment_path='data/increments/batch_0001.stm')
+    rules = model.rules(min_lift=1.2)
+    model.save('models/incremental_state.pkl')
+"""
+
+import os
+import pickle
+from itertools import combinations
+
+import numpy as np
+
+from bitset import min_count_for
+from eclat import eclat, itemsets_to_frame
+from matrix_file import MatrixFile, MatrixFileWriter
+from partition_miner import count_candidates
+from rule_generator import confident_splits
+from rule_metrics import rules_frame
+from transactions import TransactionMatrix
+
+
+STATE_VERSION = 1
+
+# Rules are kept from this relative margin below min_confidence so float
+# rounding at the boundary never loses one (rules() applies the exact cut)
+CONFIDENCE_MARGIN = 1e-9
+
+
+def apriori_gen(frequent, n_items, max_len=None):
+    """
+    Negative border candidates of a downward-closed family of item tuples
+
+    Every single item, plus every k-itemset whose (k-1)-subsets are all in
+    frequent and which is not frequent itself.
+    """
+    border = {(item,) for item in range(n_items) if (item,) not in frequent}
+
+    by_prefix = {}
+    for itemset in frequent:
+        by_prefix.setdefault(itemset[:-1], []).append(itemset[-1])
+
+    for prefix, lasts in by_prefix.items():
+        if max_len is not None and len(prefix) + 2 > max_len:
+            continue
+        lasts.sort()
+        for i, a in enumerate(lasts):
+            for b in lasts[i + 1:]:
+                candidate = prefix + (a, b)
+                if candidate in frequent:
+                    continue
+                if all(candidate[:k] + candidate[k + 1:] in frequent
+                       for k in range(len(candidate) - 2)):
+                    border.add(candidate)
+    return border
+
+
+class IncrementalMiner:
+    """
+    Frequent itemsets and rules maintained under appended transactions
+
+    Itemsets are sorted tuples of column indices into symptoms; supports are
+    relative to non-empty rows, like the batch pipeline after drop_empty().
+    history_files are .stm files holding every row counted so far, read only
+    when an update has to rescan.
+    """
+
+    def __init__(self, symptoms, min_support, min_confidence=0.6, max_len=None,
+                 history_files=None):
+        self.symptoms = list(symptoms)
+        self.min_support = min_support
+        self.min_confidence = min_confidence
+        self.max_len = max_len
+        self.history_files = list(history_files or [])
+
+        self.n_rows = 0
+        self.counts = {}          # frequent itemsets and negative border
+        self.frequent = set()
+        self.rule_splits = {}     # frequent itemset -> confident (antecedent, consequent)
+
+    @classmethod
+    def from_matrix(cls, tm, min_support, min_confidence=0.6, max_len=None,
+                    history_files=None):
+        """Initial full mine of a TransactionMatrix (the only full pass)"""
+        # Keep every column so history files never introduce unknown symptoms
+        tm = tm.take_rows(tm.matrix.any(axis=1))
+        model = cls(tm.symptoms, min_support, min_confidence, max_len, history_files)
+        model.n_rows = tm.n_rows
+
+        if tm.n_rows:
+            found = eclat(tm, min_support=min_support, max_len=max_len)
+            counts = np.rint(found['support'].to_numpy() * tm.n_rows).astype(np.int64)
+            for itemset, count in zip(found['itemsets'], counts):
+                model.counts[tuple(sorted(itemset))] = int(count)
+            model.frequent = set(model.counts)
+
+        border = sorted(apriori_gen(model.frequent, len(model.symptoms), max_len))
+        for itemset, count in zip(border, count_candidates([tm], border)):
+            model.counts[itemset] = int(count)
+
+        model._regenerate_rules(model.frequent)
+        print(f"[OK] Incremental model: {len(model.frequent)} frequent itemsets, "
+              f"{len(border)} border itemsets over {model.n_rows:,} rows")
+        return model
+
+    # ==================== UPDATES ====================
+    def _align(self, tm):
+        """Non-empty rows of tm with columns in this model's vocabulary order"""
+        column = {symptom: i for i, symptom in enumerate(self.symptoms)}
+        for symptom in tm.symptoms:
+            if symptom not in column:
+                column[symptom] = len(self.symptoms)
+                self.symptoms.append(symptom)
+
+        keep = tm.matrix.any(axis=1)
+        matrix = np.zeros((int(keep.sum()), len(self.symptoms)), dtype=bool)
+        matrix[:, [column[symptom] for symptom in tm.symptoms]] = tm.matrix[keep]
+        return TransactionMatrix(matrix, self.symptoms)
+
+    def _history_chunks(self, chunk_rows):
+        for path in self.history_files:
+            for chunk in MatrixFile(path).iter_chunks(chunk_rows):
+                yield self._align(chunk)
+
+    def update(self, delta, segment_path=None, chunk_rows=100_000):
+        """
+        Fold appended rows (a TransactionMatrix) into the counts and rules
+
+        With segment_path the new rows are also written there as .stm and
+        added to history_files, so later rescans see them. Returns a dict of
+        update statistics.
+        """
+        print(f"\n[*] Incremental update with {delta.n_rows:,} new rows...")
+        delta_aligned = self._align(delta)
+        n_delta = delta_aligned.n_rows
+
+        # 1. Tracked itemsets over the new rows only (new symptoms start at 0)
+        for item in range(len(self.symptoms)):
+            self.counts.setdefault((item,), 0)
+        tracked = sorted(self.counts)
+        delta_counts = count_candidates([delta_aligned], tracked)
+        changed = set()
+        for itemset, count in zip(tracked, delta_counts):
+            if count:
+                self.counts[itemset] += int(count)
+                changed.add(itemset)
+
+        self.n_rows += n_delta
+        min_count = max(min_count_for(self.min_support, self.n_rows), 1)
+        old_frequent = self.frequent
+        frequent = {itemset for itemset, count in self.counts.items() if count >= min_count}
+
+        # 2. Rescan only while border itemsets keep crossing the threshold
+        rescans = 0
+        while True:
+            border = apriori_gen(frequent, len(self.symptoms), self.max_len)
+            untracked = sorted(border - self.counts.keys())
+            if not untracked:
+                break
+            if not self.history_files and self.n_rows > n_delta:
+                raise ValueError("Itemsets crossed the support threshold but the model "
+                                 "has no history_files to rescan")
+
+            rescans += 1
+            print(f"     Rescanning history for {len(untracked)} new candidate itemsets...")
+            history = self._history_chunks(chunk_rows) if self.n_rows > n_delta else []
+            counts = (count_candidates(history, untracked)
+                      + count_candidates([delta_aligned], untracked))
+            for itemset, count in zip(untracked, counts):
+                self.counts[itemset] = int(count)
+                changed.add(itemset)
+                if count >= min_count:
+                    frequent.add(itemset)
+
+        # 3. Forget everything outside frequent + border
+        self.counts = {itemset: self.counts[itemset] for itemset in frequent | border}
+        self.frequent = frequent
+
+        # 4. Rules: re-enumerate only itemsets with a changed subset
+        changed |= frequent ^ old_frequent
+        dirty = {itemset for itemset in frequent if len(itemset) > 1
+                 and any(split in changed for split in self._subsets(itemset))}
+        for itemset in list(self.rule_splits):
+            if itemset not in frequent:
+                del self.rule_splits[itemset]
+        self._regenerate_rules(dirty)
+
+        if segment_path is not None and delta.n_rows:
+            directory = os.path.dirname(segment_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            writer = MatrixFileWriter(segment_path, delta.symptoms)
+            writer.append(delta.matrix, delta.diseases, delta.patient_ids)
+            writer.close()
+            self.history_files.append(segment_path)
+
+        stats = {
+            'new_rows': n_delta,
+            'total_rows': self.n_rows,
+            'frequent_itemsets': len(frequent),
+            'border_itemsets': len(border),
+            'changed_itemsets': len(changed),
+            'regenerated_itemsets': len(dirty),
+            'history_rescans': rescans,
+        }
+        print(f"[OK] {len(frequent)} frequent itemsets, {len(dirty)} re-enumerated, "
+              f"{rescans} history rescan(s)")
+        return stats
+
+    @staticmethod
+    def _subsets(itemset):
+        for size in range(1, len(itemset) + 1):
+            yield from combinations(itemset, size)
+
+    def _regenerate_rules(self, itemsets):
+        cutoff = self.min_confidence * (1.0 - CONFIDENCE_MARGIN)
+        for itemset in itemsets:
+            if len(itemset) > 1:
+                self.rule_splits[itemset] = list(confident_splits(itemset, self.counts, cutoff))
+
+    # ==================== RESULTS ====================
+    def frequent_itemsets(self):
+        """mlxtend-style ['support', 'itemsets'] frame with symptom names"""
+        found = [(itemset, self.counts[itemset]) for itemset in self.frequent]
+        return itemsets_to_frame(found, self.n_rows, self.symptoms)
+
+    def rules(self, min_lift=None):
+        """
+        Current rules as an mlxtend-style frame, sorted by lift
+
+        Same rows as association_rules(frequent_itemsets(), 'confidence',
+        min_confidence) followed by the lift filter.
+        """
+        names = self.symptoms
+        antecedents, consequents, counts = [], [], []
+        for itemset, splits in self.rule_splits.items():
+            for antecedent, consequent in splits:
+                antecedents.append(frozenset(names[i] for i in antecedent))
+                consequents.append(frozenset(names[i] for i in consequent))
+                counts.append((self.counts[itemset], self.counts[antecedent],
+                               self.counts[consequent]))
+
+        counts = np.array(counts, dtype=np.int64).reshape(-1, 3) / max(self.n_rows, 1)
+        rules = rules_frame(antecedents, consequents, counts[:, 0], counts[:, 1], counts[:, 2])
+
+        keep = rules['confidence'] >= self.min_confidence
+        if min_lift is not None:
+            keep &= rules['lift'] >= min_lift
+        return rules[keep].sort_values('lift', ascending=False)
+
+    # ==================== PERSISTENCE ====================
+    def save(self, path='models/incremental_state.pkl'):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': STATE_VERSION, 'state': self.__dict__}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path='models/incremental_state.pkl'):
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+        if payload.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported incremental state version: {payload.get('version')}")
+        model = cls.__new__(cls)
+        model.__dict__.update(payload['state'])
+        return model
+
+    def __repr__(self):
+        return (f"IncrementalMiner(rows={self.n_rows}, frequent={len(self.frequent)}, "
+                f"border={len(self.counts) - len(self.frequent)})")
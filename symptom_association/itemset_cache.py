@@ -0,0 +1,172 @@
+"""
+Frequent Itemset Cache
+Persistent, content-addressed cache of mined itemsets.
+
+Entries are keyed on a hash of the encoded transaction matrix plus the miner,
+min_support and max_len. A request at a higher support than a cached entry is
+answered by filtering that entry, since every itemset frequent at the higher
+support is also in the lower-support result with the same support value.
+The cache is bounded in bytes and evicts least-recently-used entries.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+
+from bitset import pack_columns
+from transactions import TransactionMatrix
+from vertical import VerticalDatabase
+
+
+INDEX_FILE = 'index.json'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def dataset_fingerprint(data):
+    """
+    SHA-256 of a bool DataFrame, TransactionMatrix or VerticalDatabase
+
+    Covers the shape, the column vocabulary and the packed tidsets (see
+    bitset.pack_columns), so any change to the encoded data changes the key
+    and every representation of the same data gets the same key.
+    """
+    if isinstance(data, VerticalDatabase):
+        bits, columns, shape = data.bits, data.symptoms, [data.n_rows, data.n_items]
+    else:
+        if isinstance(data, TransactionMatrix):
+            matrix, columns = data.matrix, data.symptoms
+        else:
+            matrix, columns = data.to_numpy(dtype=bool), list(data.columns)
+        bits, shape = pack_columns(matrix), list(matrix.shape)
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps([shape, [str(c) for c in columns]]).encode('utf-8'))
+    digest.update(bits.tobytes())
+    return digest.hexdigest()
+
+
+class ItemsetCache:
+    """
+    LRU-bounded on-disk cache of frequent itemset frames
+
+        cache = ItemsetCache('cache/itemsets')
+        itemsets = cache.get(fingerprint, 'eclat', 0.05)
+        if itemsets is None:
+            itemsets = eclat(df, 0.05, use_colnames=True)
+            cache.put(fingerprint, 'eclat', 0.05, itemsets)
+    """
+
+    def __init__(self, cache_dir='cache/itemsets', max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, INDEX_FILE)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose payload disappeared
+        return {key: entry for key, entry in index.items()
+                if os.path.exists(os.path.join(self.cache_dir, entry['file']))}
+
+    def _save_index(self):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    @staticmethod
+    def _key(fingerprint, miner, min_support, max_len):
+        return f"{fingerprint}:{miner}:{min_support!r}:{max_len}"
+
+    def get(self, fingerprint, miner, min_support, max_len=None):
+        """
+        Cached itemsets for this request, or None
+
+        miner=None accepts an entry from any backend (they return the same
+        itemsets). The lowest-support entry at or below min_support that is
+        closest to it wins, and is filtered up to min_support.
+        """
+        candidates = [
+            (key, entry) for key, entry in self.index.items()
+            if entry['fingerprint'] == fingerprint
+            and (miner is None or entry['miner'] == miner)
+            and entry['max_len'] == max_len
+            and entry['min_support'] <= min_support
+        ]
+        if not candidates:
+            return None
+
+        key, entry = max(candidates, key=lambda item: item[1]['min_support'])
+        try:
+            with open(os.path.join(self.cache_dir, entry['file']), 'rb') as f:
+                itemsets = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self._remove(key)
+            self._save_index()
+            return None
+
+        entry['last_used'] = time.time()
+        self._save_index()
+
+        if entry['min_support'] < min_support:
+            itemsets = itemsets[itemsets['support'] >= min_support].reset_index(drop=True)
+        return itemsets
+
+    def put(self, fingerprint, miner, min_support, itemsets, max_len=None):
+        """Store a mined frame, then evict LRU entries beyond max_bytes"""
+        key = self._key(fingerprint, miner, min_support, max_len)
+        filename = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32] + '.pkl'
+        path = os.path.join(self.cache_dir, filename)
+
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(itemsets, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        self.index[key] = {
+            'fingerprint': fingerprint,
+            'miner': miner,
+            'min_support': min_support,
+            'max_len': max_len,
+            'file': filename,
+            'bytes': os.path.getsize(path),
+            'n_itemsets': len(itemsets),
+            'last_used': time.time(),
+        }
+        self._evict(keep=key)
+        self._save_index()
+
+    def _remove(self, key):
+        entry = self.index.pop(key)
+        try:
+            os.remove(os.path.join(self.cache_dir, entry['file']))
+        except OSError:
+            pass
+
+    def _evict(self, keep=None):
+        by_age = sorted(self.index, key=lambda k: self.index[k]['last_used'])
+        for key in by_age:
+            if self.total_bytes() <= self.max_bytes:
+                break
+            if key != keep:
+                self._remove(key)
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self.index.values())
+
+    def clear(self):
+        for key in list(self.index):
+            self._remove(key)
+        self._save_index()
+
+    def __len__(self):
+        return len(self.index)
@@ -0,0 +1,107 @@
+"""
+Rule Service Load Test
+Drives a running rule_server with concurrent keep-alive clients and reports
+latency percentiles and throughput.
+
+Queries are built from the model itself: each takes a random rule's
+antecedents plus a few random symptoms, so most of them match rules.
+
+    python rule_server.py &
+    python load_test.py --concurrency 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from rule_server import DEFAULT_HOST, DEFAULT_MODEL, DEFAULT_PORT
+
+
+def make_queries(model_path, n_queries=1000, extra_symptoms=2, seed=0):
+    """Symptom lists drawn from the model's rules and vocabulary"""
+    with open(model_path) as f:
+        data = json.load(f)
+    rng = random.Random(seed)
+    symptoms, rules = data['symptoms'], data['rules']
+
+    queries = []
+    for _ in range(n_queries):
+        query = set(rng.choice(rules)['antecedents']) if rules else set()
+        query.update(rng.sample(symptoms, min(extra_symptoms, len(symptoms))))
+        queries.append(sorted(query))
+    return queries
+
+
+async def client(host, port, path, queries, top_n, deadline, latencies, errors):
+    """One keep-alive connection sending requests back to back until deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = 0
+        while time.perf_counter() < deadline:
+            body = json.dumps({'symptoms': queries[i % len(queries)], 'top_n': top_n}).encode()
+            i += 1
+            request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                       f"Content-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(host, port, path, queries, concurrency, duration, top_n):
+    latencies, errors = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(client(host, port, path, queries[i::concurrency] or queries,
+                                  top_n, deadline, latencies, errors)
+                           for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def report(latencies, errors, elapsed):
+    latencies = np.array(latencies) * 1000
+    print(f"Requests:   {len(latencies):,} in {elapsed:.1f}s ({len(errors)} errors)")
+    print(f"QPS:        {len(latencies) / elapsed:,.0f}")
+    if len(latencies):
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        print(f"Latency ms: p50 {p50:.2f}  p90 {p90:.2f}  p99 {p99:.2f}  max {latencies.max():.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for rule_server.py")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help="rule model the queries are drawn from")
+    parser.add_argument('--endpoint', choices=['associations', 'recommend'], default='associations')
+    parser.add_argument('--concurrency', type=int, default=32, help="simultaneous connections")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to run")
+    parser.add_argument('--top-n', type=int, default=10)
+    args = parser.parse_args()
+
+    queries = make_queries(args.model)
+    print(f"[*] {args.concurrency} clients -> http://{args.host}:{args.port}/{args.endpoint} "
+          f"for {args.duration:.0f}s")
+    report(*asyncio.run(run(args.host, args.port, f"/{args.endpoint}", queries,
+                            args.concurrency, args.duration, args.top_n)))
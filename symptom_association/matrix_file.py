@@ -0,0 +1,243 @@
+"""
+Binary Transaction Matrix File (.stm)
+Bit-packed replacement for processed_medical_data.csv that loads by memory map.
+
+Layout (little-endian):
+- 128-byte header: magic, version, shape and section offsets
+- matrix: n_rows x row_bytes uint8, one bit per symptom (np.packbits, little bit order)
+- diseases: uint32 code per row
+- patient ids: fixed-width bytes per row (omitted when ids are P0001, P0002, ...)
+- meta: JSON with the symptom and disease vocabularies
+
+Sections start on 64-byte boundaries so the memory maps are aligned.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+import pandas as pd
+
+from transactions import TransactionMatrix
+
+
+MAGIC = b'SYMTXMAT'
+FORMAT_VERSION = 1
+HEADER_SIZE = 128
+ALIGNMENT = 64
+
+# magic, version, flags, reserved, n_rows, n_items, row_bytes,
+# matrix_offset, diseases_offset, ids_offset, ids_width, meta_offset, meta_length
+HEADER_STRUCT = struct.Struct('<8sHHIQQQQQQQQQ')
+
+FLAG_EXPLICIT_IDS = 1
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _default_id_strings(start, stop):
+    """Patient ids as numbered by the loaders (P0001, P0002, ...), as a str array"""
+    if stop <= start:
+        return np.empty(0, dtype='U5')
+    return np.char.add('P', np.char.zfill(np.arange(start + 1, stop + 1).astype(str), 4))
+
+
+def _default_ids(start, stop):
+    return _default_id_strings(start, stop).astype(object)
+
+
+def _has_default_ids(patient_ids, start=0):
+    if patient_ids is None:
+        return True
+    ids = np.asarray(patient_ids)
+    if ids.dtype == object:
+        ids = ids.astype(str)
+    elif ids.dtype.kind != 'U':
+        return False  # numbers or bytes never equal the str defaults
+    return bool(np.array_equal(ids, _default_id_strings(start, start + len(ids))))
+
+
+class MatrixFileWriter:
+    """
+    Streaming .stm writer: rows are appended chunk by chunk
+
+        writer = MatrixFileWriter('data/processed_medical_data.stm', symptoms)
+        for chunk in chunks:
+            writer.append(chunk.matrix, chunk.diseases, chunk.patient_ids)
+        writer.close()
+
+    Disease codes (4 bytes per row) and any explicit patient ids are held
+    until close(); the matrix itself goes straight to disk.
+    """
+
+    def __init__(self, path, symptoms):
+        self.path = path
+        self.symptoms = list(symptoms)
+        self.row_bytes = (len(self.symptoms) + 7) // 8
+        self.n_rows = 0
+
+        self._disease_vocabulary = {}
+        self._disease_codes = []
+        self._patient_ids = []
+        self._explicit_ids = False
+
+        self._tmp_path = path + '.tmp'
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(b'\0' * _align(HEADER_SIZE))
+
+    def append(self, matrix, diseases=None, patient_ids=None):
+        matrix = np.asarray(matrix, dtype=bool)
+        if matrix.shape[1] != len(self.symptoms):
+            raise ValueError(f"chunk has {matrix.shape[1]} columns, expected {len(self.symptoms)}")
+        n_chunk = matrix.shape[0]
+
+        self._file.write(np.packbits(matrix, axis=1, bitorder='little').tobytes())
+
+        if diseases is None:
+            diseases = np.full(n_chunk, '', dtype=object)
+        # Chunk-local codes in first-seen order, then one vocabulary lookup per disease
+        local_codes, uniques = pd.factorize(np.asarray(diseases, dtype=object), use_na_sentinel=False)
+        # factorize returns a fresh NaN object; map it to the one vocabulary key
+        uniques = [np.nan if isinstance(disease, float) and disease != disease else disease
+                   for disease in uniques]
+        to_global = np.array([self._disease_vocabulary.setdefault(disease, len(self._disease_vocabulary))
+                              for disease in uniques], dtype=np.uint32)
+        self._disease_codes.append(to_global[local_codes])
+
+        if not self._explicit_ids and not _has_default_ids(patient_ids, self.n_rows):
+            # First non-default id: back-fill the defaults written so far
+            self._explicit_ids = True
+            self._patient_ids = [_default_id_strings(0, self.n_rows)]
+        if self._explicit_ids:
+            ids = (np.asarray(patient_ids).astype(str) if patient_ids is not None
+                   else _default_id_strings(self.n_rows, self.n_rows + n_chunk))
+            self._patient_ids.append(ids)
+
+        self.n_rows += n_chunk
+
+    def close(self):
+        """Write the side sections and header, then move the file into place"""
+        f = self._file
+        matrix_offset = _align(HEADER_SIZE)
+
+        diseases_offset = _align(f.tell())
+        f.write(b'\0' * (diseases_offset - f.tell()))
+        for codes in self._disease_codes:
+            f.write(codes.tobytes())
+
+        ids_offset, ids_width, flags = 0, 0, 0
+        if self._explicit_ids:
+            ids = np.char.encode(np.concatenate(self._patient_ids), 'utf-8')
+            ids_width = ids.dtype.itemsize
+            ids_offset = _align(f.tell())
+            f.write(b'\0' * (ids_offset - f.tell()))
+            f.write(ids.tobytes())
+            flags |= FLAG_EXPLICIT_IDS
+
+        meta = json.dumps({
+            'symptoms': self.symptoms,
+            'diseases': list(self._disease_vocabulary),
+        }).encode('utf-8')
+        meta_offset = _align(f.tell())
+        f.write(b'\0' * (meta_offset - f.tell()))
+        f.write(meta)
+
+        f.seek(0)
+        f.write(HEADER_STRUCT.pack(
+            MAGIC, FORMAT_VERSION, flags, 0,
+            self.n_rows, len(self.symptoms), self.row_bytes,
+            matrix_offset, diseases_offset, ids_offset, ids_width,
+            meta_offset, len(meta),
+        ))
+        f.close()
+        os.replace(self._tmp_path, self.path)
+
+
+def save_matrix(tm, filepath='data/processed_medical_data.stm'):
+    """Write a TransactionMatrix as a .stm file"""
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    writer = MatrixFileWriter(filepath, tm.symptoms)
+    writer.append(tm.matrix, tm.diseases, tm.patient_ids)
+    writer.close()
+    print(f"[OK] Saved binary matrix to: {filepath} ({os.path.getsize(filepath) / 1024:.2f} KB)")
+    return filepath
+
+
+class MatrixFile:
+    """
+    Memory-mapped .stm file
+
+    packed is a zero-copy (n_rows x row_bytes) uint8 view of the file;
+    rows are only unpacked when asked for.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_STRUCT.size)
+        if len(header) < HEADER_STRUCT.size or header[:8] != MAGIC:
+            raise ValueError(f"{path} is not a binary transaction matrix file")
+
+        (_, version, flags, _, self.n_rows, n_items, self.row_bytes,
+         matrix_offset, diseases_offset, ids_offset, ids_width,
+         meta_offset, meta_length) = HEADER_STRUCT.unpack(header)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported matrix file version {version} in {path}")
+
+        with open(path, 'rb') as f:
+            f.seek(meta_offset)
+            meta = json.loads(f.read(meta_length).decode('utf-8'))
+        self.symptoms = meta['symptoms']
+        self.disease_names = np.array(meta['diseases'], dtype=object)
+        if len(self.symptoms) != n_items:
+            raise ValueError(f"{path}: header says {n_items} symptoms, vocabulary has {len(self.symptoms)}")
+
+        self.packed = self._map(matrix_offset, np.uint8, (self.n_rows, self.row_bytes))
+        self.disease_codes = self._map(diseases_offset, np.uint32, (self.n_rows,))
+        self._ids = None
+        if flags & FLAG_EXPLICIT_IDS:
+            self._ids = self._map(ids_offset, f'S{ids_width}', (self.n_rows,))
+
+    def _map(self, offset, dtype, shape):
+        if 0 in shape:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    @property
+    def n_items(self):
+        return len(self.symptoms)
+
+    def patient_ids(self, start=0, stop=None):
+        stop = self.n_rows if stop is None else min(stop, self.n_rows)
+        if self._ids is None:
+            return _default_ids(start, stop)
+        return np.array([pid.decode('utf-8') for pid in self._ids[start:stop]], dtype=object)
+
+    def read_rows(self, start, stop):
+        """Rows [start, stop) unpacked into a TransactionMatrix"""
+        stop = min(stop, self.n_rows)
+        matrix = np.unpackbits(self.packed[start:stop], axis=1, count=self.n_items,
+                               bitorder='little').view(bool)
+        diseases = self.disease_names[self.disease_codes[start:stop]]
+        return TransactionMatrix(matrix, self.symptoms, diseases, self.patient_ids(start, stop))
+
+    def iter_chunks(self, chunk_rows=100_000):
+        """Consecutive TransactionMatrix chunks, for the out-of-core miner"""
+        for start in range(0, self.n_rows, chunk_rows):
+            yield self.read_rows(start, start + chunk_rows)
+
+    def to_matrix(self):
+        return self.read_rows(0, self.n_rows)
+
+    def __repr__(self):
+        return f"MatrixFile({self.path!r}, rows={self.n_rows}, symptoms={self.n_items})"
+
+
+def load_matrix(filepath='data/processed_medical_data.stm'):
+    """Load a .stm file as a TransactionMatrix"""
+    return MatrixFile(filepath).to_matrix()
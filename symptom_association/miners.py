@@ -0,0 +1,201 @@
+"""
+Frequent Itemset Miner Registry
+Maps backend names to miner functions and picks one automatically.
+
+Every miner takes (df, min_support, use_colnames, max_len) like mlxtend and
+returns a ['support', 'itemsets'] frame, so backends are interchangeable.
+
+With co-occurrence counts (see cooccurrence) 'auto' estimates from exact
+item and pair counts instead of a sample, and picks 'pairs' - reading the
+itemsets off the counts without mining - when no itemset can have more
+than two symptoms.
+"""
+
+import os
+
+import numpy as np
+
+from cooccurrence import CooccurrenceAccumulator, cooccurrence
+from eclat import eclat, eclat_parallel
+from vertical import VerticalDatabase
+
+
+MINERS = {}
+VERTICAL_MINERS = set()  # Miners that take a VerticalDatabase without unpacking it
+
+# Cost model constants (seconds), calibrated against the apriori / fpgrowth /
+# eclat timings of benchmark_miners.py on dataset.csv resampled to
+# 5k / 50k / 200k rows. Rerun that benchmark after changing a backend.
+COST_MODEL = {
+    'apriori': {'fixed': 1e-3, 'per_itemset': 1e-5, 'per_itemset_row': 4.5e-9},
+    'fpgrowth': {'fixed': 5e-3, 'per_itemset': 3e-5, 'per_nonzero': 1.1e-6},
+    'eclat': {'fixed': 2e-3, 'per_itemset': 1.1e-5, 'per_itemset_row': 8e-11,
+              'per_cell': 2.5e-10},
+    # Pool start-up plus shared-memory copy; mining itself scales with cores
+    'eclat_parallel': {'fixed': 0.3, 'efficiency': 0.8},
+}
+
+# Rows sampled when estimating the itemset count for 'auto'
+ESTIMATE_SAMPLE_ROWS = 20000
+
+
+def register_miner(name, func=None, vertical=False):
+    """
+    Register a miner under name; usable as a decorator
+
+        @register_miner('native')
+        def native_miner(df, min_support=0.5, use_colnames=False, max_len=None): ...
+
+    vertical=True marks a miner that accepts a vertical.VerticalDatabase as df.
+    """
+    if func is None:
+        def decorator(f):
+            return register_miner(name, f, vertical)
+        return decorator
+    MINERS[name] = func
+    if vertical:
+        VERTICAL_MINERS.add(name)
+    else:
+        VERTICAL_MINERS.discard(name)
+    return func
+
+
+def _mlxtend_miner(name):
+    """mlxtend backend imported on first call (the import alone takes ~0.6s)"""
+    def miner(df, min_support=0.5, use_colnames=False, max_len=None, **kwargs):
+        from mlxtend import frequent_patterns
+        if isinstance(df, VerticalDatabase):
+            df = df.to_frame()
+        return getattr(frequent_patterns, name)(df, min_support=min_support, use_colnames=use_colnames,
+                                                max_len=max_len, **kwargs)
+    miner.__name__ = name
+    return miner
+
+
+register_miner('apriori', _mlxtend_miner('apriori'))
+register_miner('fpgrowth', _mlxtend_miner('fpgrowth'))
+register_miner('eclat', eclat, vertical=True)
+register_miner('eclat_parallel', eclat_parallel, vertical=True)
+
+
+def available_miners():
+    """Registered backend names plus 'auto'"""
+    return ['auto'] + sorted(MINERS)
+
+
+def estimate_itemset_count(matrix, min_support, sample_rows=ESTIMATE_SAMPLE_ROWS, seed=0,
+                           counts=None):
+    """
+    Rough number of frequent itemsets from frequent items and pairs
+
+    Treats the frequent-pair graph as disjoint cliques of the average degree k:
+    F1 / (k + 1) cliques each contributing 2^(k + 1) - 1 itemsets. Within ~3x
+    of the true count on dataset.csv from support 0.2 down to 0.02.
+    counts (co-occurrence counts of every column) replaces the sample.
+    """
+    if counts is None:
+        n_rows = matrix.shape[0]
+        if n_rows == 0:
+            return 0.0
+        if n_rows > sample_rows:
+            rows = np.random.default_rng(seed).choice(n_rows, sample_rows, replace=False)
+            matrix = matrix[rows]
+        item_support = matrix.sum(axis=0) / len(matrix)
+        frequent = np.flatnonzero(item_support >= min_support)
+        if len(frequent) == 0:
+            return 0.0
+        accumulator = CooccurrenceAccumulator(list(range(matrix.shape[1])), frequent)
+        accumulator.add(matrix)
+        counts = accumulator.result()
+    f1, f2 = counts.frequent_counts(min_support)
+    if f1 == 0:
+        return 0.0
+
+    degree = 2.0 * f2 / f1
+    return f1 / (degree + 1.0) * (2.0 ** min(degree + 1.0, 60.0) - 1.0)
+
+
+def estimate_costs(n_rows, n_items, density, n_itemsets, n_cores=None):
+    """Predicted runtime (seconds) of each built-in backend"""
+    if n_cores is None:
+        n_cores = os.cpu_count() or 1
+    nonzero = n_rows * n_items * density
+    ap, fp, ec = COST_MODEL['apriori'], COST_MODEL['fpgrowth'], COST_MODEL['eclat']
+    par = COST_MODEL['eclat_parallel']
+
+    eclat_build = ec['fixed'] + ec['per_cell'] * n_rows * n_items
+    eclat_mine = n_itemsets * (ec['per_itemset'] + ec['per_itemset_row'] * n_rows)
+
+    costs = {
+        'apriori': ap['fixed'] + n_itemsets * (ap['per_itemset'] + ap['per_itemset_row'] * n_rows),
+        'fpgrowth': fp['fixed'] + fp['per_nonzero'] * nonzero + fp['per_itemset'] * n_itemsets,
+        'eclat': eclat_build + eclat_mine,
+    }
+    if n_cores > 1:
+        costs['eclat_parallel'] = (par['fixed'] + eclat_build
+                                   + eclat_mine / (n_cores * par['efficiency']))
+    return costs
+
+
+def pairs_suffice(counts, min_support, max_len=None):
+    """True when no frequent itemset can have more than two symptoms"""
+    if max_len is not None and max_len <= 2:
+        return True
+    # A frequent triple needs all three of its pairs frequent
+    return counts.frequent_counts(min_support)[1] < 3
+
+
+def choose_miner(df_binary, min_support, counts=None, max_len=None):
+    """
+    Pick the cheapest built-in backend for this dataset and support
+
+    counts are co-occurrence counts of every column of df_binary; with them
+    the estimate is exact-input and 'pairs' is returned when pairs_suffice.
+    A VerticalDatabase is counted directly instead of being unpacked.
+    """
+    if counts is None and isinstance(df_binary, VerticalDatabase):
+        counts = cooccurrence(df_binary)
+    if counts is None:
+        matrix = df_binary.to_numpy(dtype=bool)
+        n_rows, n_items = matrix.shape
+        density = matrix.mean() if matrix.size else 0.0
+    else:
+        if pairs_suffice(counts, min_support, max_len):
+            return 'pairs', {'pairs': 0.0}
+        matrix = None
+        n_rows, n_items = counts.n_rows, len(counts)
+        density = counts.item_counts.sum() / (n_rows * n_items) if n_rows and n_items else 0.0
+
+    n_itemsets = estimate_itemset_count(matrix, min_support, counts=counts)
+    costs = estimate_costs(n_rows, n_items, density, n_itemsets)
+    return min(costs, key=costs.get), costs
+
+
+def get_miner(name):
+    """Look up a registered miner function"""
+    if name not in MINERS:
+        raise ValueError(f"Unknown miner '{name}'. Available: {', '.join(available_miners())}")
+    return MINERS[name]
+
+
+def run_miner(name, df_binary, min_support, max_len=None, counts=None, db=None):
+    """
+    Mine frequent itemsets with the named backend ('auto' picks one)
+
+    'pairs' reads the 1- and 2-itemsets off co-occurrence counts (computed
+    here when not given); it is only valid when pairs_suffice.
+    db is df_binary already packed (vertical.VerticalDatabase), handed to
+    the VERTICAL_MINERS instead of df_binary.
+    Returns (frequent_itemsets, backend_name).
+    """
+    if name == 'auto':
+        name, _ = choose_miner(df_binary, min_support, counts, max_len)
+    if name == 'pairs':
+        if counts is None:
+            counts = cooccurrence(df_binary)
+        if not pairs_suffice(counts, min_support, max_len):
+            raise ValueError("'pairs' needs max_len <= 2 or fewer than 3 frequent pairs")
+        return counts.frequent_itemsets(min_support, max_len=max_len), name
+    miner = get_miner(name)
+    data = db if db is not None and name in VERTICAL_MINERS else df_binary
+    return miner(data, min_support=min_support, use_colnames=True, max_len=max_len), name
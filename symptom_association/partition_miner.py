@@ -0,0 +1,131 @@
+"""
+Out-of-Core Frequent Itemset Mining (SON / partition algorithm)
+Two passes over a chunked transaction source; peak memory is set by the
+chunk size, not the dataset size.
+
+Pass 1 mines every chunk locally at the same relative support. Any itemset
+frequent overall must be locally frequent in at least one chunk, so the
+union of local results is a complete candidate set. A short final chunk is
+mined together with the one before it: at a relative support, a few rows
+make almost every subset of their symptoms a candidate. A local chunk
+therefore holds fewer than 2 x chunk_rows rows.
+Pass 2 streams the data again and counts every candidate exactly.
+
+The source can be anything with n_rows, symptoms and iter_chunks(chunk_rows),
+e.g. a TransactionStore. Chunks that each hold only a few diseases (files
+sorted by disease, like dataset.csv) give larger local candidate sets;
+the result is still exact.
+"""
+
+import numpy as np
+
+from bitset import pack_columns, popcount
+from eclat import itemsets_to_frame
+from miners import choose_miner, get_miner
+from transactions import TransactionMatrix
+
+
+# Local thresholds are lowered by this relative margin so float rounding at
+# the boundary can never drop a candidate (pass 2 applies the exact cut)
+LOCAL_SUPPORT_MARGIN = 1e-9
+
+
+def _non_empty(chunk):
+    """Drop rows without symptoms but keep every column (indices stay global)"""
+    keep = chunk.matrix.any(axis=1)
+    return chunk if keep.all() else chunk.take_rows(keep)
+
+
+def _local_chunks(source, chunk_rows):
+    """iter_chunks with a final chunk shorter than chunk_rows merged into the previous one"""
+    previous = None
+    for chunk in source.iter_chunks(chunk_rows):
+        if previous is not None and chunk.n_rows < chunk_rows:
+            chunk = TransactionMatrix(np.vstack([previous.matrix, chunk.matrix]), chunk.symptoms)
+        elif previous is not None:
+            yield previous
+        previous = chunk
+    if previous is not None:
+        yield previous
+
+
+def _build_trie(candidates):
+    """Nested dict trie over sorted item tuples; '$' marks a candidate id"""
+    root = {}
+    for cid, itemset in enumerate(candidates):
+        node = root
+        for item in itemset:
+            node = node.setdefault(item, {})
+        node['$'] = cid
+    return root
+
+
+def _count_trie(node, prefix_bits, bits, counts):
+    """Depth-first AND + popcount down the trie, sharing prefix intersections"""
+    children = [item for item in node if item != '$']
+    if not children:
+        return
+    child_bits = bits[children] if prefix_bits is None else bits[children] & prefix_bits
+    child_counts = popcount(child_bits)
+    for k, item in enumerate(children):
+        child = node[item]
+        if '$' in child:
+            counts[child['$']] += child_counts[k]
+        if len(child) > ('$' in child) and child_counts[k] > 0:
+            _count_trie(child, child_bits[k], bits, counts)
+
+
+def count_candidates(chunks, candidates):
+    """Exact support counts of candidate item-index tuples over all chunks"""
+    counts = np.zeros(len(candidates), dtype=np.int64)
+    if not candidates:
+        return counts
+    trie = _build_trie(candidates)
+    for chunk in chunks:
+        _count_trie(trie, None, pack_columns(chunk.matrix), counts)
+    return counts
+
+
+def mine_out_of_core(source, min_support, chunk_rows=100_000, miner='eclat', max_len=None):
+    """
+    Frequent itemsets of a chunked source, identical to the in-memory miners
+
+    Supports are relative to non-empty rows, like the in-memory path after
+    drop_empty(). Returns an mlxtend-style ['support', 'itemsets'] frame.
+    """
+    print(f"\n[*] Out-of-core mining (min_support={min_support}, chunk_rows={chunk_rows:,})...")
+    local_support = min_support * (1.0 - LOCAL_SUPPORT_MARGIN)
+
+    # Pass 1: local mining per chunk
+    candidates = set()
+    n_rows = 0
+    for i, chunk in enumerate(_local_chunks(source, chunk_rows), 1):
+        chunk = _non_empty(chunk)
+        n_rows += chunk.n_rows
+        if chunk.n_rows == 0:
+            continue
+
+        df_chunk = chunk.to_frame()
+        if miner == 'auto':
+            miner, _ = choose_miner(df_chunk, local_support)
+            print(f"     Auto-selected '{miner}' for local mining")
+
+        local = get_miner(miner)(df_chunk, min_support=local_support,
+                                 use_colnames=False, max_len=max_len)
+        candidates.update(tuple(sorted(itemset)) for itemset in local['itemsets'])
+        print(f"     Pass 1, chunk {i}: {len(local)} local itemsets, {len(candidates)} candidates")
+
+    if n_rows == 0:
+        return itemsets_to_frame([], 0, source.symptoms)
+
+    # Pass 2: exact global counts
+    candidates = sorted(candidates, key=lambda itemset: (len(itemset), itemset))
+    counts = count_candidates((_non_empty(chunk) for chunk in source.iter_chunks(chunk_rows)),
+                              candidates)
+
+    found = [(itemset, int(count)) for itemset, count in zip(candidates, counts)
+             if count / n_rows >= min_support]
+    print(f"[OK] Pass 2: {len(found)} of {len(candidates)} candidates are frequent "
+          f"over {n_rows:,} rows")
+
+    return itemsets_to_frame(found, n_rows, source.symptoms)
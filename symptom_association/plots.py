@@ -0,0 +1,378 @@
+"""
+Rule Visualizations
+Static (matplotlib/seaborn/networkx) and interactive (plotly) charts of the
+mined rules, written to visualizations/.
+
+Kept out of symptom_analysis_updated so the plotting stacks are imported
+only by runs that plot; the Agg backend renders without a display.
+
+plot_all() renders the charts concurrently, one process-pool task per chart.
+Each task gets only the data its chart draws, reduced in the parent: the
+top rules, the three metric columns for the scatter (hexbinned above
+SCATTER_MAX_POINTS rules) and the top symptoms' co-occurrence counts for
+the heatmap (taken from precomputed counts when the pipeline has them).
+Per-chart times are checked against PLOT_BUDGETS. Both network charts draw
+with one shared, cached layout (see symptom_graph).
+
+    import plots
+    plots.plot_all(rules, df_binary)
+    plots.plot_all(rules, counts=counts)
+"""
+
+import os
+import time
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import networkx as nx
+import numpy as np
+import plotly.graph_objects as go
+import seaborn as sns
+
+import run_report
+from cooccurrence import cooccurrence
+from symptom_graph import build_symptom_graph, layout
+
+
+OUTPUT_DIR = 'visualizations'
+PLOT_DPI = 300
+PLOT_JOBS = None  # Worker processes for plot_all (None = one per chart, up to the core count)
+SCATTER_MAX_POINTS = 20000  # Larger rule sets are drawn as a hexbin density plot
+SCATTER_GRIDSIZE = 60  # Hexagons across the support axis
+NETWORK_LAYOUT = 'auto'  # symptom_graph layout: 'auto', 'spring' or 'spectral'
+
+# Seconds each chart may take before the run summary flags it
+PLOT_BUDGETS = {
+    'scatter': 5.0,
+    'top_rules_bar': 5.0,
+    'network': 5.0,
+    'heatmap': 5.0,
+    'interactive_network': 5.0,
+}
+
+
+def plot_support_confidence_scatter(rules):
+    """
+    Scatter plot of support vs confidence
+    
+    Above SCATTER_MAX_POINTS rules, individual markers overdraw each other
+    and dominate render time, so the plot becomes a hexbin of mean lift.
+    """
+    if len(rules) == 0:
+        return
+    
+    print("\n[*] Creating support-confidence scatter plot...")
+    
+    fig, ax = plt.subplots(figsize=(12, 8))
+    
+    if len(rules) > SCATTER_MAX_POINTS:
+        scatter = ax.hexbin(rules['support'], rules['confidence'], C=rules['lift'],
+                            reduce_C_function=np.mean, gridsize=SCATTER_GRIDSIZE,
+                            mincnt=1, cmap='viridis')
+        title = f'Association Rules: Support vs Confidence ({len(rules):,} rules, mean Lift per bin)'
+    else:
+        scatter = ax.scatter(rules['support'], rules['confidence'], 
+                            c=rules['lift'], s=rules['lift']*50, 
+                            alpha=0.6, cmap='viridis', edgecolors='black', linewidth=0.5)
+        title = 'Association Rules: Support vs Confidence (sized by Lift)'
+    
+    ax.set_xlabel('Support', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Confidence', fontsize=12, fontweight='bold')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    
+    # Add colorbar
+    cbar = plt.colorbar(scatter, ax=ax)
+    cbar.set_label('Lift', fontsize=11, fontweight='bold')
+    
+    plt.tight_layout()
+    plt.savefig('visualizations/support_confidence_scatter.png', dpi=PLOT_DPI, bbox_inches='tight')
+    print("     [OK] Saved: visualizations/support_confidence_scatter.png")
+    plt.close()
+
+
+def plot_top_rules_bar(rules, top_n=20):
+    """Bar chart of top association rules"""
+    if len(rules) == 0:
+        return
+    
+    print("\n[*] Creating top rules bar chart...")
+    
+    top_rules = rules.nlargest(top_n, 'lift').copy()
+    
+    # Create rule labels
+    top_rules['rule'] = top_rules.apply(
+        lambda row: f"{', '.join(list(row['antecedents'])[:2])} → {', '.join(list(row['consequents'])[:2])}", 
+        axis=1
+    )
+    
+    fig, ax = plt.subplots(figsize=(14, 10))
+    
+    y_pos = np.arange(len(top_rules))
+    ax.barh(y_pos, top_rules['lift'], color='steelblue', alpha=0.8)
+    
+    ax.set_yticks(y_pos)
+    ax.set_yticklabels(top_rules['rule'], fontsize=9)
+    ax.set_xlabel('Lift', fontsize=12, fontweight='bold')
+    ax.set_title(f'Top {top_n} Association Rules by Lift', fontsize=14, fontweight='bold')
+    ax.grid(axis='x', alpha=0.3)
+    
+    # Add value labels
+    for i, v in enumerate(top_rules['lift']):
+        ax.text(v + 0.05, i, f'{v:.2f}', va='center', fontsize=8)
+    
+    plt.tight_layout()
+    plt.savefig('visualizations/top_rules_bar.png', dpi=PLOT_DPI, bbox_inches='tight')
+    print("     [OK] Saved: visualizations/top_rules_bar.png")
+    plt.close()
+
+
+def plot_symptom_network(rules, top_n=30, pos=None):
+    """
+    Network graph of symptom associations
+    
+    pos is a precomputed layout covering the graph's nodes (e.g. shared with
+    create_interactive_network); by default the graph's own cached layout.
+    """
+    if len(rules) == 0:
+        return
+    
+    print("\n[*] Creating symptom network graph...")
+    
+    # Edge weight = summed lift of the top rules linking two symptoms
+    G = build_symptom_graph(rules, top_n)
+    if pos is None:
+        pos = layout(G, NETWORK_LAYOUT)
+    
+    # Plot
+    fig, ax = plt.subplots(figsize=(16, 12))
+    
+    # Draw nodes
+    node_sizes = [G.degree(node) * 300 for node in G.nodes()]
+    nx.draw_networkx_nodes(G, pos, node_size=node_sizes, 
+                          node_color='lightblue', alpha=0.9, 
+                          edgecolors='darkblue', linewidths=2, ax=ax)
+    
+    # Draw edges
+    edges = G.edges()
+    weights = [G[u][v]['weight'] for u, v in edges]
+    max_weight = max(weights) if weights else 1
+    nx.draw_networkx_edges(G, pos, width=[w/max_weight*5 for w in weights],
+                          alpha=0.5, edge_color='gray', 
+                          arrows=True, arrowsize=20, ax=ax)
+    
+    # Draw labels
+    nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold', ax=ax)
+    
+    ax.set_title(f'Symptom Association Network (Top {top_n} Rules)', 
+                fontsize=16, fontweight='bold')
+    ax.axis('off')
+    
+    plt.tight_layout()
+    plt.savefig('visualizations/symptom_network.png', dpi=PLOT_DPI, bbox_inches='tight')
+    print("     [OK] Saved: visualizations/symptom_network.png")
+    plt.close()
+
+
+def top_symptom_cooccurrence(df_binary, top_n=20):
+    """Co-occurrence counts of the top_n most frequent symptoms (only those are counted)"""
+    return cooccurrence(df_binary, top_n=top_n).to_frame()
+
+
+def plot_symptom_heatmap(df_binary, top_n=20):
+    """Heatmap of symptom co-occurrences"""
+    plot_cooccurrence_heatmap(top_symptom_cooccurrence(df_binary, top_n))
+
+
+def plot_cooccurrence_heatmap(co_occurrence_top):
+    """Heatmap of a (symptoms x symptoms) co-occurrence count frame"""
+    print("\n[*] Creating symptom co-occurrence heatmap...")
+    top_n = len(co_occurrence_top)
+    
+    # Plot
+    fig, ax = plt.subplots(figsize=(14, 12))
+    
+    sns.heatmap(co_occurrence_top, annot=True, fmt='d', cmap='YlOrRd', 
+                square=True, linewidths=0.5, cbar_kws={'label': 'Co-occurrence Count'},
+                ax=ax)
+    
+    ax.set_title(f'Top {top_n} Symptom Co-occurrence Heatmap', 
+                fontsize=14, fontweight='bold')
+    
+    plt.tight_layout()
+    plt.savefig('visualizations/symptom_heatmap.png', dpi=PLOT_DPI, bbox_inches='tight')
+    print("     [OK] Saved: visualizations/symptom_heatmap.png")
+    plt.close()
+
+
+def create_interactive_network(rules, top_n=50, pos=None):
+    """Create interactive network visualization with Plotly (pos as in plot_symptom_network)"""
+    if len(rules) == 0:
+        return
+    
+    print("\n[*] Creating interactive network visualization...")
+    
+    G = build_symptom_graph(rules, top_n)
+    if pos is None:
+        pos = layout(G, NETWORK_LAYOUT)
+    
+    # Create edge trace
+    edge_x = []
+    edge_y = []
+    for edge in G.edges():
+        x0, y0 = pos[edge[0]]
+        x1, y1 = pos[edge[1]]
+        edge_x.extend([x0, x1, None])
+        edge_y.extend([y0, y1, None])
+    
+    edge_trace = go.Scatter(
+        x=edge_x, y=edge_y,
+        line=dict(width=0.5, color='#888'),
+        hoverinfo='none',
+        mode='lines')
+    
+    # Create node trace
+    node_x = []
+    node_y = []
+    node_text = []
+    node_size = []
+    
+    for node in G.nodes():
+        x, y = pos[node]
+        node_x.append(x)
+        node_y.append(y)
+        node_text.append(f"{node}<br>Degree: {G.degree(node)}")
+        node_size.append(G.degree(node) * 10 + 20)
+    
+    node_trace = go.Scatter(
+        x=node_x, y=node_y,
+        mode='markers+text',
+        text=[node for node in G.nodes()],
+        textposition="top center",
+        hovertext=node_text,
+        hoverinfo='text',
+        marker=dict(
+            size=node_size,
+            color='lightblue',
+            line=dict(width=2, color='darkblue')
+        ))
+    
+    # Create figure
+    fig = go.Figure(data=[edge_trace, node_trace],
+                   layout=go.Layout(
+                       title=dict(text=f'Interactive Symptom Association Network (Top {top_n} Rules)',
+                                  font=dict(size=16)),
+                       showlegend=False,
+                       hovermode='closest',
+                       margin=dict(b=0, l=0, r=0, t=40),
+                       xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                       yaxis=dict(showgrid=False, zeroline=False, showticklabels=False))
+                   )
+    
+    fig.write_html('visualizations/interactive_network.html')
+    print("     [OK] Saved: visualizations/interactive_network.html")
+
+
+# ==================== PARALLEL RENDERING ====================
+_RENDERERS = {
+    'scatter': plot_support_confidence_scatter,
+    'top_rules_bar': plot_top_rules_bar,
+    'network': plot_symptom_network,
+    'heatmap': plot_cooccurrence_heatmap,
+    'interactive_network': create_interactive_network,
+}
+
+
+def plot_jobs(rules, df_binary=None, counts=None):
+    """
+    (name, args, kwargs) per chart, with each chart's input already reduced
+    
+    The rule charts only draw their top rules by lift, and the scatter only
+    reads three metric columns, so workers never receive the full rule set.
+    The heatmap uses counts (cooccurrence.CooccurrenceCounts) when given,
+    else counts the top symptoms of df_binary.
+    """
+    top_rules = rules.nlargest(50, 'lift')
+    # One layout of the larger network places the nodes of both network charts
+    pos = layout(build_symptom_graph(top_rules), NETWORK_LAYOUT)
+    jobs = [
+        ('scatter', (rules[['support', 'confidence', 'lift']].reset_index(drop=True),), {}),
+        ('top_rules_bar', (top_rules.head(20),), {'top_n': 20}),
+        ('network', (top_rules.head(30),), {'top_n': 30, 'pos': pos}),
+    ]
+    if counts is not None:
+        jobs.append(('heatmap', (counts.top(20).to_frame(),), {}))
+    elif df_binary is not None:
+        jobs.append(('heatmap', (top_symptom_cooccurrence(df_binary, top_n=20),), {}))
+    jobs.append(('interactive_network', (top_rules,), {'top_n': 50, 'pos': pos}))
+    return jobs
+
+
+def _render(job):
+    """Run one chart job; returns its timing record (errors are reported, not raised)"""
+    name, args, kwargs = job
+    start_time = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    error = None
+    try:
+        _RENDERERS[name](*args, **kwargs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e).strip().splitlines()[0] if str(e).strip() else ''}"
+    finally:
+        plt.close('all')
+    return {
+        'name': name,
+        'start_time': start_time,
+        'wall_s': time.perf_counter() - wall_start,
+        'cpu_s': time.process_time() - cpu_start,
+        'worker_pid': os.getpid(),
+        'error': error,
+    }
+
+
+def plot_all(rules, df_binary=None, counts=None, n_jobs=PLOT_JOBS):
+    """
+    Every chart for a rule set; the heatmap needs co-occurrence counts or
+    the encoded data
+    
+    Charts render in a process pool (serially when only one worker is
+    available). A chart that fails is reported and the others still render.
+    Returns the per-chart timing records.
+    """
+    if len(rules) == 0:
+        return []
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with run_report.stage('plot') as stage:
+        jobs = plot_jobs(rules, df_binary, counts)
+        if n_jobs is None:
+            n_jobs = min(len(jobs), os.cpu_count() or 1)
+        
+        if n_jobs > 1:
+            with Pool(processes=n_jobs) as pool:
+                results = pool.map(_render, jobs, chunksize=1)
+        else:
+            results = [_render(job) for job in jobs]
+        stage.count(charts=len(results), workers=n_jobs)
+    
+    print("\n[*] Plot timings:")
+    for result in results:
+        budget = PLOT_BUDGETS.get(result['name'])
+        extra = {'budget_s': budget}
+        if result['error']:
+            extra['error'] = result['error'].split(':')[0]
+        if n_jobs > 1:
+            extra['worker_pid'] = result['worker_pid']
+        run_report.record(result['name'], result['start_time'], result['wall_s'], result['cpu_s'],
+                          parent='plot', **extra)
+        
+        status = ''
+        if result['error']:
+            status = f"  [!] FAILED: {result['error']}"
+        elif budget is not None and result['wall_s'] > budget:
+            status = "  [!] OVER BUDGET"
+        budget_text = f" (budget {budget}s)" if budget is not None else ''
+        print(f"     {result['name']:<20} {result['wall_s']:7.2f}s{budget_text}{status}")
+    return results
@@ -7,6 +7,9 @@ import pandas as pd
 import numpy as np
 import os
 
+from transactions import TransactionMatrix
+from transaction_store import TransactionStore, TransactionStoreWriter
+
 def load_real_dataset(data_dir='data'):
     """
     Load and process real Kaggle disease-symptom dataset
@@ -56,6 +59,89 @@ def load_real_dataset(data_dir='data'):
     return df_main, df_severity, df_description, df_precaution
 
 
+def _factorize_cells(df_main, symptom_cols):
+    """
+    Factorize the row-major flattened symptom cells
+    
+    Returns (codes, stripped): codes[k] indexes stripped for cell k (cell k
+    belongs to row k // len(symptom_cols)); -1 marks NaN cells.
+    """
+    values = df_main[symptom_cols].to_numpy(dtype=object).ravel()
+    codes, uniques = pd.factorize(values)
+    stripped = [str(value).strip() for value in uniques]
+    return codes, stripped
+
+
+def encode_symptom_matrix(df_main, symptom_cols):
+    """
+    One-hot encode the wide Symptom_1..Symptom_N columns into a boolean matrix
+    
+    Raw cell values are factorized once, so stripping and vocabulary lookup
+    only happen per distinct value instead of per cell.
+    Returns (matrix, all_symptoms) where matrix is (n_rows x n_symptoms) bool
+    and all_symptoms is the sorted vocabulary.
+    """
+    n_rows, n_cols = len(df_main), len(symptom_cols)
+    
+    codes, stripped = _factorize_cells(df_main, symptom_cols)
+    all_symptoms = sorted(set(s for s in stripped if s))
+    position = {symptom: i for i, symptom in enumerate(all_symptoms)}
+    
+    # Map each distinct raw value to its symptom column (-1 = no symptom);
+    # the trailing -1 catches the NaN sentinel code from factorize
+    lookup = np.array([position[s] if s and s != 'nan' else -1 for s in stripped] + [-1],
+                      dtype=np.intp)
+    symptom_idx = lookup[codes]
+    
+    present = np.flatnonzero(symptom_idx >= 0)
+    matrix = np.zeros((n_rows, len(all_symptoms)), dtype=bool)
+    matrix[present // n_cols, symptom_idx[present]] = True
+    
+    return matrix, all_symptoms
+
+
+def encode_symptom_codes(df_chunk, symptom_cols, vocabulary):
+    """
+    Encode one chunk of the wide format into (row, symptom code) pairs
+    
+    vocabulary maps symptom -> code and grows in first-seen order, so codes
+    stay stable across chunks. Pairs are sorted by row then code, with
+    duplicate symptoms within a row removed.
+    """
+    n_cols = len(symptom_cols)
+    
+    codes, stripped = _factorize_cells(df_chunk, symptom_cols)
+    lookup = np.array([vocabulary.setdefault(s, len(vocabulary)) if s and s != 'nan' else -1
+                       for s in stripped] + [-1], dtype=np.int64)
+    symptom_idx = lookup[codes]
+    
+    present = np.flatnonzero(symptom_idx >= 0)
+    keys = np.unique((present // n_cols) << 32 | symptom_idx[present])
+    return keys >> 32, (keys & 0xFFFFFFFF).astype(np.uint32)
+
+
+def build_transaction_matrix(df_main, disease_col=None, symptom_cols=None):
+    """
+    Encode the wide dataset straight into a TransactionMatrix
+    
+    Patient ids follow the P0001 numbering of the row index.
+    """
+    if disease_col is None:
+        disease_col = df_main.columns[0]
+    if symptom_cols is None:
+        symptom_cols = [col for col in df_main.columns if col != disease_col]
+    
+    matrix, all_symptoms = encode_symptom_matrix(df_main, symptom_cols)
+    patient_ids = 'P' + pd.Index(df_main.index + 1).astype(str).str.zfill(4)
+    
+    return TransactionMatrix(
+        matrix,
+        all_symptoms,
+        diseases=df_main[disease_col].fillna('').to_numpy(),
+        patient_ids=np.asarray(patient_ids, dtype=object),
+    )
+
+
 def preprocess_dataset(df_main):
     """
     Preprocess the main dataset for association rule mining
@@ -77,41 +163,13 @@ def preprocess_dataset(df_main):
     symptom_cols = [col for col in df_main.columns if col != disease_col]
     print(f"   Symptom columns: {len(symptom_cols)}")
     
-    # Create binary matrix
-    # Replace NaN with empty string
-    df_processed = df_main.copy()
-    df_processed = df_processed.fillna('')
-    
-    # Get all unique symptoms
-    all_symptoms = set()
-    for col in symptom_cols:
-        symptoms = df_processed[col].unique()
-        all_symptoms.update([s.strip() for s in symptoms if s and s.strip()])
-    
-    all_symptoms = sorted(list(all_symptoms))
+    # Vectorized one-hot encoding (no per-row Python loop)
+    tm = build_transaction_matrix(df_main, disease_col, symptom_cols)
+    all_symptoms = tm.symptoms
     print(f"   Unique symptoms found: {len(all_symptoms)}")
     
-    # Create binary encoding
-    binary_data = []
-    
-    for idx, row in df_processed.iterrows():
-        disease = row[disease_col]
-        patient_symptoms = []
-        
-        # Collect all symptoms for this patient
-        for col in symptom_cols:
-            symptom = str(row[col]).strip()
-            if symptom and symptom != '' and symptom != 'nan':
-                patient_symptoms.append(symptom)
-        
-        # Create binary row
-        binary_row = {'patient_id': f'P{idx+1:04d}', 'disease': disease}
-        for symptom in all_symptoms:
-            binary_row[symptom] = 1 if symptom in patient_symptoms else 0
-        
-        binary_data.append(binary_row)
-    
-    df_binary = pd.DataFrame(binary_data)
+    # Assemble the binary frame: patient_id, disease, one 0/1 column per symptom
+    df_binary = tm.to_binary_frame()
     
     print(f"[OK] Created binary matrix: {df_binary.shape}")
     print(f"   Patients: {len(df_binary)}")
@@ -120,6 +178,44 @@ def preprocess_dataset(df_main):
     return df_binary, all_symptoms
 
 
+def stream_real_dataset(data_dir='data', store_dir=None, chunk_rows=100_000):
+    """
+    Stream dataset.csv into an on-disk TransactionStore, chunk by chunk
+    
+    For exports too large to read in one go: memory is bounded by
+    chunk_rows, not by file size. The symptom and disease vocabularies are
+    built incrementally. Returns the opened TransactionStore.
+    """
+    dataset_path = os.path.join(data_dir, 'dataset.csv')
+    if store_dir is None:
+        store_dir = os.path.join(data_dir, 'transactions')
+    print(f"\n[*] Streaming {dataset_path} into {store_dir} ({chunk_rows:,} rows per chunk)...")
+    
+    vocabulary, disease_vocabulary = {}, {}
+    symptom_cols = []
+    
+    with TransactionStoreWriter(store_dir) as writer:
+        for chunk in pd.read_csv(dataset_path, chunksize=chunk_rows):
+            disease_col = chunk.columns[0]
+            symptom_cols = [col for col in chunk.columns if col != disease_col]
+            
+            rows, codes = encode_symptom_codes(chunk, symptom_cols, vocabulary)
+            
+            disease_idx, disease_values = pd.factorize(chunk[disease_col].fillna('').to_numpy(dtype=object))
+            disease_lookup = np.array([disease_vocabulary.setdefault(d, len(disease_vocabulary))
+                                       for d in disease_values], dtype=np.uint32)
+            
+            writer.append(rows, codes, disease_lookup[disease_idx])
+            print(f"   Chunk {writer.n_chunks}: {writer.n_rows:,} rows, {len(vocabulary)} symptoms so far")
+        
+        writer.close(list(vocabulary), list(disease_vocabulary),
+                     extra={'source': dataset_path, 'symptom_columns': symptom_cols})
+    
+    store = TransactionStore(store_dir)
+    print(f"[OK] Transaction store: {store.n_rows:,} rows x {store.n_items} symptoms")
+    return store
+
+
 def create_transaction_list(df_binary, all_symptoms):
     """
     Convert binary matrix to transaction list for Apriori
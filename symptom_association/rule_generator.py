@@ -0,0 +1,99 @@
+"""
+Association Rule Generator
+Replacement for mlxtend's association_rules(metric='confidence') that
+prunes instead of enumerating every antecedent/consequent split.
+
+For a fixed itemset, moving items from the antecedent to the consequent can
+only lower confidence, so consequents are grown Apriori-style: a consequent
+of size m + 1 is tried only if all its m-item subsets gave confident rules.
+The lift threshold is applied as each rule is generated, and supports are
+looked up in a hash index of the itemsets, so only surviving rules are ever
+stored.
+
+    rules = generate_rules(frequent_itemsets, min_confidence=0.6, min_lift=1.2)
+"""
+
+import numpy as np
+
+from rule_metrics import rules_frame
+
+
+def _join(consequents):
+    """Candidate (m+1)-consequents whose m-subsets are all in consequents"""
+    confident = set(consequents)
+    by_prefix = {}
+    for consequent in consequents:
+        by_prefix.setdefault(consequent[:-1], []).append(consequent[-1])
+
+    joined = []
+    for prefix, lasts in by_prefix.items():
+        lasts.sort()
+        for i, a in enumerate(lasts):
+            for b in lasts[i + 1:]:
+                candidate = prefix + (a, b)
+                if all(candidate[:k] + candidate[k + 1:] in confident
+                       for k in range(len(candidate) - 2)):
+                    joined.append(candidate)
+    return joined
+
+
+def confident_splits(itemset, support, min_confidence):
+    """
+    Yield (antecedent, consequent) splits of itemset with confidence >= min_confidence
+
+    itemset is a sorted tuple and support maps sorted tuples (the itemset and
+    all its subsets) to a support or count.
+    """
+    itemset_support = support[itemset]
+    consequents = [(item,) for item in itemset]
+    while consequents:
+        confident = []
+        for consequent in consequents:
+            antecedent = tuple(item for item in itemset if item not in consequent)
+            if itemset_support / support[antecedent] >= min_confidence:
+                confident.append(consequent)
+                yield antecedent, consequent
+
+        if len(consequents[0]) + 1 >= len(itemset):
+            break
+        consequents = _join(confident)
+
+
+def support_index(frequent_itemsets):
+    """{sorted item tuple: support} hash index of an mlxtend itemset frame"""
+    return {tuple(sorted(itemset)): support for itemset, support
+            in zip(frequent_itemsets['itemsets'], frequent_itemsets['support'])}
+
+
+def generate_rules(frequent_itemsets, min_confidence=0.6, min_lift=None):
+    """
+    Rules with confidence >= min_confidence (and lift >= min_lift)
+
+    frequent_itemsets is a ['support', 'itemsets'] frame that contains every
+    subset of its itemsets, as the miners return. The result has the same
+    columns and rows as mlxtend's association_rules followed by a lift
+    filter; row order may differ.
+    """
+    support = support_index(frequent_itemsets)
+
+    antecedents, consequents = [], []
+    supports, antecedent_supports, consequent_supports = [], [], []
+    for itemset, itemset_support in support.items():
+        if len(itemset) < 2:
+            continue
+        for antecedent, consequent in confident_splits(itemset, support, min_confidence):
+            antecedent_support = support[antecedent]
+            consequent_support = support[consequent]
+            if (min_lift is not None
+                    and itemset_support / antecedent_support / consequent_support < min_lift):
+                continue
+            antecedents.append(frozenset(antecedent))
+            consequents.append(frozenset(consequent))
+            supports.append(itemset_support)
+            antecedent_supports.append(antecedent_support)
+            consequent_supports.append(consequent_support)
+
+    return rules_frame(antecedents, consequents,
+                       np.array(supports, dtype=float),
+                       np.array(antecedent_supports, dtype=float),
+                       np.array(consequent_supports, dtype=float))
@@ -0,0 +1,188 @@
+"""
+Rule Lookup Index
+Answers "given these symptoms, which rules fire" over an exported rule model
+without scanning every rule per query.
+
+Rules are grouped by antecedent, keyed on the antecedent's symptom bitmask.
+A single query enumerates the subsets of the selected symptoms (only those
+that occur in some antecedent, up to the longest antecedent) and looks each
+one up, so its cost depends on the query, not on the number of rules. Large
+selections, and query_batch, instead test every antecedent at once with one
+matrix product (antecedents x missing symptoms).
+
+    index = RuleIndex.from_json('models/association_rules.json')
+    index.query(['cough', 'high_fever'], by='lift', top_n=10)
+    index.recommend(['cough', 'high_fever'], top_n=5)
+    index.query_batch(patients, by='confidence', top_n=10)
+"""
+
+import json
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from rule_model_file import load_rule_model
+
+
+RANK_METRICS = ('confidence', 'lift', 'support')
+
+# Above this many antecedent subsets a query switches to the matrix test
+MAX_ENUMERATED_SUBSETS = 512
+
+# Patients per matrix product in query_batch (bounds the rules x patients block)
+BATCH_ROWS = 1024
+
+
+class RuleIndex:
+    """
+    Antecedent index over rule dicts as written by export_rules_to_json
+
+    rules are dicts with 'antecedents', 'consequents', 'support',
+    'confidence' and 'lift'; queries return these same dicts.
+    """
+
+    def __init__(self, symptoms, rules):
+        self.symptoms = list(symptoms)
+        self.rules = list(rules)
+        self.positions = {symptom: i for i, symptom in enumerate(self.symptoms)}
+        for rule in self.rules:
+            for symptom in rule['antecedents'] + rule['consequents']:
+                if symptom not in self.positions:
+                    self.positions[symptom] = len(self.symptoms)
+                    self.symptoms.append(symptom)
+
+        # Position of each rule in the order of every metric (ties keep rule
+        # order), so ranking is an argsort of unique ints on every path
+        self.ranks = {}
+        for name in RANK_METRICS:
+            values = np.array([rule[name] for rule in self.rules], dtype=float)
+            order = np.lexsort((np.arange(len(values)), -values))
+            self.ranks[name] = np.empty(len(values), dtype=np.int64)
+            self.ranks[name][order] = np.arange(len(values))
+
+        self.antecedents = np.zeros((len(self.rules), len(self.symptoms)), dtype=np.float32)
+        groups = {}
+        for i, rule in enumerate(self.rules):
+            positions = [self.positions[symptom] for symptom in rule['antecedents']]
+            self.antecedents[i, positions] = 1.0
+            groups.setdefault(self._mask(positions), []).append(i)
+        self.by_antecedent = {mask: np.array(rows) for mask, rows in groups.items()}
+
+        in_antecedent = self.antecedents.any(axis=0)
+        self.antecedent_symptoms = {symptom for symptom, used
+                                    in zip(self.symptoms, in_antecedent) if used}
+        self.max_antecedent = max((len(rule['antecedents']) for rule in self.rules), default=0)
+
+    @classmethod
+    def from_json(cls, filepath='models/association_rules.json'):
+        """Load the model written by export_rules_to_json"""
+        with open(filepath) as f:
+            data = json.load(f)
+        return cls(data.get('symptoms', []), data['rules'])
+
+    @classmethod
+    def from_model_file(cls, filepath='models/association_rules.srm'):
+        """Load the binary model written by export_rules_to_model"""
+        model = load_rule_model(filepath)
+        return cls(model.symptoms, model.rules())
+
+    @classmethod
+    def load(cls, filepath):
+        """from_model_file for .srm files, from_json otherwise"""
+        if filepath.endswith('.srm'):
+            return cls.from_model_file(filepath)
+        return cls.from_json(filepath)
+
+    def __len__(self):
+        return len(self.rules)
+
+    @staticmethod
+    def _mask(positions):
+        mask = 0
+        for position in positions:
+            mask |= 1 << position
+        return mask
+
+    def _ranks(self, by):
+        if by not in self.ranks:
+            raise ValueError(f"by must be one of {RANK_METRICS}, got {by!r}")
+        return self.ranks[by]
+
+    def _ranked(self, rows, by, top_n):
+        """rows ordered by metric descending, cut to top_n"""
+        ranks = self._ranks(by)[rows]
+        if top_n is not None and top_n < len(rows):
+            keep = np.argpartition(ranks, top_n - 1)[:top_n]
+            rows, ranks = rows[keep], ranks[keep]
+        return rows[np.argsort(ranks)]
+
+    def matching_rows(self, symptoms):
+        """Indices of the rules whose antecedents are all in symptoms"""
+        selected = sorted({self.positions[s] for s in symptoms if s in self.antecedent_symptoms})
+        size = min(len(selected), self.max_antecedent)
+        n_subsets = sum(comb(len(selected), k) for k in range(1, size + 1))
+
+        if n_subsets > MAX_ENUMERATED_SUBSETS:
+            missing = np.ones(len(self.symptoms), dtype=np.float32)
+            missing[selected] = 0.0
+            return np.flatnonzero(self.antecedents @ missing == 0)
+
+        found = []
+        for k in range(1, size + 1):
+            for subset in combinations(selected, k):
+                rows = self.by_antecedent.get(self._mask(subset))
+                if rows is not None:
+                    found.append(rows)
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+
+    def matching_rows_batch(self, patients):
+        """
+        matching_rows() for many symptom lists, one array per patient
+
+        Each block of BATCH_ROWS patients costs one (patients x symptoms) by
+        (symptoms x rules) product.
+        """
+        patients = list(patients)
+        for start in range(0, len(patients), BATCH_ROWS):
+            block = patients[start:start + BATCH_ROWS]
+            missing = np.ones((len(block), len(self.symptoms)), dtype=np.float32)
+            for row, symptoms in enumerate(block):
+                missing[row, [self.positions[s] for s in symptoms if s in self.positions]] = 0.0
+            # patients x rules, one contiguous row per patient
+            fires = (missing @ self.antecedents.T) == 0
+            for row in range(len(block)):
+                yield np.flatnonzero(fires[row])
+
+    def rules_for(self, rows, by='confidence', top_n=None):
+        """Rule dicts of matching rows, best first by metric"""
+        return [self.rules[i] for i in self._ranked(rows, by, top_n)]
+
+    def recommendations_for(self, rows, symptoms, by='confidence', top_n=None):
+        """Consequents of matching rows not in symptoms, ordered by their best rule"""
+        selected = set(symptoms)
+        recommended = {}
+        for i in self._ranked(rows, by, None):
+            for symptom in self.rules[i]['consequents']:
+                if symptom not in selected and symptom not in recommended:
+                    recommended[symptom] = None
+            if top_n is not None and len(recommended) >= top_n:
+                break
+        return list(recommended)[:top_n]
+
+    def query(self, symptoms, by='confidence', top_n=None):
+        """Rules whose antecedents are all in symptoms, best first by metric"""
+        return self.rules_for(self.matching_rows(symptoms), by, top_n)
+
+    def recommend(self, symptoms, by='confidence', top_n=None):
+        """
+        Consequent symptoms not yet selected, ordered by their best rule
+
+        Same result set as RuleService.getRecommendedSymptoms in the app.
+        """
+        return self.recommendations_for(self.matching_rows(symptoms), symptoms, by, top_n)
+
+    def query_batch(self, patients, by='confidence', top_n=None):
+        """query() for many symptom lists at once; one rule list per patient"""
+        self._ranks(by)  # reject an unknown metric before any work
+        return [self.rules_for(rows, by, top_n) for rows in self.matching_rows_batch(patients)]
@@ -0,0 +1,79 @@
+"""
+Association Rule Metrics
+Vectorized versions of the mlxtend rule metrics, computed from supports.
+
+Rule generators that keep their own support counts (incremental updates,
+native rule generation) use these so their frames have the same columns and
+values as mlxtend.frequent_patterns.association_rules.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Column order of mlxtend's association_rules output
+RULE_METRICS = [
+    'antecedent support',
+    'consequent support',
+    'support',
+    'confidence',
+    'lift',
+    'representativity',
+    'leverage',
+    'conviction',
+    'zhangs_metric',
+    'jaccard',
+    'certainty',
+    'kulczynski',
+]
+
+
+def rule_metrics(support, antecedent_support, consequent_support):
+    """
+    Every mlxtend metric from the three supports of each rule
+
+    Inputs are float arrays of equal length; returns {metric: array} in
+    RULE_METRICS order. Same formulas as mlxtend for data without missing
+    values (representativity is always 1).
+    """
+    s_ac = np.asarray(support, dtype=float)
+    s_a = np.asarray(antecedent_support, dtype=float)
+    s_c = np.asarray(consequent_support, dtype=float)
+
+    confidence = s_ac / s_a
+    leverage = s_ac - s_a * s_c
+
+    conviction = np.full(s_ac.shape, np.inf)
+    below = confidence < 1.0
+    conviction[below] = (1.0 - s_c[below]) / (1.0 - confidence[below])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        zhang_denominator = np.maximum(s_ac * (1 - s_a), s_a * (s_c - s_ac))
+        zhangs_metric = np.where(zhang_denominator == 0, 0, leverage / zhang_denominator)
+        certainty_denominator = 1 - s_c
+        certainty = np.where(certainty_denominator == 0, 0,
+                             (confidence - s_c) / certainty_denominator)
+
+    return {
+        'antecedent support': s_a,
+        'consequent support': s_c,
+        'support': s_ac,
+        'confidence': confidence,
+        'lift': confidence / s_c,
+        'representativity': np.ones(s_ac.shape),
+        'leverage': leverage,
+        'conviction': conviction,
+        'zhangs_metric': zhangs_metric,
+        'jaccard': s_ac / (s_a + s_c - s_ac),
+        'certainty': certainty,
+        'kulczynski': (s_ac / s_a + s_ac / s_c) / 2,
+    }
+
+
+def rules_frame(antecedents, consequents, support, antecedent_support, consequent_support):
+    """mlxtend-style rules DataFrame from frozenset lists and support arrays"""
+    frame = pd.DataFrame({'antecedents': list(antecedents), 'consequents': list(consequents)},
+                         columns=['antecedents', 'consequents'])
+    for name, values in rule_metrics(support, antecedent_support, consequent_support).items():
+        frame[name] = values
+    return frame
@@ -0,0 +1,203 @@
+"""
+Binary Rule Model File (.srm)
+Compact, memory-mappable companion to association_rules.json.
+
+Layout (little-endian):
+- 128-byte header: magic, version, counts and section offsets
+- antecedents: CSR, uint32 indptr (n_rules + 1) + uint16 symptom codes
+- consequents: CSR, same encoding
+- metrics: float32 column per metric (support, confidence, lift, conviction),
+  infinite conviction stored as inf
+- meta: JSON with the symptom vocabulary, metric names and export metadata
+
+Sections start on 64-byte boundaries so the memory maps are aligned. Readers
+map the arrays and decode rules only when asked for, so opening a model
+costs a header read and a small JSON parse regardless of the rule count.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+
+
+MAGIC = b'SYMRULES'
+FORMAT_VERSION = 1
+HEADER_SIZE = 128
+ALIGNMENT = 64
+
+METRICS = ['support', 'confidence', 'lift', 'conviction']
+
+# magic, version, reserved, n_rules, n_symptoms, n_metrics,
+# antecedent_indptr_offset, antecedent_indices_offset, antecedent_nnz,
+# consequent_indptr_offset, consequent_indices_offset, consequent_nnz,
+# metrics_offset, meta_offset, meta_length
+HEADER_STRUCT = struct.Struct('<8sHHIIIQQQQQQQQQ')
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _csr(itemsets, codes):
+    """(indptr, indices) of sorted symptom codes per itemset"""
+    lengths = np.fromiter((len(itemset) for itemset in itemsets), dtype=np.uint32,
+                          count=len(itemsets))
+    indptr = np.zeros(len(itemsets) + 1, dtype=np.uint32)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.fromiter((code for itemset in itemsets
+                           for code in sorted(codes[item] for item in itemset)),
+                          dtype=np.uint16, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def save_rule_model(rules, symptom_cols, filepath='models/association_rules.srm', metadata=None):
+    """
+    Write a rules frame (as passed to export_rules_to_json) as a .srm file
+
+    The vocabulary is sorted(symptom_cols), the same order as the JSON
+    export's 'symptoms'; the file is written to a temp path and renamed.
+    """
+    symptoms = sorted(symptom_cols)
+    codes = {symptom: i for i, symptom in enumerate(symptoms)}
+    for itemset in list(rules['antecedents']) + list(rules['consequents']):
+        for item in itemset:
+            if item not in codes:
+                codes[item] = len(symptoms)
+                symptoms.append(item)
+    if len(symptoms) > np.iinfo(np.uint16).max:
+        raise ValueError(f"{len(symptoms)} symptoms do not fit uint16 codes")
+
+    antecedent_indptr, antecedent_indices = _csr(list(rules['antecedents']), codes)
+    consequent_indptr, consequent_indices = _csr(list(rules['consequents']), codes)
+    metrics = np.empty((len(METRICS), len(rules)), dtype=np.float32)
+    for row, name in enumerate(METRICS):
+        metrics[row] = rules[name].to_numpy(dtype=float) if name in rules else np.nan
+
+    meta = json.dumps({
+        'symptoms': symptoms,
+        'metrics': METRICS,
+        'metadata': metadata or {},
+    }).encode('utf-8')
+
+    directory = os.path.dirname(filepath)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        offsets = []
+        f.write(b'\0' * _align(HEADER_SIZE))
+        for section in (antecedent_indptr, antecedent_indices, consequent_indptr,
+                        consequent_indices, metrics, meta):
+            offset = _align(f.tell())
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(section if isinstance(section, bytes) else section.tobytes())
+            offsets.append(offset)
+
+        f.seek(0)
+        f.write(HEADER_STRUCT.pack(
+            MAGIC, FORMAT_VERSION, 0,
+            len(rules), len(symptoms), len(METRICS),
+            offsets[0], offsets[1], len(antecedent_indices),
+            offsets[2], offsets[3], len(consequent_indices),
+            offsets[4], offsets[5], len(meta),
+        ))
+    os.replace(tmp_path, filepath)
+    return filepath
+
+
+class RuleModelFile:
+    """
+    Memory-mapped .srm file
+
+    antecedent_indptr / antecedent_indices (and the consequent pair) and the
+    metric columns are zero-copy views of the file; rule(i) and query()
+    decode only the rules they return.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_STRUCT.size)
+        if len(header) < HEADER_STRUCT.size or header[:8] != MAGIC:
+            raise ValueError(f"{path} is not a binary rule model file")
+
+        (_, version, _, self.n_rules, n_symptoms, n_metrics,
+         antecedent_indptr_offset, antecedent_indices_offset, antecedent_nnz,
+         consequent_indptr_offset, consequent_indices_offset, consequent_nnz,
+         metrics_offset, meta_offset, meta_length) = HEADER_STRUCT.unpack(header)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported rule model version {version} in {path}")
+
+        with open(path, 'rb') as f:
+            f.seek(meta_offset)
+            meta = json.loads(f.read(meta_length).decode('utf-8'))
+        self.symptoms = meta['symptoms']
+        self.metadata = meta['metadata']
+        if len(self.symptoms) != n_symptoms:
+            raise ValueError(f"{path}: header says {n_symptoms} symptoms, vocabulary has {len(self.symptoms)}")
+        self.positions = {symptom: i for i, symptom in enumerate(self.symptoms)}
+
+        self.antecedent_indptr = self._map(antecedent_indptr_offset, np.uint32, (self.n_rules + 1,))
+        self.antecedent_indices = self._map(antecedent_indices_offset, np.uint16, (antecedent_nnz,))
+        self.consequent_indptr = self._map(consequent_indptr_offset, np.uint32, (self.n_rules + 1,))
+        self.consequent_indices = self._map(consequent_indices_offset, np.uint16, (consequent_nnz,))
+        metrics = self._map(metrics_offset, np.float32, (n_metrics, self.n_rules))
+        self.metrics = dict(zip(meta['metrics'], metrics))
+
+    def _map(self, offset, dtype, shape):
+        if 0 in shape:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    def __len__(self):
+        return self.n_rules
+
+    def _names(self, indptr, indices, i):
+        return [self.symptoms[code] for code in indices[indptr[i]:indptr[i + 1]]]
+
+    def rule(self, i):
+        """Rule i as a dict in the association_rules.json format"""
+        rule = {
+            'antecedents': self._names(self.antecedent_indptr, self.antecedent_indices, i),
+            'consequents': self._names(self.consequent_indptr, self.consequent_indices, i),
+        }
+        for name, column in self.metrics.items():
+            value = float(column[i])
+            rule[name] = value if np.isfinite(value) else None
+        return rule
+
+    def rules(self):
+        return [self.rule(i) for i in range(self.n_rules)]
+
+    def matching_rows(self, symptoms):
+        """
+        Indices of the rules whose antecedents are all in symptoms
+
+        Reads only the antecedent arrays: counts each rule's antecedent codes
+        outside the selection and keeps the rules with none.
+        """
+        selected = np.zeros(len(self.symptoms), dtype=bool)
+        selected[[self.positions[s] for s in symptoms if s in self.positions]] = True
+        outside = np.zeros(len(self.antecedent_indices) + 1, dtype=np.int64)
+        np.cumsum(~selected[self.antecedent_indices], out=outside[1:])
+        missing = outside[self.antecedent_indptr[1:]] - outside[self.antecedent_indptr[:-1]]
+        return np.flatnonzero(missing == 0)
+
+    def query(self, symptoms, by='confidence', top_n=None):
+        """Rules whose antecedents are all in symptoms, best first by metric"""
+        if by not in self.metrics:
+            raise ValueError(f"by must be one of {list(self.metrics)}, got {by!r}")
+        rows = self.matching_rows(symptoms)
+        scores = np.asarray(self.metrics[by][rows])
+        rows = rows[np.lexsort((rows, -scores))][:top_n]
+        return [self.rule(i) for i in rows]
+
+    def __repr__(self):
+        return f"RuleModelFile({self.path!r}, rules={self.n_rules}, symptoms={len(self.symptoms)})"
+
+
+def load_rule_model(filepath='models/association_rules.srm'):
+    """Open a .srm file"""
+    return RuleModelFile(filepath)
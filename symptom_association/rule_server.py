@@ -0,0 +1,259 @@
+"""
+Rule Inference Service
+Local asyncio HTTP service over the exported rule model, for callers that
+cannot embed the app's bundled asset (e.g. the intake system).
+
+The model is loaded once into a RuleIndex. Concurrent requests are queued
+and coalesced into micro-batches: the batcher waits up to BATCH_WINDOW for
+more requests (at most BATCH_MAX), matches them all with one
+RuleIndex.matching_rows_batch product in a worker thread, and answers each
+request from its own rows. While a batch runs the next one fills up, so
+batches grow with load. The model file is polled for changes and a new
+index is built off the event loop and swapped in with a single assignment;
+export_rules_to_json replaces the file atomically, so a reload never sees a
+partial model and in-flight batches finish on the index they started with.
+The binary .srm model (export_rules_to_model) can be served the same way.
+
+Endpoints (JSON bodies, responses are JSON):
+    POST /associations  {"symptoms": [...], "by": "confidence", "top_n": 10}
+                        -> {"rules": [...]}
+    POST /recommend     {"symptoms": [...], "by": "confidence", "top_n": 5}
+                        -> {"symptoms": [...]}
+    GET  /health        -> {"rules": n, "model": path, "loaded_at": epoch}
+
+    python rule_server.py --model models/association_rules.json --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import traceback
+
+from rule_index import RANK_METRICS, RuleIndex
+
+
+DEFAULT_MODEL = 'models/association_rules.json'
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+BATCH_WINDOW = 0.002  # Seconds to wait for more requests before matching
+BATCH_MAX = 512  # Requests matched in one product
+RELOAD_INTERVAL = 1.0  # Seconds between model file checks
+MAX_BODY_BYTES = 1 << 20
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class BadRequest(Exception):
+    """Client error, reported as a 400 with the message"""
+
+
+def _model_stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RuleServer:
+    """Holds the current RuleIndex, the batching queue and the HTTP handlers"""
+
+    def __init__(self, model_path=DEFAULT_MODEL, batch_window=BATCH_WINDOW,
+                 batch_max=BATCH_MAX, reload_interval=RELOAD_INTERVAL):
+        self.model_path = model_path
+        self.batch_window = batch_window
+        self.batch_max = batch_max
+        self.reload_interval = reload_interval
+
+        self.stamp = _model_stamp(model_path)
+        self.index = RuleIndex.load(model_path)
+        self.loaded_at = time.time()
+        self.queue = None
+        self.tasks = []
+
+    # ==================== MODEL ====================
+    async def watch_model(self):
+        """Poll the model file and swap in a new index when it changes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                stamp = _model_stamp(self.model_path)
+                if stamp == self.stamp:
+                    continue
+                index = await loop.run_in_executor(None, RuleIndex.load, self.model_path)
+            except (OSError, ValueError, KeyError) as e:
+                # Keep serving the old model; retry on the next change
+                print(f"[!] Model reload failed: {e}")
+                continue
+            self.index, self.stamp, self.loaded_at = index, stamp, time.time()
+            print(f"[OK] Reloaded {len(index)} rules from {self.model_path}")
+
+    # ==================== BATCHING ====================
+    async def submit(self, kind, symptoms, by, top_n):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((kind, symptoms, by, top_n, future))
+        return await future
+
+    @staticmethod
+    def _answer(index, batch):
+        """Match a whole batch at once, then answer each request from its rows"""
+        results = []
+        all_rows = index.matching_rows_batch(symptoms for _, symptoms, _, _, _ in batch)
+        for (kind, symptoms, by, top_n, _), rows in zip(batch, all_rows):
+            if kind == 'recommend':
+                results.append({'symptoms': index.recommendations_for(rows, symptoms, by, top_n)})
+            else:
+                results.append({'rules': index.rules_for(rows, by, top_n)})
+        return results
+
+    async def batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.batch_max:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await loop.run_in_executor(None, self._answer, self.index, batch)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (*_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    # ==================== HTTP ====================
+    def _parse_query(self, body):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise BadRequest("body is not valid JSON")
+        if not isinstance(payload, dict):
+            raise BadRequest("body must be a JSON object")
+
+        symptoms = payload.get('symptoms')
+        if not isinstance(symptoms, list) or not all(isinstance(s, str) for s in symptoms):
+            raise BadRequest("'symptoms' must be a list of strings")
+        by = payload.get('by', 'confidence')
+        if by not in RANK_METRICS:
+            raise BadRequest(f"'by' must be one of {list(RANK_METRICS)}")
+        top_n = payload.get('top_n')
+        # bool is an int subclass: JSON true must not pass as top_n=1
+        if top_n is not None and (isinstance(top_n, bool) or not isinstance(top_n, int)
+                                  or top_n < 1):
+            raise BadRequest("'top_n' must be a positive integer")
+        return symptoms, by, top_n
+
+    async def route(self, method, path, body):
+        if path == '/health':
+            return 200, {'rules': len(self.index), 'model': self.model_path,
+                         'loaded_at': self.loaded_at}
+        if path in ('/associations', '/recommend'):
+            if method != 'POST':
+                return 405, {'error': 'use POST'}
+            symptoms, by, top_n = self._parse_query(body)
+            kind = 'recommend' if path == '/recommend' else 'associations'
+            return 200, await self.submit(kind, symptoms, by, top_n)
+        return 404, {'error': f"unknown path {path}"}
+
+    async def handle(self, reader, writer):
+        """One keep-alive HTTP/1.1 connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    # The body cannot be skipped reliably, so the connection is closed
+                    status, error = ((413, 'body too large') if length > MAX_BODY_BYTES
+                                     else (400, 'invalid Content-Length'))
+                    await self._respond(writer, status, {'error': error}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                path = target.split('?', 1)[0]
+                try:
+                    status, payload = await self.route(method, path, body)
+                except BadRequest as e:
+                    status, payload = 400, {'error': str(e)}
+                except Exception:
+                    # The details go to the server log, not to the client
+                    print(f"[!] {method} {path} failed:")
+                    traceback.print_exc()
+                    status, payload = 500, {'error': 'internal server error'}
+
+                close = (headers.get('connection', '').lower() == 'close'
+                         or version == 'HTTP/1.0')
+                await self._respond(writer, status, payload, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, payload, close=False):
+        body = json.dumps(payload).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.queue = asyncio.Queue()
+        self.tasks = [asyncio.create_task(self.batcher()),
+                      asyncio.create_task(self.watch_model())]
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"[OK] Serving {len(self.index)} rules on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local HTTP service over the mined rules")
+    parser.add_argument('--model', default=DEFAULT_MODEL,
+                        help=f"rule model, .json or .srm (default: {DEFAULT_MODEL})")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW,
+                        help=f"seconds to wait for more requests per batch (default: {BATCH_WINDOW})")
+    parser.add_argument('--batch-max', type=int, default=BATCH_MAX,
+                        help=f"most requests matched together (default: {BATCH_MAX})")
+    args = parser.parse_args()
+
+    server = RuleServer(args.model, batch_window=args.batch_window, batch_max=args.batch_max)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,252 @@
+"""
+Pipeline Run Report
+Per-stage timing and memory instrumentation for symptom_analysis_updated.
+
+Stages are opened with run_report.stage(); while no report is active it
+returns a shared no-op object, so instrumented code costs one global check
+per stage when the flag is off. An active report records, per stage:
+wall and CPU seconds, the process peak RSS at stage end, the tracemalloc
+delta and peak inside the stage, and any counts the stage reports.
+
+    run_report.start()
+    with run_report.stage('mine') as stage:
+        itemsets = mine(...)
+        stage.count(itemsets=len(itemsets))
+    run_report.finish('reports/run.json', trace_path='reports/run.trace.json')
+
+Work timed elsewhere (e.g. in a worker process) is added with
+run_report.record(); a record with budget_s is flagged in the summary when
+its wall time exceeds the budget.
+
+The trace file is Chrome trace-event JSON (chrome://tracing, Perfetto).
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+MB = 1024 * 1024
+
+_active = None
+
+
+def _peak_rss_mb():
+    """Process high-water RSS in MB (None where getrusage is unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / MB if sys.platform == 'darwin' else peak / 1024, 2)
+
+
+class _NullStage:
+    """Stage used while no report is active"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def count(self, **counts):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Stage:
+    """One timed stage; use as a context manager, report sizes with count()"""
+
+    def __init__(self, report, name):
+        self.report = report
+        self.name = name
+        self.parent = None
+        self.counts = {}
+
+    def count(self, **counts):
+        self.counts.update(counts)
+
+    def __enter__(self):
+        report = self.report
+        self.parent = report.open[-1] if report.open else None
+        report.open.append(self)
+        if report.trace_memory:
+            # Peak so far belongs to the enclosing stage
+            self._fold_peak()
+            self.alloc_start = tracemalloc.get_traced_memory()[0]
+            self.alloc_peak = self.alloc_start
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def _fold_peak(self):
+        """Move tracemalloc's peak into the open stages and restart it"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for stage in self.report.open:
+            if hasattr(stage, 'alloc_peak'):
+                stage.alloc_peak = max(stage.alloc_peak, peak)
+        tracemalloc.reset_peak()
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_end = time.perf_counter()
+        cpu = time.process_time() - self.cpu_start
+        report = self.report
+
+        record = {
+            'name': self.name,
+            'parent': self.parent.name if self.parent else None,
+            'start_s': round(self.wall_start - report.wall_start, 6),
+            'wall_s': round(wall_end - self.wall_start, 6),
+            'cpu_s': round(cpu, 6),
+            'peak_rss_mb': _peak_rss_mb(),
+        }
+        if report.trace_memory:
+            self._fold_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            record['alloc_delta_mb'] = round((current - self.alloc_start) / MB, 3)
+            record['alloc_peak_mb'] = round((self.alloc_peak - self.alloc_start) / MB, 3)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        record.update(self.counts)
+
+        report.open.remove(self)
+        report.stages.append(record)
+        return False
+
+
+class RunReport:
+    """Collects stage records for one pipeline run"""
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.open = []
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.epoch_start = time.time()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        if self.owns_tracing:
+            tracemalloc.start()
+
+    def stage(self, name):
+        return Stage(self, name)
+
+    def record(self, name, start_time, wall_s, cpu_s, parent=None, **counts):
+        """Add a stage timed outside this process; start_time is time.time()"""
+        record = {
+            'name': name,
+            'parent': parent,
+            'start_s': round(start_time - self.epoch_start, 6),
+            'wall_s': round(wall_s, 6),
+            'cpu_s': round(cpu_s, 6),
+            'peak_rss_mb': None,
+        }
+        record.update(counts)
+        self.stages.append(record)
+
+    def to_dict(self):
+        return {
+            'started_at': self.started_at,
+            'argv': sys.argv,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'wall_s': round(time.perf_counter() - self.wall_start, 6),
+            'cpu_s': round(time.process_time() - self.cpu_start, 6),
+            'peak_rss_mb': _peak_rss_mb(),
+            'stages': sorted(self.stages, key=lambda record: record['start_s']),
+        }
+
+    def to_chrome_trace(self):
+        """Complete ('X') events, one per stage, in microseconds"""
+        pid = os.getpid()
+        events = []
+        for record in self.stages:
+            args = {key: value for key, value in record.items()
+                    if key not in ('name', 'parent', 'start_s', 'wall_s')}
+            events.append({
+                'name': record['name'],
+                'cat': record['parent'] or 'pipeline',
+                'ph': 'X',
+                'ts': round(record['start_s'] * 1e6),
+                'dur': round(record['wall_s'] * 1e6),
+                'pid': pid,
+                'tid': record.get('worker_pid', 0),
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path, trace_path=None):
+        for filepath, data in ((path, self.to_dict()),
+                               (trace_path, self.to_chrome_trace() if trace_path else None)):
+            if not filepath:
+                continue
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(filepath, 'w') as f:
+                json.dump(data, f, indent=2)
+            print(f"[OK] Saved run report: {filepath}")
+
+
+def start(trace_memory=True):
+    """Activate a new report; stage() records into it until finish()"""
+    global _active
+    _active = RunReport(trace_memory=trace_memory)
+    return _active
+
+
+def active():
+    return _active
+
+
+def stage(name):
+    """Context manager timing name in the active report (no-op when inactive)"""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+def record(name, start_time, wall_s, cpu_s, parent=None, **counts):
+    """Add externally timed work to the active report (no-op when inactive)"""
+    if _active is not None:
+        _active.record(name, start_time, wall_s, cpu_s, parent, **counts)
+
+
+def finish(path=None, trace_path=None):
+    """Write the active report and deactivate it"""
+    global _active
+    report, _active = _active, None
+    if report is None:
+        return None
+    if report.owns_tracing:
+        tracemalloc.stop()
+    report.write(path, trace_path)
+    return report
+
+
+def print_summary(report):
+    """One line per stage: wall, CPU, peak RSS and counts"""
+    print("\n[*] Stage timings:")
+    for record in report.to_dict()['stages']:
+        indent = '  ' if record['parent'] else ''
+        counts = {key: value for key, value in record.items()
+                  if key not in ('name', 'parent', 'start_s', 'wall_s', 'cpu_s', 'peak_rss_mb',
+                                 'alloc_delta_mb', 'alloc_peak_mb')}
+        extra = ''.join(f"  {key}={value}" for key, value in counts.items())
+        rss = f"  rss {record['peak_rss_mb']:.0f} MB" if record['peak_rss_mb'] is not None else ''
+        budget = record.get('budget_s')
+        over = '  [!] OVER BUDGET' if budget is not None and record['wall_s'] > budget else ''
+        print(f"   {indent}{record['name']:<{22 - len(indent)}} {record['wall_s']:8.3f}s wall "
+              f"{record['cpu_s']:8.3f}s cpu{rss}{extra}{over}")
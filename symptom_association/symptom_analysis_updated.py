@@ -2,119 +2,205 @@
 Healthcare Symptom Association Discovery - Updated for Real Dataset
 Complete implementation with Apriori algorithm and visualizations
 Now supports real Kaggle disease-symptom dataset
+
+Run everything, or one stage at a time (each stage reads the previous
+stage's output from models/, data/):
+
+    python symptom_analysis_updated.py            # encode, mine, rules, plot, export
+    python symptom_analysis_updated.py encode     # data/processed_medical_data.stm
+    python symptom_analysis_updated.py mine       # models/frequent_itemsets.pkl
+    python symptom_analysis_updated.py rules      # models/rules.pkl
+    python symptom_analysis_updated.py export     # models/association_rules.json/.srm/.csv
+    python symptom_analysis_updated.py plot       # visualizations/
+
+Importing the module has no side effects, and the plotting stack (plots.py)
+is only imported by runs that plot.
 """
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import networkx as nx
-import plotly.graph_objects as go
-import plotly.express as px
-from mlxtend.frequent_patterns import apriori, association_rules
-from mlxtend.preprocessing import TransactionEncoder
+import argparse
 import json
 import os
+import pickle
 import warnings
-warnings.filterwarnings('ignore')
 
 # Import real data loader
-from real_data_loader import load_real_dataset, preprocess_dataset, create_transaction_list
+from real_data_loader import load_real_dataset, build_transaction_matrix, stream_real_dataset
+from transactions import TransactionMatrix
+from miners import available_miners, choose_miner, run_miner
+from cooccurrence import cooccurrence
+from vertical import VerticalDatabase
+from partition_miner import mine_out_of_core
+from matrix_file import load_matrix, save_matrix
+from rule_model_file import save_rule_model
+from itemset_cache import ItemsetCache, dataset_fingerprint
+from incremental import IncrementalMiner
+from rule_generator import generate_rules
+from topk_rules import RANK_METRICS, top_k_rules
+from closed_itemsets import BASES, closed_itemsets, basis_rules
+import run_report
 
 # Configuration
 MIN_SUPPORT = 0.05  # Minimum support threshold (5%)
 MIN_CONFIDENCE = 0.6  # Minimum confidence threshold (60%)
 MIN_LIFT = 1.2  # Minimum lift threshold
+MINER = 'auto'  # Itemset miner: 'auto', 'apriori', 'fpgrowth', 'eclat' or 'eclat_parallel'
+ITEMSET_MODE = 'all'  # 'all', 'closed' (lossless, non-redundant rules) or 'maximal' (smallest)
+USE_ITEMSET_CACHE = True  # Reuse itemsets mined from the same data at <= min_support
+ITEMSET_CACHE_DIR = 'cache/itemsets'
+INCREMENTAL_STATE = 'models/incremental_state.pkl'  # Counts kept for --append updates
+INCREMENTAL_DIR = 'data/increments'  # Appended batches, rescanned only when needed
+RANK_BY = 'confidence'  # Metric for --top-k: 'confidence', 'lift' or 'support'
+TOPK_MAX_LEN = 4  # Most symptoms in a --top-k rule (keeps low-support lift searches short)
+EXPORT_CHUNK_ROWS = 50000  # Rules formatted and written per chunk by the JSON/CSV exports
+PROCESSED_MATRIX = 'data/processed_medical_data.stm'  # Output of the encode stage
+ITEMSETS_FILE = 'models/frequent_itemsets.pkl'  # Output of the mine stage
+RULES_FILE = 'models/rules.pkl'  # Output of the rules stage
 
-# Create output directories
-os.makedirs('data', exist_ok=True)
-os.makedirs('models', exist_ok=True)
-os.makedirs('visualizations', exist_ok=True)
 
-print("=" * 70)
-print("HEALTHCARE SYMPTOM ASSOCIATION DISCOVERY")
-print("=" * 70)
-print(f"Min Support: {MIN_SUPPORT}")
-print(f"Min Confidence: {MIN_CONFIDENCE}")
-print(f"Min Lift: {MIN_LIFT}")
-print("=" * 70)
+def prepare_output_dirs():
+    """Create output directories"""
+    os.makedirs('data', exist_ok=True)
+    os.makedirs('models', exist_ok=True)
+    os.makedirs('visualizations', exist_ok=True)
+
+
+def print_banner(miner=MINER):
+    print("=" * 70)
+    print("HEALTHCARE SYMPTOM ASSOCIATION DISCOVERY")
+    print("=" * 70)
+    print(f"Min Support: {MIN_SUPPORT}")
+    print(f"Min Confidence: {MIN_CONFIDENCE}")
+    print(f"Min Lift: {MIN_LIFT}")
+    print(f"Miner: {miner}")
+    print("=" * 70)
 
 
 # ==================== DATA LOADING ====================
 def load_data():
-    """Load medical dataset - supports both real and synthetic data"""
+    """
+    Load medical dataset - supports both real and synthetic data
+    
+    Returns (TransactionMatrix, all_symptoms); every miner consumes the
+    matrix directly instead of re-encoding transaction lists.
+    """
     print("\n[*] Loading data...")
     
     # Try to load real dataset first
-    result = load_real_dataset('data')
-    
-    if result and result[0] is not None:
-        print("[OK] Using real Kaggle dataset")
-        df_main, df_severity, df_description, df_precaution = result
-        
-        # Preprocess
-        df_binary, all_symptoms = preprocess_dataset(df_main)
+    with run_report.stage('load') as stage:
+        result = load_real_dataset('data')
         
-        # Save processed data
-        df_binary.to_csv('data/processed_medical_data.csv', index=False)
+        if result and result[0] is not None:
+            print("[OK] Using real Kaggle dataset")
+            df_main, df_severity, df_description, df_precaution = result
+        else:
+            # Fall back to synthetic data
+            print("[!] Real dataset not found. Generating synthetic data...")
+            import data_generator
+            df_main = None
+            df = data_generator.generate_dataset(n_samples=1000)
+            data_generator.save_dataset(df, 'data/medical_data.csv')
+        stage.count(rows=len(df if df_main is None else df_main))
+    
+    with run_report.stage('encode') as stage:
+        if df_main is not None:
+            # Encode straight into the transaction matrix
+            tm = build_transaction_matrix(df_main)
+        else:
+            tm = TransactionMatrix.from_frame(df)
         
-        return df_binary, all_symptoms
-    else:
-        # Fall back to synthetic data
-        print("[!] Real dataset not found. Generating synthetic data...")
-        import data_generator
-        df = data_generator.generate_dataset(n_samples=1000)
-        data_generator.save_dataset(df, 'data/medical_data.csv')
+        # Save processed data (bit-packed, memory-mappable)
+        save_matrix(tm, PROCESSED_MATRIX)
         
-        # Extract symptom columns
-        symptom_cols = [col for col in df.columns 
-                       if col not in ['patient_id', 'disease', 'num_symptoms', 'symptoms']]
-        
-        return df, symptom_cols
-
-
-# ==================== DATA PREPROCESSING ====================
-def prepare_transactions(df, symptom_cols):
-    """Convert dataset to transaction format for Apriori"""
-    print("\n[*] Preparing transaction data...")
-    
-    # Convert to transaction format (list of lists)
-    transactions = []
-    for _, row in df.iterrows():
-        # Get symptoms where value is 1
-        patient_symptoms = [col for col in symptom_cols if row[col] == 1]
-        if patient_symptoms:  # Only add non-empty transactions
-            transactions.append(patient_symptoms)
+        # Empty patients and unused symptoms carry no information for mining
+        tm_mining = tm.drop_empty()
+        stage.count(rows=tm_mining.n_rows, symptoms=tm_mining.n_items)
     
-    print(f"[OK] Prepared {len(transactions)} transactions")
-    print(f"     Unique symptoms: {len(symptom_cols)}")
-    print(f"     Avg symptoms per transaction: {sum(len(t) for t in transactions)/len(transactions):.2f}")
+    print(f"[OK] Transaction matrix: {tm_mining.n_rows} transactions x {tm_mining.n_items} symptoms")
+    print(f"     Avg symptoms per transaction: {tm_mining.matrix.sum(axis=1).mean():.2f}")
     
-    return transactions
+    return tm_mining, tm.symptoms
 
 
-def create_binary_matrix(transactions, symptom_cols):
-    """Create binary matrix for Apriori"""
-    print("\n[*] Creating binary matrix...")
-    
-    # Use TransactionEncoder
-    te = TransactionEncoder()
-    te_ary = te.fit(transactions).transform(transactions)
-    df_binary = pd.DataFrame(te_ary, columns=te.columns_)
-    
-    print(f"[OK] Binary matrix created: {df_binary.shape}")
-    
-    return df_binary
+# ==================== ASSOCIATION RULE MINING ====================
+def build_vertical_db(tm):
+    """
+    Pack the transaction matrix into the vertical database (one bit per
+    cell) shared by co-occurrence counting, the eclat / closed / top-k miners
+    and their support lookups
+    
+    Callers drop their references to tm afterwards, so only the packed copy
+    stays in memory.
+    """
+    with run_report.stage('vertical') as stage:
+        db = VerticalDatabase.from_matrix(tm)
+        stage.count(rows=db.n_rows, symptoms=db.n_items)
+    print(f"[OK] Vertical database: {db.nbytes / (1024 * 1024):.1f} MB "
+          f"(bool matrix: {tm.matrix.nbytes / (1024 * 1024):.1f} MB)")
+    return db
 
 
-# ==================== ASSOCIATION RULE MINING ====================
-def mine_frequent_itemsets(df_binary, min_support=MIN_SUPPORT):
-    """Apply Apriori algorithm to find frequent itemsets"""
-    print(f"\n[*] Mining frequent itemsets (min_support={min_support})...")
-    
-    frequent_itemsets = apriori(df_binary, min_support=min_support, use_colnames=True)
+def count_cooccurrence(data, top_n=None):
+    """
+    Pairwise symptom counts (see cooccurrence), computed once per run and
+    shared by miner selection and the heatmap
+    """
+    with run_report.stage('cooccurrence') as stage:
+        counts = cooccurrence(data, top_n=top_n)
+        stage.count(symptoms=len(counts))
+    return counts
+
+
+def mine_frequent_itemsets(df_binary, min_support=MIN_SUPPORT, miner=MINER,
+                           use_cache=USE_ITEMSET_CACHE, itemsets=ITEMSET_MODE, counts=None):
+    """
+    Find frequent itemsets with the selected miner backend
+    
+    miner='auto' picks apriori / fpgrowth / eclat from the dataset density,
+    row count and min_support (see miners.choose_miner).
+    With use_cache, results are looked up in / stored to the itemset cache
+    keyed on the encoded data, so re-runs with new rule thresholds skip mining.
+    itemsets='closed' or 'maximal' mines closed itemsets with their minimal
+    generators instead (LCM, not cached); generate_association_rules then
+    builds the non-redundant rule basis from them.
+    counts (co-occurrence counts of every column) make the 'auto' estimate
+    exact and let it skip mining when no itemset can exceed two symptoms.
+    df_binary may be a VerticalDatabase (see build_vertical_db): the
+    vertical miners mine it as is, the mlxtend ones unpack it.
+    """
+    if itemsets != 'all':
+        print(f"\n[*] Mining {itemsets} itemsets (min_support={min_support})...")
+        frequent_itemsets = closed_itemsets(df_binary, min_support=min_support,
+                                            use_colnames=True, with_generators=True)
+        # Maximal mode keeps the closed lattice and picks the maximal rule basis
+        basis_note = ' for the maximal rule basis' if itemsets == 'maximal' else ''
+        print(f"[OK] Found {len(frequent_itemsets)} closed itemsets{basis_note}")
+        return frequent_itemsets
+    
+    print(f"\n[*] Mining frequent itemsets (min_support={min_support}, miner={miner})...")
+    
+    frequent_itemsets = None
+    if use_cache:
+        cache = ItemsetCache(ITEMSET_CACHE_DIR)
+        fingerprint = dataset_fingerprint(df_binary)
+        # Every backend returns the same itemsets, so 'auto' accepts any entry
+        frequent_itemsets = cache.get(fingerprint, None if miner == 'auto' else miner, min_support)
+        if frequent_itemsets is not None:
+            miner = 'cache'
+    
+    if frequent_itemsets is None:
+        if miner == 'auto':
+            miner, costs = choose_miner(df_binary, min_support, counts)
+            estimates = ', '.join(f"{name}={cost:.3f}s" for name, cost in sorted(costs.items()))
+            print(f"     Auto-selected '{miner}' (estimated {estimates})")
+        
+        frequent_itemsets, miner = run_miner(miner, df_binary, min_support, counts=counts)
+        
+        if use_cache:
+            cache.put(fingerprint, miner, min_support, frequent_itemsets)
     
-    print(f"[OK] Found {len(frequent_itemsets)} frequent itemsets")
+    print(f"[OK] Found {len(frequent_itemsets)} frequent itemsets ({miner})")
     
     # Show top itemsets
     if len(frequent_itemsets) > 0:
@@ -127,23 +213,28 @@ def mine_frequent_itemsets(df_binary, min_support=MIN_SUPPORT):
     return frequent_itemsets
 
 
-def generate_association_rules(frequent_itemsets, min_confidence=MIN_CONFIDENCE):
-    """Generate association rules from frequent itemsets"""
+def generate_association_rules(frequent_itemsets, min_confidence=MIN_CONFIDENCE, min_lift=MIN_LIFT,
+                               basis='reduced'):
+    """
+    Generate association rules from frequent itemsets
+    
+    A closed itemset frame (with generators) yields the non-redundant basis
+    selected by basis (see closed_itemsets.basis_rules) instead of every rule.
+    """
     print(f"\n[*] Generating association rules (min_confidence={min_confidence})...")
     
     if len(frequent_itemsets) == 0:
         print("[!] No frequent itemsets found. Cannot generate rules.")
         return pd.DataFrame()
     
-    rules = association_rules(frequent_itemsets, 
-                              metric="confidence", 
-                              min_threshold=min_confidence)
+    if 'generators' in frequent_itemsets.columns:
+        rules = basis_rules(frequent_itemsets, min_confidence=min_confidence,
+                            min_lift=min_lift, basis=basis)
+    else:
+        # Confidence pruning and the lift filter are applied while generating
+        rules = generate_rules(frequent_itemsets, min_confidence=min_confidence, min_lift=min_lift)
     
-    # Calculate additional metrics
     if len(rules) > 0:
-        # Filter by lift
-        rules = rules[rules['lift'] >= MIN_LIFT]
-        
         # Sort by lift
         rules = rules.sort_values('lift', ascending=False)
         
@@ -162,335 +253,444 @@ def generate_association_rules(frequent_itemsets, min_confidence=MIN_CONFIDENCE)
     return rules
 
 
-# ==================== VISUALIZATION ====================
-def plot_support_confidence_scatter(rules):
-    """Scatter plot of support vs confidence"""
-    if len(rules) == 0:
-        return
-    
-    print("\n[*] Creating support-confidence scatter plot...")
-    
-    fig, ax = plt.subplots(figsize=(12, 8))
+def mine_top_k_rules(df_binary, k, rank_by=RANK_BY, min_confidence=MIN_CONFIDENCE,
+                     min_lift=MIN_LIFT, max_len=TOPK_MAX_LEN):
+    """
+    The k best rules by rank_by, replacing mine_frequent_itemsets +
+    generate_association_rules when no min_support has been tuned
     
-    scatter = ax.scatter(rules['support'], rules['confidence'], 
-                        c=rules['lift'], s=rules['lift']*50, 
-                        alpha=0.6, cmap='viridis', edgecolors='black', linewidth=0.5)
+    The support bar is raised internally as better rules are found (see
+    topk_rules), so the full rule set is never built.
+    """
+    print(f"\n[*] Mining top {k} rules by {rank_by} (min_confidence={min_confidence})...")
     
-    ax.set_xlabel('Support', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Confidence', fontsize=12, fontweight='bold')
-    ax.set_title('Association Rules: Support vs Confidence (sized by Lift)', 
-                fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
+    rules = top_k_rules(df_binary, k=k, rank_by=rank_by,
+                        min_confidence=min_confidence, min_lift=min_lift, max_len=max_len)
     
-    # Add colorbar
-    cbar = plt.colorbar(scatter, ax=ax)
-    cbar.set_label('Lift', fontsize=11, fontweight='bold')
-    
-    plt.tight_layout()
-    plt.savefig('visualizations/support_confidence_scatter.png', dpi=300, bbox_inches='tight')
-    print("     [OK] Saved: visualizations/support_confidence_scatter.png")
-    plt.close()
-
-
-def plot_top_rules_bar(rules, top_n=20):
-    """Bar chart of top association rules"""
-    if len(rules) == 0:
-        return
-    
-    print("\n[*] Creating top rules bar chart...")
-    
-    top_rules = rules.nlargest(top_n, 'lift').copy()
-    
-    # Create rule labels
-    top_rules['rule'] = top_rules.apply(
-        lambda row: f"{', '.join(list(row['antecedents'])[:2])} → {', '.join(list(row['consequents'])[:2])}", 
-        axis=1
-    )
-    
-    fig, ax = plt.subplots(figsize=(14, 10))
-    
-    y_pos = np.arange(len(top_rules))
-    ax.barh(y_pos, top_rules['lift'], color='steelblue', alpha=0.8)
-    
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(top_rules['rule'], fontsize=9)
-    ax.set_xlabel('Lift', fontsize=12, fontweight='bold')
-    ax.set_title(f'Top {top_n} Association Rules by Lift', fontsize=14, fontweight='bold')
-    ax.grid(axis='x', alpha=0.3)
-    
-    # Add value labels
-    for i, v in enumerate(top_rules['lift']):
-        ax.text(v + 0.05, i, f'{v:.2f}', va='center', fontsize=8)
-    
-    plt.tight_layout()
-    plt.savefig('visualizations/top_rules_bar.png', dpi=300, bbox_inches='tight')
-    print("     [OK] Saved: visualizations/top_rules_bar.png")
-    plt.close()
-
-
-def plot_symptom_network(rules, top_n=30):
-    """Network graph of symptom associations"""
-    if len(rules) == 0:
-        return
-    
-    print("\n[*] Creating symptom network graph...")
-    
-    # Get top rules
-    top_rules = rules.nlargest(top_n, 'lift')
-    
-    # Create graph
-    G = nx.DiGraph()
-    
-    for _, row in top_rules.iterrows():
-        antecedents = list(row['antecedents'])
-        consequents = list(row['consequents'])
+    if len(rules) > 0:
+        print(f"[OK] Kept {len(rules)} rules (weakest {rank_by}: {rules[rank_by].min():.3f})")
         
-        for ant in antecedents[:2]:  # Limit to avoid clutter
-            for cons in consequents[:2]:
-                # Add edge with weight = lift
-                if G.has_edge(ant, cons):
-                    G[ant][cons]['weight'] += row['lift']
-                else:
-                    G.add_edge(ant, cons, weight=row['lift'])
-    
-    # Create layout
-    pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-    
-    # Plot
-    fig, ax = plt.subplots(figsize=(16, 12))
-    
-    # Draw nodes
-    node_sizes = [G.degree(node) * 300 for node in G.nodes()]
-    nx.draw_networkx_nodes(G, pos, node_size=node_sizes, 
-                          node_color='lightblue', alpha=0.9, 
-                          edgecolors='darkblue', linewidths=2, ax=ax)
-    
-    # Draw edges
-    edges = G.edges()
-    weights = [G[u][v]['weight'] for u, v in edges]
-    max_weight = max(weights) if weights else 1
-    nx.draw_networkx_edges(G, pos, width=[w/max_weight*5 for w in weights],
-                          alpha=0.5, edge_color='gray', 
-                          arrows=True, arrowsize=20, ax=ax)
-    
-    # Draw labels
-    nx.draw_networkx_labels(G, pos, font_size=10, font_weight='bold', ax=ax)
-    
-    ax.set_title(f'Symptom Association Network (Top {top_n} Rules)', 
-                fontsize=16, fontweight='bold')
-    ax.axis('off')
-    
-    plt.tight_layout()
-    plt.savefig('visualizations/symptom_network.png', dpi=300, bbox_inches='tight')
-    print("     [OK] Saved: visualizations/symptom_network.png")
-    plt.close()
-
-
-def plot_symptom_heatmap(df_binary, top_n=20):
-    """Heatmap of symptom co-occurrences"""
-    print("\n[*] Creating symptom co-occurrence heatmap...")
-    
-    # Calculate co-occurrence matrix
-    co_occurrence = df_binary.T.dot(df_binary)
-    
-    # Get top symptoms by frequency
-    symptom_freq = df_binary.sum().sort_values(ascending=False)
-    top_symptoms = symptom_freq.head(top_n).index
-    
-    # Filter matrix
-    co_occurrence_top = co_occurrence.loc[top_symptoms, top_symptoms]
-    
-    # Plot
-    fig, ax = plt.subplots(figsize=(14, 12))
-    
-    sns.heatmap(co_occurrence_top, annot=True, fmt='d', cmap='YlOrRd', 
-                square=True, linewidths=0.5, cbar_kws={'label': 'Co-occurrence Count'},
-                ax=ax)
-    
-    ax.set_title(f'Top {top_n} Symptom Co-occurrence Heatmap', 
-                fontsize=14, fontweight='bold')
-    
-    plt.tight_layout()
-    plt.savefig('visualizations/symptom_heatmap.png', dpi=300, bbox_inches='tight')
-    print("     [OK] Saved: visualizations/symptom_heatmap.png")
-    plt.close()
-
-
-def create_interactive_network(rules, top_n=50):
-    """Create interactive network visualization with Plotly"""
-    if len(rules) == 0:
-        return
-    
-    print("\n[*] Creating interactive network visualization...")
-    
-    # Get top rules
-    top_rules = rules.nlargest(top_n, 'lift')
-    
-    # Create graph
-    G = nx.DiGraph()
+        print("\n     Top 10 Association Rules:")
+        for idx, row in rules.head(10).iterrows():
+            antecedents = ', '.join(list(row['antecedents']))
+            consequents = ', '.join(list(row['consequents']))
+            print(f"     - {antecedents} → {consequents}")
+            print(f"       Support: {row['support']:.3f}, Confidence: {row['confidence']:.3f}, Lift: {row['lift']:.3f}")
+    else:
+        print("[!] No rules satisfy min_confidence / min_lift")
     
-    for _, row in top_rules.iterrows():
-        antecedents = list(row['antecedents'])
-        consequents = list(row['consequents'])
-        
-        for ant in antecedents[:2]:
-            for cons in consequents[:2]:
-                G.add_edge(ant, cons, weight=row['lift'], 
-                          confidence=row['confidence'], support=row['support'])
-    
-    # Create layout
-    pos = nx.spring_layout(G, k=2, iterations=50, seed=42)
-    
-    # Create edge trace
-    edge_x = []
-    edge_y = []
-    for edge in G.edges():
-        x0, y0 = pos[edge[0]]
-        x1, y1 = pos[edge[1]]
-        edge_x.extend([x0, x1, None])
-        edge_y.extend([y0, y1, None])
-    
-    edge_trace = go.Scatter(
-        x=edge_x, y=edge_y,
-        line=dict(width=0.5, color='#888'),
-        hoverinfo='none',
-        mode='lines')
-    
-    # Create node trace
-    node_x = []
-    node_y = []
-    node_text = []
-    node_size = []
-    
-    for node in G.nodes():
-        x, y = pos[node]
-        node_x.append(x)
-        node_y.append(y)
-        node_text.append(f"{node}<br>Degree: {G.degree(node)}")
-        node_size.append(G.degree(node) * 10 + 20)
-    
-    node_trace = go.Scatter(
-        x=node_x, y=node_y,
-        mode='markers+text',
-        text=[node for node in G.nodes()],
-        textposition="top center",
-        hovertext=node_text,
-        hoverinfo='text',
-        marker=dict(
-            size=node_size,
-            color='lightblue',
-            line=dict(width=2, color='darkblue')
-        ))
-    
-    # Create figure
-    fig = go.Figure(data=[edge_trace, node_trace],
-                   layout=go.Layout(
-                       title=f'Interactive Symptom Association Network (Top {top_n} Rules)',
-                       titlefont_size=16,
-                       showlegend=False,
-                       hovermode='closest',
-                       margin=dict(b=0, l=0, r=0, t=40),
-                       xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-                       yaxis=dict(showgrid=False, zeroline=False, showticklabels=False))
-                   )
-    
-    fig.write_html('visualizations/interactive_network.html')
-    print("     [OK] Saved: visualizations/interactive_network.html")
+    return rules
 
 
 # ==================== MAIN EXECUTION ====================
-def main():
-    """Main execution function"""
-    
-    # Load data (real or synthetic)
-    df, symptom_cols = load_data()
-    
-    # Prepare transactions
-    transactions = prepare_transactions(df, symptom_cols)
-    
-    # Create binary matrix
-    df_binary = create_binary_matrix(transactions, symptom_cols)
-    
-    # Mine frequent itemsets
-    frequent_itemsets = mine_frequent_itemsets(df_binary)
-    
-    # Generate association rules
-    rules = generate_association_rules(frequent_itemsets)
+def main(miner=MINER, chunk_rows=None, use_cache=USE_ITEMSET_CACHE, top_k=None,
+         rank_by=RANK_BY, itemsets=ITEMSET_MODE):
+    """
+    Main execution function
+    
+    chunk_rows switches to out-of-core mode: dataset.csv is streamed into
+    data/transactions/ and mined in two passes, chunk_rows rows at a time.
+    top_k mines the top_k best rules by rank_by instead of using MIN_SUPPORT.
+    itemsets='closed' / 'maximal' exports the non-redundant rule basis.
+    """
+    prepare_output_dirs()
+    
+    counts = None
+    if top_k:
+        tm, symptom_cols = load_data()
+        db = build_vertical_db(tm)
+        del tm
+        
+        with run_report.stage('mine_top_k') as stage:
+            rules = mine_top_k_rules(db, top_k, rank_by)
+            stage.count(rules=len(rules))
+        
+        # Heatmap counts for the top symptoms only
+        counts = count_cooccurrence(db, top_n=20)
+    elif chunk_rows:
+        with run_report.stage('load') as stage:
+            store = stream_real_dataset('data', chunk_rows=chunk_rows)
+            symptom_cols = store.symptoms
+            stage.count(symptoms=len(symptom_cols))
+        
+        with run_report.stage('mine') as stage:
+            frequent_itemsets = mine_out_of_core(store, MIN_SUPPORT, chunk_rows, miner)
+            stage.count(itemsets=len(frequent_itemsets))
+        
+        # Heatmap counts, streamed from the store for its top symptoms only
+        counts = count_cooccurrence(store, top_n=20)
+    else:
+        # Load data (real or synthetic)
+        tm, symptom_cols = load_data()
+        
+        # Mine from the packed database; the bool matrix is released here
+        db = build_vertical_db(tm)
+        del tm
+        counts = count_cooccurrence(db)
+        
+        # Mine frequent itemsets
+        with run_report.stage('mine') as stage:
+            frequent_itemsets = mine_frequent_itemsets(db, miner=miner, use_cache=use_cache,
+                                                       itemsets=itemsets, counts=counts)
+            stage.count(itemsets=len(frequent_itemsets))
+    
+    if not top_k:
+        # Generate association rules
+        with run_report.stage('rules') as stage:
+            rules = generate_association_rules(
+                frequent_itemsets, basis='maximal' if itemsets == 'maximal' else 'reduced')
+            stage.count(rules=len(rules))
     
     if len(rules) > 0:
-        # Create visualizations
-        plot_support_confidence_scatter(rules)
-        plot_top_rules_bar(rules, top_n=20)
-        plot_symptom_network(rules, top_n=30)
-        plot_symptom_heatmap(df_binary, top_n=20)
-        create_interactive_network(rules, top_n=50)
+        # Create visualizations (the plotting stacks are only imported here)
+        import plots
+        plots.plot_all(rules, counts=counts)
         
         # Export model
-        export_rules_to_json(rules, symptom_cols)
-        
-        # Save rules to CSV
-        rules_export = rules.copy()
-        rules_export['antecedents'] = rules_export['antecedents'].apply(lambda x: ', '.join(list(x)))
-        rules_export['consequents'] = rules_export['consequents'].apply(lambda x: ', '.join(list(x)))
-        rules_export.to_csv('models/association_rules.csv', index=False)
-        print(f"[OK] Saved rules to: models/association_rules.csv")
+        export_rules(rules, symptom_cols)
     
     print("\n" + "=" * 70)
     print("[SUCCESS] ANALYSIS COMPLETE!")
     print("=" * 70)
     print("\nOutput files:")
     print("   - models/association_rules.json")
+    print("   - models/association_rules.srm")
     print("   - models/association_rules.csv")
     print("\nNext step: Use association_rules.json in Flutter mobile app!")
     print("=" * 70)
 
 
-def export_rules_to_json(rules, symptom_cols, filepath='models/association_rules.json'):
-    """Export association rules to JSON for mobile app"""
+# ==================== PIPELINE STAGES ====================
+# Each stage reads the previous stage's output file, so a headless run can
+# stop after mining or export without loading the plotting stacks at all.
+def _save_pickle(obj, filepath):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, filepath)
+    print(f"[OK] Saved: {filepath}")
+
+
+def _load_pickle(filepath, stage):
+    if not os.path.exists(filepath):
+        raise ValueError(f"{filepath} not found; run the '{stage}' stage first")
+    with open(filepath, 'rb') as f:
+        return pickle.load(f)
+
+
+def load_processed_matrix():
+    """
+    Encoded data for the stage commands: the encode stage's .stm file
+    (memory-mapped) if present, else load_data()
+    
+    Returns (TransactionMatrix, all_symptoms) like load_data().
+    """
+    if not os.path.exists(PROCESSED_MATRIX):
+        return load_data()
+    with run_report.stage('load') as stage:
+        tm = load_matrix(PROCESSED_MATRIX)
+        tm_mining = tm.drop_empty()
+        stage.count(rows=tm_mining.n_rows, symptoms=tm_mining.n_items)
+    print(f"[OK] Loaded {PROCESSED_MATRIX}: {tm_mining.n_rows} transactions x {tm_mining.n_items} symptoms")
+    return tm_mining, tm.symptoms
+
+
+def run_encode():
+    """Encode the dataset into PROCESSED_MATRIX"""
+    prepare_output_dirs()
+    load_data()
+
+
+def run_mine(miner=MINER, use_cache=USE_ITEMSET_CACHE, itemsets=ITEMSET_MODE):
+    """Mine frequent itemsets from the encoded data into ITEMSETS_FILE"""
+    prepare_output_dirs()
+    tm, symptom_cols = load_processed_matrix()
+    db = build_vertical_db(tm)
+    del tm
+    counts = count_cooccurrence(db)
+    with run_report.stage('mine') as stage:
+        frequent_itemsets = mine_frequent_itemsets(db, miner=miner, use_cache=use_cache,
+                                                   itemsets=itemsets, counts=counts)
+        stage.count(itemsets=len(frequent_itemsets))
+    _save_pickle({'itemsets': frequent_itemsets, 'mode': itemsets, 'symptoms': symptom_cols},
+                 ITEMSETS_FILE)
+
+
+def run_rules(basis=None):
+    """
+    Association rules from ITEMSETS_FILE into RULES_FILE
+    
+    basis defaults to 'maximal' for maximal itemsets, else 'reduced'.
+    """
+    saved = _load_pickle(ITEMSETS_FILE, 'mine')
+    if basis is None:
+        basis = 'maximal' if saved['mode'] == 'maximal' else 'reduced'
+    with run_report.stage('rules') as stage:
+        rules = generate_association_rules(saved['itemsets'], basis=basis)
+        stage.count(rules=len(rules))
+    _save_pickle({'rules': rules, 'symptoms': saved['symptoms']}, RULES_FILE)
+
+
+def run_export():
+    """Write the rule exports from RULES_FILE"""
+    saved = _load_pickle(RULES_FILE, 'rules')
+    if len(saved['rules']) > 0:
+        export_rules(saved['rules'], saved['symptoms'])
+
+
+def run_plot():
+    """Charts of the rules in RULES_FILE (heatmap from the encoded data, if any)"""
+    import plots
+    
+    saved = _load_pickle(RULES_FILE, 'rules')
+    df_binary = load_processed_matrix()[0].to_frame() if os.path.exists(PROCESSED_MATRIX) else None
+    plots.plot_all(saved['rules'], df_binary)
+
+
+def update_with_new_records(records_path, state_path=INCREMENTAL_STATE):
+    """
+    Fold newly appended patient records into the rules without a full re-mine
+    
+    records_path is a CSV in dataset.csv format. The first run builds the
+    incremental state from the current data; later runs only count the new
+    rows (plus a history rescan when an itemset crosses min_support).
+    """
+    if os.path.exists(state_path):
+        with run_report.stage('load_state'):
+            model = IncrementalMiner.load(state_path)
+    else:
+        tm, _ = load_data()
+        with run_report.stage('mine'):
+            history = os.path.join(INCREMENTAL_DIR, 'base.stm')
+            save_matrix(tm, history)
+            model = IncrementalMiner.from_matrix(tm, MIN_SUPPORT, MIN_CONFIDENCE,
+                                                 history_files=[history])
+    
+    with run_report.stage('update') as stage:
+        delta = build_transaction_matrix(pd.read_csv(records_path))
+        segment = os.path.join(INCREMENTAL_DIR, f"batch_{len(model.history_files):04d}.stm")
+        model.update(delta, segment_path=segment)
+        model.save(state_path)
+        stage.count(rows=delta.n_rows)
+    
+    with run_report.stage('rules') as stage:
+        rules = model.rules(min_lift=MIN_LIFT)
+        stage.count(rules=len(rules))
+    print(f"[OK] {len(rules)} association rules after update")
+    if len(rules) > 0:
+        export_rules(rules, model.symptoms)
+    return rules
+
+
+def export_rules(rules, symptom_cols):
+    """Write the JSON, binary and CSV rule exports"""
+    with run_report.stage('export') as stage:
+        with run_report.stage('json'):
+            export_rules_to_json(rules, symptom_cols)
+        with run_report.stage('model'):
+            export_rules_to_model(rules, symptom_cols)
+        with run_report.stage('csv'):
+            export_rules_to_csv(rules)
+        stage.count(rules=len(rules))
+
+
+def _itemset_column(itemsets, render):
+    """
+    render() applied once per distinct itemset, broadcast back to every rule
+    
+    Rules share a few thousand antecedents/consequents at most, so this is
+    a factorize plus a take instead of one call per rule.
+    """
+    codes, uniques = pd.factorize(itemsets)
+    return np.array([render(itemset) for itemset in uniques], dtype=object)[codes]
+
+
+def export_rules_to_csv(rules, filepath='models/association_rules.csv', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Save rules to CSV with comma-joined itemsets"""
+    antecedents = _itemset_column(rules['antecedents'], lambda x: ', '.join(list(x)))
+    consequents = _itemset_column(rules['consequents'], lambda x: ', '.join(list(x)))
+    
+    with open(filepath, 'w', newline='') as f:
+        for start in range(0, max(len(rules), 1), chunk_rows):
+            chunk = rules.iloc[start:start + chunk_rows].copy()
+            chunk['antecedents'] = antecedents[start:start + chunk_rows]
+            chunk['consequents'] = consequents[start:start + chunk_rows]
+            chunk.to_csv(f, index=False, header=start == 0)
+    print(f"[OK] Saved rules to: {filepath}")
+
+
+def _json_list(itemset):
+    """list(itemset) laid out as json.dump(indent=2) does inside a rule"""
+    if not itemset:
+        return '[]'
+    return '[' + ','.join('\n        ' + json.dumps(item) for item in itemset) + '\n      ]'
+
+
+def _json_numbers(values):
+    """Float column as JSON literals, non-finite values as null"""
+    finite = np.isfinite(values)
+    return [float.__repr__(v) if ok else 'null' for v, ok in zip(values.tolist(), finite.tolist())]
+
+
+_RULE_JSON = ('\n    {\n      "antecedents": %s,\n      "consequents": %s,\n      "support": %s,'
+             '\n      "confidence": %s,\n      "lift": %s,\n      "conviction": %s\n    }')
+
+
+def export_rules_to_json(rules, symptom_cols, filepath='models/association_rules.json',
+                         chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    Export association rules to JSON for mobile app
+    
+    Output matches json.dump(indent=2) of {'metadata', 'symptoms', 'rules'},
+    but is written columnar: itemsets are rendered once per distinct itemset,
+    metrics are sanitized per column (inf/NaN conviction -> null) and rules
+    are formatted and written chunk_rows at a time.
+    """
     print("\n[*] Exporting rules to JSON...")
     
     if len(rules) == 0:
         print("[!] No rules to export")
         return
     
-    # Convert rules to JSON-serializable format
-    rules_list = []
-    for _, row in rules.iterrows():
-        # Handle Infinity and NaN values
-        conviction = row.get('conviction', None)
-        if conviction is not None and (np.isinf(conviction) or np.isnan(conviction)):
-            conviction = None
-        
-        rule = {
-            'antecedents': list(row['antecedents']),
-            'consequents': list(row['consequents']),
-            'support': float(row['support']),
-            'confidence': float(row['confidence']),
-            'lift': float(row['lift']),
-            'conviction': float(conviction) if conviction is not None else None
-        }
-        rules_list.append(rule)
-    
-    # Create export data
-    export_data = {
-        'metadata': {
-            'total_rules': len(rules),
-            'min_support': MIN_SUPPORT,
-            'min_confidence': MIN_CONFIDENCE,
-            'min_lift': MIN_LIFT,
-            'total_symptoms': len(symptom_cols)
-        },
+    antecedents = _itemset_column(rules['antecedents'], _json_list)
+    consequents = _itemset_column(rules['consequents'], _json_list)
+    metrics = [rules[name].to_numpy(dtype=float) if name in rules else np.full(len(rules), np.nan)
+               for name in ('support', 'confidence', 'lift', 'conviction')]
+    
+    head = json.dumps({
+        'metadata': _export_metadata(rules, symptom_cols),
         'symptoms': sorted(symptom_cols),
-        'rules': rules_list
+    }, indent=2)
+    
+    # Save to JSON; write then rename so readers (rule_server reloads) never
+    # see a partially written model
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(head[:-2] + ',\n  "rules": [')
+        for start in range(0, len(rules), chunk_rows):
+            stop = start + chunk_rows
+            columns = zip(antecedents[start:stop], consequents[start:stop],
+                          *(_json_numbers(values[start:stop]) for values in metrics))
+            f.write((',' if start else '') + ','.join(_RULE_JSON % fields for fields in columns))
+        f.write('\n  ]\n}')
+    os.replace(tmp_path, filepath)
+    
+    print(f"[OK] Exported {len(rules)} rules to: {filepath}")
+    print(f"     File size: {os.path.getsize(filepath) / 1024:.2f} KB")
+
+
+def _export_metadata(rules, symptom_cols):
+    return {
+        'total_rules': len(rules),
+        'min_support': MIN_SUPPORT,
+        'min_confidence': MIN_CONFIDENCE,
+        'min_lift': MIN_LIFT,
+        'total_symptoms': len(symptom_cols)
     }
+
+
+def export_rules_to_model(rules, symptom_cols, filepath='models/association_rules.srm'):
+    """
+    Export association rules as a compact binary model (see rule_model_file)
     
-    # Save to JSON
-    with open(filepath, 'w') as f:
-        json.dump(export_data, f, indent=2)
+    Same rules and metadata as the JSON export, with integer-coded itemsets
+    and float32 metrics; load with rule_model_file.load_rule_model.
+    """
+    if len(rules) == 0:
+        return
     
-    print(f"[OK] Exported {len(rules_list)} rules to: {filepath}")
+    save_rule_model(rules, symptom_cols, filepath, metadata=_export_metadata(rules, symptom_cols))
+    print(f"[OK] Exported {len(rules)} rules to: {filepath}")
     print(f"     File size: {os.path.getsize(filepath) / 1024:.2f} KB")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Healthcare symptom association discovery")
+    subparsers = parser.add_subparsers(dest='command', metavar='command',
+                                       help="run one pipeline stage (default: the full pipeline)")
+    subparsers.add_parser('encode', help=f"encode the dataset into {PROCESSED_MATRIX}")
+    mine_parser = subparsers.add_parser('mine', help=f"mine frequent itemsets into {ITEMSETS_FILE}")
+    rules_parser = subparsers.add_parser('rules', help=f"generate association rules into {RULES_FILE}")
+    rules_parser.add_argument('--basis', choices=BASES, default=None,
+                              help="rule basis for closed/maximal itemsets "
+                                   "(default: maximal for maximal itemsets, else reduced)")
+    subparsers.add_parser('export', help="write the JSON/binary/CSV rule exports")
+    subparsers.add_parser('plot', help="render the charts into visualizations/")
+    
+    # Mining options go before or after 'mine'. A subparser default would overwrite
+    # the value given before it, so after 'mine' they are stored as mine_<option>
+    for p, prefix in ((parser, ''), (mine_parser, 'mine_')):
+        p.add_argument('--miner', dest=prefix + 'miner', choices=available_miners(), default=None,
+                       help=f"frequent itemset miner backend (default: {MINER})")
+        p.add_argument('--no-cache', dest=prefix + 'no_cache', action='store_true',
+                       help="always re-mine instead of using the itemset cache")
+        p.add_argument('--itemsets', dest=prefix + 'itemsets', choices=['all', 'closed', 'maximal'],
+                       default=None, help="mine all frequent itemsets, or closed ones for a "
+                                          f"non-redundant rule basis (default: {ITEMSET_MODE})")
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                        help="mine out-of-core, streaming dataset.csv this many rows at a time")
+    parser.add_argument('--append', metavar='CSV', default=None,
+                        help="incrementally update the rules with new records from CSV")
+    parser.add_argument('--top-k', type=int, default=None,
+                        help="mine the K best rules by --rank-by instead of using MIN_SUPPORT")
+    parser.add_argument('--rank-by', choices=RANK_METRICS, default=RANK_BY,
+                        help=f"metric ranking the --top-k rules (default: {RANK_BY})")
+    parser.add_argument('--report', metavar='JSON', default=None,
+                        help="write per-stage time/memory/count report to JSON")
+    parser.add_argument('--trace', metavar='JSON', default=None,
+                        help="also write the stages as a Chrome trace (chrome://tracing)")
+    args = parser.parse_args()
+    
+    miner = getattr(args, 'mine_miner', None) or args.miner
+    itemsets = getattr(args, 'mine_itemsets', None) or args.itemsets
+    no_cache = getattr(args, 'mine_no_cache', False) or args.no_cache
+    
+    mining = [flag for flag, value in (('--miner', miner), ('--itemsets', itemsets),
+                                       ('--no-cache', no_cache)) if value]
+    if args.command:
+        ignored = [flag for flag, value in (('--top-k', args.top_k), ('--append', args.append),
+                                            ('--chunk-rows', args.chunk_rows)) if value]
+        if args.command != 'mine':
+            ignored += mining
+        if ignored:
+            parser.error(f"{', '.join(ignored)} cannot be combined with the '{args.command}' subcommand")
+    elif mining and (args.top_k or args.append):
+        mode = '--top-k' if args.top_k else '--append'
+        parser.error(f"{', '.join(mining)} cannot be combined with {mode}")
+    if args.top_k and args.chunk_rows:
+        parser.error("--top-k mines in memory and cannot be combined with --chunk-rows")
+    
+    miner = miner or MINER
+    itemsets = itemsets or ITEMSET_MODE
+    if itemsets != 'all' and args.chunk_rows:
+        parser.error("--itemsets closed/maximal mines in memory and cannot be combined with --chunk-rows")
+    
+    warnings.filterwarnings('ignore')
+    print_banner(miner)
+    
+    if args.report or args.trace:
+        run_report.start()
+    
+    try:
+        if args.command == 'encode':
+            run_encode()
+        elif args.command == 'mine':
+            run_mine(miner=miner, use_cache=not no_cache, itemsets=itemsets)
+        elif args.command == 'rules':
+            run_rules(basis=args.basis)
+        elif args.command == 'export':
+            run_export()
+        elif args.command == 'plot':
+            run_plot()
+        elif args.append:
+            prepare_output_dirs()
+            update_with_new_records(args.append)
+        else:
+            main(miner=miner, chunk_rows=args.chunk_rows, use_cache=not no_cache,
+                 top_k=args.top_k, rank_by=args.rank_by, itemsets=itemsets)
+    finally:
+        # Failed runs are the ones worth a report; the failing stage has 'error'
+        report = run_report.finish(args.report, args.trace)
+        if report:
+            run_report.print_summary(report)
@@ -0,0 +1,140 @@
+"""
+Symptom Graph
+Shared graph construction and cached layouts for the network charts.
+
+build_symptom_graph() turns the top rules by lift into a directed
+antecedent -> consequent graph, aggregating edges with one groupby instead
+of per-row add_edge calls. layout() positions its nodes and caches the
+result keyed on the graph's weighted edge set, in memory and under
+LAYOUT_CACHE_DIR, so the static and interactive networks (and later runs on
+the same rules) compute a layout once.
+
+Layouts:
+- 'spring': Fruchterman-Reingold, O(nodes^2) per iteration
+- 'spectral': sparse Laplacian eigenvectors (scipy eigsh from 500 nodes up),
+  roughly linear in the edges, for graphs too large for spring
+- 'auto': spring up to SPRING_MAX_NODES nodes, spectral above
+
+    G = build_symptom_graph(rules, top_n=50)
+    pos = layout(G)
+"""
+
+import hashlib
+import json
+import os
+
+import networkx as nx
+import pandas as pd
+
+
+MAX_ITEMS = 2  # Symptoms per rule side drawn as edges (limits clutter)
+LAYOUTS = ('auto', 'spring', 'spectral')
+SPRING_MAX_NODES = 300  # 'auto' switches to the spectral layout above this
+SPRING_K = 2
+SPRING_ITERATIONS = 50
+LAYOUT_SEED = 42
+LAYOUT_CACHE_DIR = 'cache/layouts'
+MAX_CACHED_LAYOUTS = 64  # Oldest layout files beyond this are deleted
+
+_layouts = {}
+
+
+def rule_edges(rules, top_n=None, max_items=MAX_ITEMS):
+    """
+    Edge frame of the top_n rules by lift (all rules if top_n is None)
+
+    One row per (source, target) symptom pair: weight sums the lift of the
+    rules producing the edge, confidence/support keep their maximum and
+    rules counts them. Edges are in order of first appearance.
+    """
+    top = rules.nlargest(top_n, 'lift') if top_n else rules
+    pairs = pd.DataFrame({
+        'source': [list(itemset)[:max_items] for itemset in top['antecedents']],
+        'target': [list(itemset)[:max_items] for itemset in top['consequents']],
+        'lift': top['lift'].to_numpy(),
+        'confidence': top['confidence'].to_numpy(),
+        'support': top['support'].to_numpy(),
+    }).explode('source').explode('target')
+    return pairs.groupby(['source', 'target'], sort=False).agg(
+        weight=('lift', 'sum'), confidence=('confidence', 'max'),
+        support=('support', 'max'), rules=('lift', 'size')).reset_index()
+
+
+def build_symptom_graph(rules, top_n=None, max_items=MAX_ITEMS):
+    """DiGraph of rule_edges(); nodes in order of first appearance"""
+    edges = rule_edges(rules, top_n, max_items)
+    return nx.from_pandas_edgelist(edges, 'source', 'target',
+                                   edge_attr=['weight', 'confidence', 'support', 'rules'],
+                                   create_using=nx.DiGraph)
+
+
+def _resolve(method, n_nodes):
+    if method not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}, got {method!r}")
+    if method == 'auto':
+        return 'spring' if n_nodes <= SPRING_MAX_NODES else 'spectral'
+    return method
+
+
+def layout_key(G, method):
+    """SHA-256 of the weighted edge set, node set and layout parameters"""
+    edges = sorted((str(u), str(v), round(float(data.get('weight', 1.0)), 9))
+                   for u, v, data in G.edges(data=True))
+    params = [method, SPRING_K, SPRING_ITERATIONS, LAYOUT_SEED]
+    payload = json.dumps([params, sorted(map(str, G.nodes())), edges])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compute_layout(G, method='auto'):
+    """Uncached {node: (x, y)} layout of G"""
+    method = _resolve(method, G.number_of_nodes())
+    if G.number_of_nodes() == 0:
+        return {}
+    if method == 'spring':
+        pos = nx.spring_layout(G, k=SPRING_K, iterations=SPRING_ITERATIONS, seed=LAYOUT_SEED)
+    else:
+        pos = nx.spectral_layout(G)
+    return {node: (float(x), float(y)) for node, (x, y) in pos.items()}
+
+
+def _prune_cache(cache_dir):
+    files = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith('.json')]
+    files.sort(key=os.path.getmtime)
+    for path in files[:-MAX_CACHED_LAYOUTS]:
+        os.remove(path)
+
+
+def layout(G, method='auto', cache_dir=LAYOUT_CACHE_DIR):
+    """
+    Cached compute_layout()
+
+    Looks the edge-set key up in memory, then in cache_dir (None disables
+    the disk cache), and stores new layouts in both.
+    """
+    method = _resolve(method, G.number_of_nodes())
+    key = layout_key(G, method)
+    if key in _layouts:
+        return _layouts[key]
+
+    path = os.path.join(cache_dir, f'{key}.json') if cache_dir else None
+    if path and os.path.exists(path):
+        try:
+            with open(path) as f:
+                stored = json.load(f)
+            # JSON keys are strings; map back to the graph's nodes
+            pos = {node: tuple(stored[str(node)]) for node in G.nodes()}
+            _layouts[key] = pos
+            return pos
+        except (OSError, ValueError, KeyError):
+            pass
+
+    pos = compute_layout(G, method)
+    _layouts[key] = pos
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({str(node): list(xy) for node, xy in pos.items()}, f)
+        os.replace(tmp_path, path)
+        _prune_cache(cache_dir)
+    return pos
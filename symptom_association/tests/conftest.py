@@ -0,0 +1,48 @@
+"""
+Shared fixtures for the regression tests
+
+The modules are flat scripts in symptom_association/, so that directory is
+put on sys.path. Workloads come from the seeded clinical generator
+(workload_generator), whose symptom clusters give multi-symptom itemsets
+at the supports used here.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workload_generator import generate_matrix  # noqa: E402
+
+
+@pytest.fixture
+def clinical_tm():
+    """2,000 synthetic patients over the clinical patterns"""
+    return generate_matrix(2000, seed=1)
+
+
+def itemset_supports(frame):
+    """{frozenset of names: support} of an ['support', 'itemsets'] frame"""
+    return {frozenset(itemset): support for itemset, support in zip(frame['itemsets'], frame['support'])}
+
+
+def rule_table(rules, metrics=('support', 'confidence', 'lift')):
+    """{(antecedents, consequents): metric tuple} of a rules frame"""
+    values = rules[list(metrics)].to_numpy(dtype=float)
+    return {(frozenset(a), frozenset(c)): tuple(row)
+            for a, c, row in zip(rules['antecedents'], rules['consequents'], values)}
+
+
+def assert_same_supports(actual, expected):
+    assert actual.keys() == expected.keys()
+    for itemset, support in expected.items():
+        assert actual[itemset] == pytest.approx(support, rel=1e-9), itemset
+
+
+def assert_same_rules(actual, expected, rel=1e-9):
+    assert actual.keys() == expected.keys()
+    for key, values in expected.items():
+        assert np.allclose(actual[key], values, rtol=rel), key
@@ -0,0 +1,105 @@
+"""Closed itemsets, minimal generators and basis rules (closed_itemsets)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from closed_itemsets import BASES, ClosedSupports, basis_rules, closed_itemsets
+from conftest import assert_same_supports, itemset_supports, rule_table
+from eclat import eclat
+from rule_generator import generate_rules
+from transactions import TransactionMatrix
+
+
+MIN_SUPPORT = 0.03
+MIN_CONFIDENCE = 0.6
+
+
+@pytest.fixture
+def redundant_tm(clinical_tm):
+    """Clinical rows plus an exact copy of the first symptom, so closure merges itemsets"""
+    matrix = np.hstack([clinical_tm.matrix, clinical_tm.matrix[:, :1]])
+    return TransactionMatrix(matrix, clinical_tm.symptoms + [clinical_tm.symptoms[0] + '_copy'])
+
+
+@pytest.fixture
+def frequent(redundant_tm):
+    return itemset_supports(eclat(redundant_tm, min_support=MIN_SUPPORT, use_colnames=True))
+
+
+@pytest.fixture
+def closed(redundant_tm):
+    return closed_itemsets(redundant_tm, min_support=MIN_SUPPORT, use_colnames=True,
+                           with_generators=True)
+
+
+def _frame(supports):
+    return pd.DataFrame({'support': list(supports.values()), 'itemsets': list(supports)})
+
+
+def _closed_subset(frequent):
+    """Frequent itemsets without a frequent proper superset of equal support"""
+    return {itemset: support for itemset, support in frequent.items()
+            if not any(itemset < other and support == other_support
+                       for other, other_support in frequent.items())}
+
+
+def test_closed_equals_closed_subset_of_eclat(closed, frequent):
+    expected = _closed_subset(frequent)
+    assert len(expected) < len(frequent)
+    assert_same_supports(itemset_supports(closed), expected)
+
+
+def test_max_len(redundant_tm, frequent):
+    found = closed_itemsets(redundant_tm, min_support=MIN_SUPPORT, use_colnames=True, max_len=2)
+    # Closed in the full lattice, then cut to max_len
+    short = {itemset: support for itemset, support in _closed_subset(frequent).items()
+             if len(itemset) <= 2}
+    assert_same_supports(itemset_supports(found), short)
+
+
+def test_minimal_generators(closed, frequent):
+    for itemset, generators in zip(closed['itemsets'], closed['generators']):
+        assert generators
+        for generator in generators:
+            assert generator <= itemset
+            assert frequent[generator] == frequent[itemset]
+            # Minimal: every immediate subset is strictly more frequent
+            for item in generator:
+                subset = generator - {item}
+                if subset:
+                    assert frequent[subset] > frequent[generator]
+    expected = {itemset for itemset, support in frequent.items()
+                if all(frequent[itemset - {item}] > support for item in itemset if len(itemset) > 1)}
+    found = {g for generators in closed['generators'] for g in generators}
+    assert found == expected
+
+
+def test_closed_supports_recover_every_itemset(closed, frequent):
+    index = ClosedSupports(closed)
+    for itemset, support in frequent.items():
+        assert index[itemset] == pytest.approx(support, rel=1e-12)
+    assert index[frozenset(['not a symptom'])] is None
+
+
+@pytest.mark.parametrize('basis', BASES)
+def test_basis_rules_are_rules_of_the_full_set(closed, frequent, basis):
+    full = rule_table(generate_rules(_frame(frequent), min_confidence=MIN_CONFIDENCE))
+    rules = rule_table(basis_rules(closed, min_confidence=MIN_CONFIDENCE, basis=basis))
+    assert rules
+    assert len(rules) < len(full)
+    for key, values in rules.items():
+        assert values == pytest.approx(full[key], rel=1e-9), key
+
+
+def test_bases_nest(closed):
+    found = {basis: set(rule_table(basis_rules(closed, min_confidence=MIN_CONFIDENCE, basis=basis)))
+             for basis in BASES}
+    assert found['reduced'] <= found['min-max']
+    assert found['maximal'] <= found['min-max']
+
+
+def test_basis_rules_need_generators(clinical_tm):
+    with pytest.raises(ValueError):
+        basis_rules(closed_itemsets(clinical_tm, min_support=MIN_SUPPORT, use_colnames=True))
+
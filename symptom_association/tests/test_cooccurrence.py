@@ -0,0 +1,92 @@
+"""Pairwise symptom counts (cooccurrence) against a dense product"""
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+import cooccurrence as cooccurrence_module
+from conftest import assert_same_supports, itemset_supports
+from cooccurrence import CooccurrenceAccumulator, cooccurrence
+from eclat import eclat
+from vertical import VerticalDatabase
+from workload_generator import DiseasePatterns, generate_matrix, generate_store
+
+
+def _dense_counts(matrix):
+    matrix = matrix.astype(np.int64)
+    return matrix.T @ matrix
+
+
+@pytest.mark.parametrize('source', ['matrix', 'frame', 'vertical'])
+def test_counts_match_product(clinical_tm, source, monkeypatch):
+    # Several float32 blocks per matrix
+    monkeypatch.setattr(cooccurrence_module, 'BLOCK_ROWS', 300)
+    data = {'matrix': clinical_tm, 'frame': clinical_tm.to_frame(),
+            'vertical': VerticalDatabase.from_matrix(clinical_tm)}[source]
+    counts = cooccurrence(data)
+
+    assert counts.symptoms == list(clinical_tm.symptoms)
+    np.testing.assert_array_equal(counts.counts, _dense_counts(clinical_tm.matrix))
+    assert counts.n_rows == clinical_tm.n_rows
+
+
+def test_selected_symptoms(clinical_tm):
+    full = cooccurrence(clinical_tm)
+    top = cooccurrence(clinical_tm, top_n=5)
+    order = np.argsort(-np.count_nonzero(clinical_tm.matrix, axis=0), kind='stable')[:5]
+    assert top.symptoms == [clinical_tm.symptoms[i] for i in order]
+    np.testing.assert_array_equal(top.counts, full.subset(top.symptoms).counts)
+    assert full.top(5).symptoms == top.symptoms
+
+    chosen = ['cough', 'fever', 'fatigue']
+    np.testing.assert_array_equal(cooccurrence(clinical_tm, symptoms=chosen).counts,
+                                  full.subset(chosen).counts)
+    with pytest.raises(ValueError):
+        cooccurrence(clinical_tm, symptoms=['fever', 'not a symptom'])
+
+
+def test_metrics(clinical_tm):
+    counts = cooccurrence(clinical_tm)
+    n, both = clinical_tm.n_rows, counts.count('fever', 'cough')
+    fever, cough = counts.count('fever', 'fever'), counts.count('cough', 'cough')
+    assert counts.support('fever') == pytest.approx(fever / n)
+    assert counts.support('fever', 'cough') == pytest.approx(both / n)
+    assert counts.confidence('fever', 'cough') == pytest.approx(both / fever)
+    assert counts.lift('fever', 'cough') == pytest.approx(both * n / (fever * cough))
+    i, j = counts.positions['fever'], counts.positions['cough']
+    assert counts.lift_matrix()[i, j] == pytest.approx(counts.lift('fever', 'cough'))
+
+
+@pytest.mark.parametrize('min_support', [0.02, 0.1])
+def test_frequent_itemsets_match_eclat(clinical_tm, min_support):
+    counts = cooccurrence(clinical_tm)
+    expected = eclat(clinical_tm, min_support=min_support, use_colnames=True, max_len=2)
+    found = counts.frequent_itemsets(min_support)
+    assert_same_supports(itemset_supports(found), itemset_supports(expected))
+    assert list(found['itemsets']) == list(expected['itemsets'])
+    f1 = int((expected['itemsets'].map(len) == 1).sum())
+    assert counts.frequent_counts(min_support) == (f1, len(expected) - f1)
+    assert len(counts.frequent_itemsets(min_support, max_len=1)) == f1
+
+
+def test_chunked_equals_whole():
+    tm = generate_matrix(5000, seed=4)
+    whole = cooccurrence(tm)
+    dense, sparse_chunks = CooccurrenceAccumulator(tm.symptoms), CooccurrenceAccumulator(tm.symptoms)
+    for start in range(0, tm.n_rows, 1300):
+        chunk = tm.matrix[start:start + 1300]
+        dense.add(chunk)
+        sparse_chunks.add(sparse.csr_matrix(chunk))
+    for accumulated in (dense.result(), sparse_chunks.result()):
+        np.testing.assert_array_equal(accumulated.counts, whole.counts)
+        assert accumulated.n_rows == whole.n_rows
+
+
+def test_store_streams_in_chunks(tmp_path):
+    patterns = DiseasePatterns.synthetic(40, 6, skew=1.0, seed=3)
+    store = generate_store(str(tmp_path / 'store'), 3000, patterns, chunk_rows=1000, seed=5)
+    expected = cooccurrence(store.to_matrix(), top_n=10)
+    found = cooccurrence(store, top_n=10, chunk_rows=700)
+    assert found.symptoms == expected.symptoms
+    np.testing.assert_array_equal(found.counts, expected.counts)
+    assert found.n_rows == expected.n_rows
@@ -0,0 +1,72 @@
+"""Bitset ECLAT (eclat), serial and parallel, against mlxtend apriori"""
+
+import numpy as np
+import pytest
+from mlxtend.frequent_patterns import apriori
+
+import eclat as eclat_module
+from conftest import assert_same_supports, itemset_supports
+from eclat import eclat, eclat_parallel
+from transactions import TransactionMatrix
+from vertical import VerticalDatabase
+
+
+MIN_SUPPORT = 0.05
+
+
+@pytest.fixture
+def reference_itemsets(clinical_tm):
+    return apriori(clinical_tm.to_frame(), min_support=MIN_SUPPORT, use_colnames=True)
+
+
+@pytest.mark.parametrize('representation', ['frame', 'matrix', 'vertical'])
+def test_eclat_matches_apriori(clinical_tm, reference_itemsets, representation):
+    df = {'frame': clinical_tm.to_frame(),
+          'matrix': clinical_tm,
+          'vertical': VerticalDatabase.from_matrix(clinical_tm)}[representation]
+    found = eclat(df, min_support=MIN_SUPPORT, use_colnames=True)
+    assert_same_supports(itemset_supports(found), itemset_supports(reference_itemsets))
+
+
+def test_eclat_max_len(clinical_tm, reference_itemsets):
+    found = eclat(clinical_tm, min_support=MIN_SUPPORT, use_colnames=True, max_len=2)
+    expected = reference_itemsets[reference_itemsets['itemsets'].map(len) <= 2]
+    assert_same_supports(itemset_supports(found), itemset_supports(expected))
+
+
+def test_eclat_column_indices(clinical_tm, reference_itemsets):
+    found = eclat(clinical_tm, min_support=MIN_SUPPORT)
+    names = {frozenset(clinical_tm.symptoms[i] for i in itemset): support
+             for itemset, support in itemset_supports(found).items()}
+    assert_same_supports(names, itemset_supports(reference_itemsets))
+
+
+def test_eclat_more_than_64_rows_and_items():
+    # Tidsets span several uint64 words in both directions
+    rng = np.random.default_rng(3)
+    tm = TransactionMatrix(rng.random((333, 70)) < 0.2, [f's{i}' for i in range(70)])
+    found = eclat(tm, min_support=0.03, use_colnames=True)
+    expected = apriori(tm.to_frame(), min_support=0.03, use_colnames=True)
+    assert_same_supports(itemset_supports(found), itemset_supports(expected))
+
+
+@pytest.mark.parametrize('max_len', [None, 2, 3])
+def test_parallel_matches_serial(clinical_tm, max_len):
+    serial = eclat(clinical_tm, min_support=MIN_SUPPORT, use_colnames=True, max_len=max_len)
+    parallel = eclat(clinical_tm, min_support=MIN_SUPPORT, use_colnames=True, max_len=max_len,
+                     n_jobs=2)
+    assert_same_supports(itemset_supports(parallel), itemset_supports(serial))
+
+
+def test_parallel_split_classes(clinical_tm, reference_itemsets, monkeypatch):
+    # Every class with extensions becomes second-level ('pair') tasks
+    monkeypatch.setattr(eclat_module, 'SPLIT_CLASS_WORDS', 0)
+    found = eclat_parallel(VerticalDatabase.from_matrix(clinical_tm), min_support=MIN_SUPPORT,
+                           use_colnames=True)
+    assert_same_supports(itemset_supports(found), itemset_supports(reference_itemsets))
+
+
+@pytest.mark.parametrize('min_support', [0.0, 1.5])
+def test_eclat_rejects_bad_support(clinical_tm, min_support):
+    with pytest.raises(ValueError):
+        eclat(clinical_tm, min_support=min_support)
@@ -0,0 +1,82 @@
+"""FUP maintenance (incremental.IncrementalMiner) against a full re-mine"""
+
+import numpy as np
+
+from conftest import assert_same_rules, assert_same_supports, itemset_supports, rule_table
+from eclat import eclat
+from incremental import IncrementalMiner
+from matrix_file import save_matrix
+from rule_generator import generate_rules
+from transactions import TransactionMatrix
+
+
+MIN_SUPPORT = 0.05
+MIN_CONFIDENCE = 0.6
+
+
+def _full_mine(matrices):
+    """Batch pipeline over the concatenated rows: non-empty rows, eclat, rules"""
+    symptoms = matrices[0].symptoms
+    matrix = np.vstack([tm.matrix for tm in matrices])
+    tm = TransactionMatrix(matrix[matrix.any(axis=1)], symptoms)
+    itemsets = eclat(tm, min_support=MIN_SUPPORT, use_colnames=True)
+    return itemsets, generate_rules(itemsets, min_confidence=MIN_CONFIDENCE)
+
+
+def _split(tm, stop):
+    return (TransactionMatrix(tm.matrix[:stop], tm.symptoms),
+            TransactionMatrix(tm.matrix[stop:], tm.symptoms))
+
+
+def _check_against_full_mine(model, matrices):
+    itemsets, rules = _full_mine(matrices)
+    assert_same_supports(itemset_supports(model.frequent_itemsets()), itemset_supports(itemsets))
+    assert_same_rules(rule_table(model.rules()), rule_table(rules))
+
+
+def test_update_matches_full_remine(clinical_tm, tmp_path):
+    base, delta = _split(clinical_tm, 1500)
+    history = str(tmp_path / 'base.stm')
+    save_matrix(base, history)
+    model = IncrementalMiner.from_matrix(base, MIN_SUPPORT, MIN_CONFIDENCE, history_files=[history])
+    _check_against_full_mine(model, [base])
+
+    model.update(delta, segment_path=str(tmp_path / 'batch_0001.stm'))
+    _check_against_full_mine(model, [base, delta])
+    assert len(model.history_files) == 2
+
+
+def test_border_itemset_crossing_rescans_history(clinical_tm, tmp_path):
+    base = clinical_tm
+    history = str(tmp_path / 'base.stm')
+    save_matrix(base, history)
+    model = IncrementalMiner.from_matrix(base, MIN_SUPPORT, MIN_CONFIDENCE, history_files=[history])
+
+    # A rare pair (both symptoms frequent, the pair not) made frequent by the new rows
+    counts = base.matrix.T.astype(np.int64) @ base.matrix.astype(np.int64)
+    frequent_items = np.flatnonzero(np.diagonal(counts) >= MIN_SUPPORT * base.n_rows)
+    a, b = next((i, j) for i in frequent_items for j in frequent_items
+                if i < j and 0 < counts[i, j] < MIN_SUPPORT * base.n_rows / 4)
+    matrix = np.zeros((400, base.n_items), dtype=bool)
+    matrix[:, [a, b]] = True
+    delta = TransactionMatrix(matrix, base.symptoms)
+
+    stats = model.update(delta, segment_path=str(tmp_path / 'batch_0001.stm'))
+    assert stats['history_rescans'] >= 1
+    assert frozenset([base.symptoms[a], base.symptoms[b]]) in itemset_supports(model.frequent_itemsets())
+    _check_against_full_mine(model, [base, delta])
+
+
+def test_successive_updates_and_state_round_trip(clinical_tm, tmp_path):
+    base, rest = _split(clinical_tm, 1000)
+    first, second = _split(rest, 500)
+    history = str(tmp_path / 'base.stm')
+    save_matrix(base, history)
+    model = IncrementalMiner.from_matrix(base, MIN_SUPPORT, MIN_CONFIDENCE, history_files=[history])
+
+    model.update(first, segment_path=str(tmp_path / 'batch_0001.stm'))
+    state = str(tmp_path / 'state.pkl')
+    model.save(state)
+    model = IncrementalMiner.load(state)
+    model.update(second, segment_path=str(tmp_path / 'batch_0002.stm'))
+    _check_against_full_mine(model, [base, first, second])
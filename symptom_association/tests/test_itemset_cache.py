@@ -0,0 +1,96 @@
+"""Content-addressed itemset cache (itemset_cache)"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+import itemset_cache
+from conftest import assert_same_supports, itemset_supports
+from eclat import eclat
+from itemset_cache import ItemsetCache, dataset_fingerprint
+from transactions import TransactionMatrix
+from vertical import VerticalDatabase
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Strictly increasing time.time(), so LRU order never depends on timer resolution"""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(itemset_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def test_fingerprint_is_representation_independent(clinical_tm):
+    key = dataset_fingerprint(clinical_tm)
+    assert dataset_fingerprint(clinical_tm.to_frame()) == key
+    assert dataset_fingerprint(VerticalDatabase.from_matrix(clinical_tm)) == key
+
+    changed = clinical_tm.matrix.copy()
+    changed[0, 0] = not changed[0, 0]
+    assert dataset_fingerprint(TransactionMatrix(changed, clinical_tm.symptoms)) != key
+    renamed = ['x'] + clinical_tm.symptoms[1:]
+    assert dataset_fingerprint(TransactionMatrix(clinical_tm.matrix, renamed)) != key
+
+
+def test_higher_support_is_filtered_from_lower_entry(clinical_tm, tmp_path):
+    cache = ItemsetCache(str(tmp_path))
+    key = dataset_fingerprint(clinical_tm)
+    cache.put(key, 'eclat', 0.02, eclat(clinical_tm, 0.02, use_colnames=True))
+
+    found = cache.get(key, 'eclat', 0.1)
+    assert_same_supports(itemset_supports(found),
+                         itemset_supports(eclat(clinical_tm, 0.1, use_colnames=True)))
+    assert list(found.index) == list(range(len(found)))
+    # Lower support, another max_len, another miner or dataset: not answerable
+    assert cache.get(key, 'eclat', 0.01) is None
+    assert cache.get(key, 'eclat', 0.1, max_len=2) is None
+    assert cache.get(key, 'apriori', 0.1) is None
+    assert cache.get('0' * 64, 'eclat', 0.1) is None
+    assert cache.get(key, None, 0.1) is not None
+
+
+def test_closest_lower_entry_wins(clinical_tm, tmp_path, clock):
+    cache = ItemsetCache(str(tmp_path))
+    key = dataset_fingerprint(clinical_tm)
+    for support in (0.02, 0.05):
+        cache.put(key, 'eclat', support, eclat(clinical_tm, support, use_colnames=True))
+    cache.put(key, 'eclat', 0.2, eclat(clinical_tm, 0.2, use_colnames=True))
+
+    found = cache.get(key, 'eclat', 0.1)
+    assert len(found) == len(eclat(clinical_tm, 0.1))
+    assert cache.index[cache._key(key, 'eclat', 0.05, None)]['last_used'] > \
+        cache.index[cache._key(key, 'eclat', 0.02, None)]['last_used']
+
+
+def test_lru_eviction(clinical_tm, tmp_path, clock):
+    frame = eclat(clinical_tm, 0.05, use_colnames=True)
+    cache = ItemsetCache(str(tmp_path))
+    cache.put('a', 'eclat', 0.05, frame)
+    entry_bytes = cache.total_bytes()
+
+    cache = ItemsetCache(str(tmp_path), max_bytes=int(entry_bytes * 2.5))
+    cache.put('b', 'eclat', 0.05, frame)
+    assert cache.get('a', 'eclat', 0.05) is not None  # 'b' is now least recently used
+    cache.put('c', 'eclat', 0.05, frame)
+
+    assert len(cache) == 2
+    assert cache.get('b', 'eclat', 0.05) is None
+    assert cache.get('a', 'eclat', 0.05) is not None
+    assert cache.total_bytes() <= cache.max_bytes
+    assert sorted(p.name for p in tmp_path.glob('*.pkl')) == \
+        sorted(entry['file'] for entry in cache.index.values())
+
+
+def test_index_survives_reopen_and_lost_payloads(clinical_tm, tmp_path):
+    frame = eclat(clinical_tm, 0.05, use_colnames=True)
+    cache = ItemsetCache(str(tmp_path))
+    cache.put('a', 'eclat', 0.05, frame)
+    cache.put('b', 'eclat', 0.05, frame)
+
+    (tmp_path / cache.index[cache._key('b', 'eclat', 0.05, None)]['file']).unlink()
+    reopened = ItemsetCache(str(tmp_path))
+    assert len(reopened) == 1
+    np.testing.assert_array_equal(reopened.get('a', 'eclat', 0.05)['support'], frame['support'])
+
+    reopened.clear()
+    assert len(ItemsetCache(str(tmp_path))) == 0
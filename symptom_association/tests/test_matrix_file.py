@@ -0,0 +1,93 @@
+"""Round trips of the .stm transaction matrix format (matrix_file)"""
+
+import numpy as np
+import pytest
+
+from matrix_file import MatrixFile, MatrixFileWriter, load_matrix, save_matrix
+from transactions import TransactionMatrix
+
+
+def _assert_same(actual, expected):
+    assert actual.symptoms == expected.symptoms
+    np.testing.assert_array_equal(actual.matrix, expected.matrix)
+    assert list(actual.diseases) == list(expected.diseases)
+    assert list(actual.patient_ids) == list(expected.patient_ids)
+
+
+def _with_ids(tm, patient_ids):
+    return TransactionMatrix(tm.matrix, tm.symptoms, tm.diseases, np.array(patient_ids, dtype=object))
+
+
+def test_round_trip_default_ids(clinical_tm, tmp_path):
+    tm = _with_ids(clinical_tm, [f'P{i:04d}' for i in range(1, clinical_tm.n_rows + 1)])
+    path = str(tmp_path / 'matrix.stm')
+    save_matrix(tm, path)
+
+    stm = MatrixFile(path)
+    assert stm._ids is None  # default ids are not stored
+    _assert_same(load_matrix(path), tm)
+
+
+def test_round_trip_explicit_ids_after_default_chunks(clinical_tm, tmp_path):
+    ids = [f'P{i:04d}' for i in range(1, 1201)] + [f'X-{i}' for i in range(clinical_tm.n_rows - 1200)]
+    tm = _with_ids(clinical_tm, ids)
+    path = str(tmp_path / 'matrix.stm')
+    writer = MatrixFileWriter(path, tm.symptoms)
+    for start in range(0, tm.n_rows, 500):
+        stop = start + 500
+        writer.append(tm.matrix[start:stop], tm.diseases[start:stop], tm.patient_ids[start:stop])
+    writer.close()
+
+    stm = MatrixFile(path)
+    assert stm._ids is not None
+    _assert_same(stm.to_matrix(), tm)
+
+
+def test_round_trip_non_ascii_ids(clinical_tm, tmp_path):
+    ids = [f'Pé{i}' if i % 2 else f'患者{i}' for i in range(clinical_tm.n_rows)]
+    tm = _with_ids(clinical_tm, ids)
+    path = str(tmp_path / 'matrix.stm')
+    save_matrix(tm, path)
+    _assert_same(load_matrix(path), tm)
+
+
+@pytest.mark.parametrize('n_items', [1, 7, 8, 9, 131])
+def test_round_trip_any_width(tmp_path, n_items):
+    rng = np.random.default_rng(n_items)
+    matrix = rng.random((50, n_items)) < 0.3
+    diseases = np.array(['flu', 'cold', np.nan], dtype=object)[rng.integers(0, 3, 50)]
+    path = str(tmp_path / 'matrix.stm')
+    writer = MatrixFileWriter(path, [f's{i}' for i in range(n_items)])
+    writer.append(matrix, diseases)
+    writer.close()
+
+    stm = MatrixFile(path)
+    loaded = stm.to_matrix()
+    np.testing.assert_array_equal(loaded.matrix, matrix)
+    # NaN diseases share one vocabulary entry
+    assert len(stm.disease_names) == len(set(map(str, diseases)))
+    assert [str(d) for d in loaded.diseases] == [str(d) for d in diseases]
+    assert list(loaded.patient_ids) == [f'P{i:04d}' for i in range(1, 51)]
+
+
+def test_chunked_reads_cover_every_row(clinical_tm, tmp_path):
+    path = str(tmp_path / 'matrix.stm')
+    save_matrix(clinical_tm, path)
+    chunks = list(MatrixFile(path).iter_chunks(chunk_rows=300))
+    assert [chunk.n_rows for chunk in chunks] == [300] * 6 + [200]
+    np.testing.assert_array_equal(np.vstack([chunk.matrix for chunk in chunks]), clinical_tm.matrix)
+
+
+def test_empty_matrix(tmp_path):
+    path = str(tmp_path / 'empty.stm')
+    writer = MatrixFileWriter(path, ['a', 'b'])
+    writer.close()
+    loaded = load_matrix(path)
+    assert loaded.matrix.shape == (0, 2)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not_a_matrix.stm'
+    path.write_bytes(b'\0' * 256)
+    with pytest.raises(ValueError):
+        MatrixFile(str(path))
@@ -0,0 +1,60 @@
+"""Miner registry and 'auto' backend selection (miners)"""
+
+import pytest
+
+from conftest import assert_same_supports, itemset_supports
+from miners import (MINERS, VERTICAL_MINERS, available_miners, choose_miner, estimate_costs,
+                    get_miner, register_miner, run_miner)
+
+
+MIN_SUPPORT = 0.05
+
+
+@pytest.fixture
+def scratch_registry():
+    saved, saved_vertical = dict(MINERS), set(VERTICAL_MINERS)
+    yield
+    MINERS.clear()
+    MINERS.update(saved)
+    VERTICAL_MINERS.clear()
+    VERTICAL_MINERS.update(saved_vertical)
+
+
+@pytest.mark.parametrize('name', ['apriori', 'fpgrowth', 'eclat'])
+def test_backends_agree(clinical_tm, name):
+    df = clinical_tm.to_frame()
+    found, used = run_miner(name, df, MIN_SUPPORT)
+    expected = get_miner('apriori')(df, min_support=MIN_SUPPORT, use_colnames=True)
+    assert used == name
+    assert_same_supports(itemset_supports(found), itemset_supports(expected))
+
+
+def test_auto_picks_a_costed_backend(clinical_tm):
+    name, costs = choose_miner(clinical_tm.to_frame(), MIN_SUPPORT)
+    assert name == min(costs, key=costs.get)
+    found, used = run_miner('auto', clinical_tm.to_frame(), MIN_SUPPORT)
+    assert used in available_miners()
+    assert len(found) > 0
+
+
+def test_cost_model_scales_with_rows():
+    small = estimate_costs(1_000, 100, 0.05, 500, n_cores=1)
+    large = estimate_costs(1_000_000, 100, 0.05, 500, n_cores=1)
+    assert set(small) == {'apriori', 'fpgrowth', 'eclat'}
+    assert all(large[name] > small[name] for name in small)
+    assert 'eclat_parallel' in estimate_costs(1_000, 100, 0.05, 500, n_cores=4)
+
+
+def test_register_miner_decorator(clinical_tm, scratch_registry):
+    @register_miner('first_item')
+    def first_item(df, min_support=0.5, use_colnames=False, max_len=None):
+        return get_miner('eclat')(df, min_support, use_colnames, max_len=1)
+
+    assert 'first_item' in available_miners()
+    found, _ = run_miner('first_item', clinical_tm.to_frame(), MIN_SUPPORT)
+    assert found['itemsets'].map(len).max() == 1
+
+
+def test_unknown_miner():
+    with pytest.raises(ValueError, match='Unknown miner'):
+        get_miner('nope')
@@ -0,0 +1,68 @@
+"""Two-pass SON mining (partition_miner) against in-memory eclat"""
+
+import numpy as np
+import pytest
+
+import partition_miner
+from conftest import assert_same_supports, itemset_supports
+from eclat import eclat
+from matrix_file import MatrixFile, save_matrix
+from partition_miner import count_candidates, mine_out_of_core
+from transactions import TransactionMatrix
+
+
+MIN_SUPPORT = 0.05
+
+
+@pytest.fixture
+def clinical_stm(clinical_tm, tmp_path):
+    path = str(tmp_path / 'clinical.stm')
+    save_matrix(clinical_tm, path)
+    return MatrixFile(path)
+
+
+def _expected(tm, **kwargs):
+    return itemset_supports(eclat(tm.drop_empty(), min_support=MIN_SUPPORT, use_colnames=True,
+                                  **kwargs))
+
+
+@pytest.mark.parametrize('chunk_rows', [500, 700, 2000, 5000])
+def test_son_matches_eclat(clinical_tm, clinical_stm, chunk_rows):
+    found = mine_out_of_core(clinical_stm, MIN_SUPPORT, chunk_rows=chunk_rows)
+    assert_same_supports(itemset_supports(found), _expected(clinical_tm))
+
+
+def test_son_max_len_and_other_miner(clinical_tm, clinical_stm):
+    found = mine_out_of_core(clinical_stm, MIN_SUPPORT, chunk_rows=600, miner='fpgrowth',
+                             max_len=2)
+    assert_same_supports(itemset_supports(found), _expected(clinical_tm, max_len=2))
+
+
+def test_short_tail_is_mined_with_the_previous_chunk(clinical_tm, clinical_stm, monkeypatch):
+    # 2,000 rows in chunks of 1,990: the 10-row tail must not be mined on its own
+    mined_rows = []
+    local_miner = partition_miner.get_miner('eclat')
+
+    def recording_miner(df, **kwargs):
+        mined_rows.append(len(df))
+        return local_miner(df, **kwargs)
+
+    monkeypatch.setattr(partition_miner, 'get_miner', lambda name: recording_miner)
+    found = mine_out_of_core(clinical_stm, MIN_SUPPORT, chunk_rows=1990)
+    assert len(mined_rows) == 1
+    assert mined_rows[0] == clinical_tm.drop_empty().n_rows
+    assert_same_supports(itemset_supports(found), _expected(clinical_tm))
+
+
+def test_count_candidates(clinical_tm):
+    candidates = [(0,), (0, 1), (1, 2, 3), (2, 3)]
+    chunks = [clinical_tm.take_rows(slice(0, 700)), clinical_tm.take_rows(slice(700, None))]
+    matrix = clinical_tm.matrix
+    expected = [np.count_nonzero(matrix[:, list(c)].all(axis=1)) for c in candidates]
+    assert list(count_candidates(chunks, candidates)) == expected
+
+
+def test_empty_source(tmp_path):
+    path = str(tmp_path / 'empty.stm')
+    save_matrix(TransactionMatrix(np.zeros((5, 3), dtype=bool), ['a', 'b', 'c']), path)
+    assert len(mine_out_of_core(MatrixFile(path), MIN_SUPPORT)) == 0
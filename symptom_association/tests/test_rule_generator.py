@@ -0,0 +1,45 @@
+"""Native rule generation (rule_generator) against mlxtend association_rules"""
+
+import pytest
+from mlxtend.frequent_patterns import association_rules
+
+from conftest import assert_same_rules, rule_table
+from eclat import eclat
+from rule_generator import generate_rules
+
+
+METRICS = ('antecedent support', 'consequent support', 'support', 'confidence', 'lift',
+           'leverage')
+
+
+@pytest.fixture
+def itemsets(clinical_tm):
+    return eclat(clinical_tm, min_support=0.03, use_colnames=True)
+
+
+@pytest.mark.parametrize('min_confidence', [0.0, 0.6, 0.95])
+def test_matches_association_rules(itemsets, min_confidence):
+    rules = generate_rules(itemsets, min_confidence=min_confidence)
+    expected = association_rules(itemsets, len(itemsets), metric='confidence',
+                                 min_threshold=min_confidence)
+    assert len(rules) > 0
+    assert_same_rules(rule_table(rules, METRICS), rule_table(expected, METRICS))
+
+
+def test_lift_filter(itemsets):
+    rules = generate_rules(itemsets, min_confidence=0.5, min_lift=3.0)
+    expected = association_rules(itemsets, len(itemsets), metric='confidence', min_threshold=0.5)
+    expected = expected[expected['lift'] >= 3.0]
+    assert_same_rules(rule_table(rules, METRICS), rule_table(expected, METRICS))
+
+
+def test_same_columns_as_association_rules(itemsets):
+    rules = generate_rules(itemsets, min_confidence=0.6)
+    expected = association_rules(itemsets, len(itemsets), metric='confidence', min_threshold=0.6)
+    assert set(rules.columns) <= set(expected.columns)
+    assert {'antecedents', 'consequents', *METRICS, 'conviction'} <= set(rules.columns)
+
+
+def test_no_rules_from_single_items(clinical_tm):
+    singles = eclat(clinical_tm, min_support=0.03, use_colnames=True, max_len=1)
+    assert len(generate_rules(singles, min_confidence=0.0)) == 0
@@ -0,0 +1,88 @@
+"""Antecedent-subset rule lookups (rule_index) against a brute-force scan"""
+
+import pytest
+
+import rule_index
+from eclat import eclat
+from rule_generator import generate_rules
+from rule_index import RANK_METRICS, RuleIndex
+from rule_model_file import save_rule_model
+from symptom_analysis_updated import export_rules_to_json
+
+
+QUERIES = [
+    [],
+    ['fever'],
+    ['fever', 'cough'],
+    ['fever', 'cough', 'fatigue', 'headache', 'body_ache'],
+    ['sneezing', 'runny_nose', 'sore_throat', 'not a symptom'],
+]
+
+
+@pytest.fixture
+def json_path(clinical_tm, tmp_path):
+    itemsets = eclat(clinical_tm, min_support=0.03, use_colnames=True)
+    rules = generate_rules(itemsets, min_confidence=0.5)
+    path = str(tmp_path / 'rules.json')
+    export_rules_to_json(rules, clinical_tm.symptoms, path)
+    return path
+
+
+@pytest.fixture
+def index(json_path):
+    return RuleIndex.from_json(json_path)
+
+
+def _brute_force(index, symptoms, by):
+    """Firing rules by metric descending, ties in rule order"""
+    selected = set(symptoms)
+    fired = [(-rule[by], i) for i, rule in enumerate(index.rules)
+             if set(rule['antecedents']) <= selected]
+    return [index.rules[i] for _, i in sorted(fired)]
+
+
+def _rule_keys(rules):
+    return {(frozenset(r['antecedents']), frozenset(r['consequents'])) for r in rules}
+
+
+@pytest.mark.parametrize('by', RANK_METRICS)
+@pytest.mark.parametrize('enumerate_subsets', [True, False])
+def test_query_matches_scan(index, by, enumerate_subsets, monkeypatch):
+    if not enumerate_subsets:
+        monkeypatch.setattr(rule_index, 'MAX_ENUMERATED_SUBSETS', 0)
+    assert any(index.query(symptoms) for symptoms in QUERIES)
+    for symptoms in QUERIES:
+        expected = _brute_force(index, symptoms, by)
+        assert index.query(symptoms, by=by) == expected
+        assert index.query(symptoms, by=by, top_n=3) == expected[:3]
+
+
+def test_query_batch_matches_query(index):
+    found = index.query_batch(QUERIES, by='lift', top_n=5)
+    assert found == [index.query(symptoms, by='lift', top_n=5) for symptoms in QUERIES]
+
+
+def test_recommend(index):
+    symptoms = ['fever', 'cough']
+    expected = []
+    for rule in _brute_force(index, symptoms, 'confidence'):
+        expected += [s for s in rule['consequents'] if s not in symptoms and s not in expected]
+    assert index.recommend(symptoms) == expected
+    assert index.recommend(symptoms, top_n=2) == expected[:2]
+
+
+def test_model_file_gives_same_lookups(index, clinical_tm, tmp_path):
+    itemsets = eclat(clinical_tm, min_support=0.03, use_colnames=True)
+    path = str(tmp_path / 'rules.srm')
+    save_rule_model(generate_rules(itemsets, min_confidence=0.5), clinical_tm.symptoms, path)
+    from_model = RuleIndex.load(path)
+    assert len(from_model) == len(index)
+    for symptoms in QUERIES:
+        assert _rule_keys(from_model.query(symptoms)) == _rule_keys(index.query(symptoms))
+
+
+def test_unknown_metric(index):
+    with pytest.raises(ValueError):
+        index.query(['fever'], by='leverage')
+    with pytest.raises(ValueError):
+        index.query_batch([['fever']], by='leverage')
@@ -0,0 +1,93 @@
+"""Round trips of the .srm binary rule model (rule_model_file)"""
+
+import json
+
+import numpy as np
+import pytest
+
+from eclat import eclat
+from rule_generator import generate_rules
+from rule_model_file import METRICS, load_rule_model, save_rule_model
+from symptom_analysis_updated import export_rules_to_json
+from transactions import TransactionMatrix
+
+
+@pytest.fixture
+def tm(clinical_tm):
+    # A copy of the first symptom gives confidence-1 rules (infinite conviction)
+    matrix = np.hstack([clinical_tm.matrix, clinical_tm.matrix[:, :1]])
+    return TransactionMatrix(matrix, clinical_tm.symptoms + [clinical_tm.symptoms[0] + '_copy'])
+
+
+@pytest.fixture
+def rules(tm):
+    itemsets = eclat(tm, min_support=0.05, use_colnames=True)
+    return generate_rules(itemsets, min_confidence=0.6).reset_index(drop=True)
+
+
+def test_round_trip_rules_and_metrics(rules, tm, tmp_path):
+    path = str(tmp_path / 'rules.srm')
+    save_rule_model(rules, tm.symptoms, path, metadata={'min_support': 0.05})
+    model = load_rule_model(path)
+
+    assert len(model) == len(rules)
+    assert model.symptoms == sorted(tm.symptoms)
+    assert model.metadata == {'min_support': 0.05}
+    assert np.isinf(rules['conviction']).any()
+    for i, rule in enumerate(model.rules()):
+        assert rule['antecedents'] == sorted(rules['antecedents'][i])
+        assert rule['consequents'] == sorted(rules['consequents'][i])
+    for name in METRICS:
+        expected = rules[name].to_numpy(dtype=float)
+        found = np.array([np.inf if rule[name] is None else rule[name] for rule in model.rules()])
+        # float32 columns; infinite conviction comes back as None
+        np.testing.assert_allclose(found, expected, rtol=1e-6)
+
+
+def test_same_rules_as_json_export(rules, tm, tmp_path):
+    save_rule_model(rules, tm.symptoms, str(tmp_path / 'rules.srm'))
+    export_rules_to_json(rules, tm.symptoms, str(tmp_path / 'rules.json'))
+    with open(tmp_path / 'rules.json') as f:
+        exported = json.load(f)['rules']
+
+    model = load_rule_model(str(tmp_path / 'rules.srm'))
+    assert len(model) == len(exported)
+    for found, expected in zip(model.rules(), exported):
+        assert found['antecedents'] == sorted(expected['antecedents'])
+        assert found['consequents'] == sorted(expected['consequents'])
+        for name in METRICS:
+            assert (found[name] is None) == (expected[name] is None)
+            if found[name] is not None:
+                assert found[name] == pytest.approx(expected[name], rel=1e-6)
+
+
+@pytest.mark.parametrize('by', ['confidence', 'lift', 'support'])
+def test_query_matches_brute_force(rules, tm, tmp_path, by):
+    path = str(tmp_path / 'rules.srm')
+    save_rule_model(rules, tm.symptoms, path)
+    model = load_rule_model(path)
+
+    symptoms = {'fever', 'cough', 'fatigue', 'headache'}
+    fired = [i for i, antecedent in enumerate(rules['antecedents']) if antecedent <= symptoms]
+    # Stored float32 metric descending, ties in rule order
+    ranked = sorted(fired, key=lambda i: (-model.metrics[by][i], i))
+    found = model.query(symptoms, by=by)
+    assert fired
+    assert found == [model.rule(i) for i in ranked]
+    assert model.query(symptoms, by=by, top_n=3) == found[:3]
+
+
+def test_empty_rule_set(clinical_tm, tmp_path):
+    path = str(tmp_path / 'empty.srm')
+    save_rule_model(generate_rules(eclat(clinical_tm, min_support=1.0, use_colnames=True)),
+                    clinical_tm.symptoms, path)
+    model = load_rule_model(path)
+    assert len(model) == 0
+    assert model.query(['fever']) == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not_a_model.srm'
+    path.write_bytes(b'\0' * 256)
+    with pytest.raises(ValueError):
+        load_rule_model(str(path))
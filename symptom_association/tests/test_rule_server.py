@@ -0,0 +1,119 @@
+"""HTTP handling of the rule service (rule_server) over a real socket"""
+
+import asyncio
+import json
+
+import pytest
+
+from eclat import eclat
+from rule_generator import generate_rules
+from rule_index import RuleIndex
+from rule_server import MAX_BODY_BYTES, RuleServer
+from symptom_analysis_updated import export_rules_to_json
+
+
+@pytest.fixture
+def model_path(clinical_tm, tmp_path):
+    itemsets = eclat(clinical_tm, min_support=0.03, use_colnames=True)
+    path = str(tmp_path / 'rules.json')
+    export_rules_to_json(generate_rules(itemsets, min_confidence=0.5), clinical_tm.symptoms, path)
+    return path
+
+
+async def _exchange(server, request):
+    """Send one raw request on a fresh connection; (status, JSON body)"""
+    server.queue = asyncio.Queue()
+    batcher = asyncio.create_task(server.batcher())
+    listener = await asyncio.start_server(server.handle, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(request)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    finally:
+        batcher.cancel()
+        listener.close()
+        await listener.wait_closed()
+
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+def _request(server, method, path, body=b'', content_length=None):
+    if content_length is None:
+        content_length = len(body)
+    request = (f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+               f"Content-Length: {content_length}\r\n\r\n").encode('latin-1') + body
+    return asyncio.run(_exchange(server, request))
+
+
+def _post(server, path, payload):
+    return _request(server, 'POST', path, json.dumps(payload).encode('utf-8'))
+
+
+def test_associations_and_recommend(model_path):
+    server = RuleServer(model_path)
+    index = RuleIndex.from_json(model_path)
+    symptoms = ['fever', 'cough', 'fatigue']
+
+    status, payload = _post(server, '/associations', {'symptoms': symptoms, 'by': 'lift', 'top_n': 4})
+    assert status == 200
+    assert payload['rules'] == json.loads(json.dumps(index.query(symptoms, by='lift', top_n=4)))
+    assert payload['rules']
+
+    status, payload = _post(server, '/recommend', {'symptoms': symptoms, 'top_n': 3})
+    assert status == 200
+    assert payload['symptoms'] == index.recommend(symptoms, top_n=3)
+
+    status, payload = _request(server, 'GET', '/health')
+    assert status == 200 and payload['rules'] == len(index)
+
+
+@pytest.mark.parametrize('content_length', ['abc', '-1', '1.5'])
+def test_invalid_content_length(model_path, content_length):
+    status, payload = _request(RuleServer(model_path), 'POST', '/associations',
+                               content_length=content_length)
+    assert status == 400
+    assert payload == {'error': 'invalid Content-Length'}
+
+
+def test_body_too_large(model_path):
+    status, _ = _request(RuleServer(model_path), 'POST', '/associations',
+                         content_length=MAX_BODY_BYTES + 1)
+    assert status == 413
+
+
+@pytest.mark.parametrize('payload', [
+    {'symptoms': 'fever'},
+    {'symptoms': ['fever', 1]},
+    {'symptoms': ['fever'], 'by': 'leverage'},
+    {'symptoms': ['fever'], 'top_n': 0},
+    {'symptoms': ['fever'], 'top_n': 2.0},
+    {'symptoms': ['fever'], 'top_n': True},
+    ['fever'],
+])
+def test_bad_queries(model_path, payload):
+    status, body = _post(RuleServer(model_path), '/associations', payload)
+    assert status == 400
+    assert body['error']
+
+
+def test_bad_json_method_and_path(model_path):
+    server = RuleServer(model_path)
+    assert _request(server, 'POST', '/associations', b'{not json')[0] == 400
+    assert _request(server, 'GET', '/associations')[0] == 405
+    assert _request(server, 'GET', '/nope')[0] == 404
+
+
+def test_internal_errors_are_not_leaked(model_path, monkeypatch, capsys):
+    def fail(index, batch):
+        raise RuntimeError('secret internal detail')
+
+    server = RuleServer(model_path)
+    monkeypatch.setattr(server, '_answer', fail)
+    status, payload = _post(server, '/associations', {'symptoms': ['fever']})
+    assert status == 500
+    assert payload == {'error': 'internal server error'}
+    assert 'secret internal detail' in capsys.readouterr().err
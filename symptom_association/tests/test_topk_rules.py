@@ -0,0 +1,60 @@
+"""Top-K rule mining (topk_rules) against a brute-force ranking"""
+
+import pytest
+
+from conftest import rule_table
+from eclat import eclat
+from rule_generator import generate_rules
+from topk_rules import TOPK_LIFT_MAX_LEN, top_k_rules
+
+
+MIN_SUPPORT = 0.02
+MIN_CONFIDENCE = 0.5
+
+
+def _brute_force(tm, max_len=None):
+    """Every rule above the floor, from a full mine"""
+    itemsets = eclat(tm, min_support=MIN_SUPPORT, use_colnames=True, max_len=max_len)
+    return generate_rules(itemsets, min_confidence=MIN_CONFIDENCE)
+
+
+@pytest.mark.parametrize('k', [1, 25, 10_000])
+@pytest.mark.parametrize('rank_by', ['support', 'confidence', 'lift'])
+def test_matches_brute_force(clinical_tm, rank_by, k):
+    found = top_k_rules(clinical_tm, k=k, rank_by=rank_by, min_confidence=MIN_CONFIDENCE,
+                        min_support=MIN_SUPPORT, max_len=3)
+
+    # Ties at the k-th value may resolve either way, so compare the ranked values
+    every_rule = _brute_force(clinical_tm, max_len=3)
+    expected = every_rule[rank_by].sort_values(ascending=False).head(k)
+    assert len(found) == len(expected)
+    assert list(found[rank_by]) == pytest.approx(list(expected), rel=1e-9)
+
+    reference = rule_table(every_rule)
+    for key, values in rule_table(found).items():
+        assert values == pytest.approx(reference[key], rel=1e-9), key
+
+
+def test_min_lift(clinical_tm):
+    found = top_k_rules(clinical_tm, k=50, rank_by='confidence', min_confidence=MIN_CONFIDENCE,
+                        min_lift=5.0, min_support=MIN_SUPPORT)
+    every_rule = _brute_force(clinical_tm)
+    expected = every_rule[every_rule['lift'] >= 5.0]['confidence']
+    assert list(found['confidence']) == pytest.approx(
+        list(expected.sort_values(ascending=False).head(50)), rel=1e-9)
+
+
+def test_lift_defaults_to_bounded_length(clinical_tm):
+    found = top_k_rules(clinical_tm, k=10_000, rank_by='lift', min_confidence=MIN_CONFIDENCE,
+                        min_support=MIN_SUPPORT)
+    sizes = found['antecedents'].map(len) + found['consequents'].map(len)
+    assert sizes.max() <= TOPK_LIFT_MAX_LEN
+    bounded = top_k_rules(clinical_tm, k=10_000, rank_by='lift', min_confidence=MIN_CONFIDENCE,
+                          min_support=MIN_SUPPORT, max_len=TOPK_LIFT_MAX_LEN)
+    assert rule_table(found) == rule_table(bounded)
+
+
+@pytest.mark.parametrize('kwargs', [{'k': 0}, {'rank_by': 'leverage'}])
+def test_rejects_bad_arguments(clinical_tm, kwargs):
+    with pytest.raises(ValueError):
+        top_k_rules(clinical_tm, **kwargs)
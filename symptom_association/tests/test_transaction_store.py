@@ -0,0 +1,63 @@
+"""Chunked CSV ingestion into the on-disk CSR store (transaction_store)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from real_data_loader import build_transaction_matrix, stream_real_dataset
+from transaction_store import TransactionStore, TransactionStoreWriter
+
+
+ROWS = [
+    ['Fungal infection', 'itching', ' skin_rash', ' nodal_skin_eruptions', ''],
+    ['Fungal infection', ' skin_rash', ' nodal_skin_eruptions', '', ''],
+    ['Allergy', ' continuous_sneezing', ' shivering', ' chills', ' watering_from_eyes'],
+    ['Allergy', ' shivering', ' chills', '', ''],
+    ['GERD', ' stomach_pain', ' acidity', ' ulcers_on_tongue', ' vomiting'],
+    ['GERD', '', '', '', ''],
+    ['Drug Reaction', 'itching', ' skin_rash', ' stomach_pain', ' burning_micturition'],
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    columns = ['Disease'] + [f'Symptom_{i}' for i in range(1, 5)]
+    pd.DataFrame(ROWS, columns=columns).to_csv(tmp_path / 'dataset.csv', index=False)
+    return tmp_path
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 3, 100])
+def test_streamed_store_matches_in_memory_encoding(data_dir, chunk_rows):
+    store = stream_real_dataset(str(data_dir), chunk_rows=chunk_rows)
+    expected = build_transaction_matrix(pd.read_csv(data_dir / 'dataset.csv'))
+
+    loaded = store.to_matrix()
+    assert store.symptoms == expected.symptoms
+    np.testing.assert_array_equal(loaded.matrix, expected.matrix)
+    assert list(loaded.diseases) == list(expected.diseases)
+    assert list(loaded.patient_ids) == list(expected.patient_ids)
+    np.testing.assert_array_equal(store.item_counts(), expected.item_counts())
+    assert store.meta['n_chunks'] == -(-len(ROWS) // chunk_rows)
+
+
+def test_iter_chunks(data_dir):
+    store = stream_real_dataset(str(data_dir))
+    chunks = list(store.iter_chunks(chunk_rows=3))
+    assert [chunk.n_rows for chunk in chunks] == [3, 3, 1]
+    np.testing.assert_array_equal(np.vstack([chunk.matrix for chunk in chunks]),
+                                  store.to_matrix().matrix)
+
+
+def test_rewrite_invalidates_store_until_closed(data_dir):
+    path = str(data_dir / 'transactions')
+    stream_real_dataset(str(data_dir), store_dir=path)
+    with TransactionStoreWriter(path) as writer:
+        # The old meta.json must not describe the truncated arrays
+        with pytest.raises(FileNotFoundError):
+            TransactionStore(path)
+        writer.append(np.array([0, 0, 1]), np.array([0, 1, 1]), np.array([0, 0]))
+        writer.close(['b', 'a'], ['flu'])
+
+    store = TransactionStore(path)
+    assert store.symptoms == ['a', 'b']
+    np.testing.assert_array_equal(store.to_matrix().matrix, [[True, True], [True, False]])
@@ -0,0 +1,50 @@
+"""Packed tidsets and the bounded support memo (vertical)"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from vertical import SupportCounts, VerticalDatabase
+
+
+@pytest.fixture
+def db(clinical_tm):
+    return VerticalDatabase.from_matrix(clinical_tm)
+
+
+def test_counts_match_matrix(db, clinical_tm):
+    np.testing.assert_array_equal(db.to_matrix(), clinical_tm.matrix)
+    for itemset in [[], ['fever'], ['fever', 'cough'], ['fever', 'cough', 'fatigue']]:
+        columns = [clinical_tm.symptoms.index(symptom) for symptom in itemset]
+        rows = np.flatnonzero(clinical_tm.matrix[:, columns].all(axis=1))
+        assert db.count(itemset) == len(rows)
+        assert db.support(itemset) == pytest.approx(len(rows) / clinical_tm.n_rows)
+        if itemset:
+            np.testing.assert_array_equal(db.rows(itemset), rows)
+    with pytest.raises(ValueError):
+        db.count(['not a symptom'])
+
+
+def test_memo_is_bounded(clinical_tm):
+    db = VerticalDatabase.from_matrix(clinical_tm)
+    small = VerticalDatabase(db.bits, db.symptoms, db.n_rows, memo_max_entries=10)
+    pairs = list(itertools.combinations(db.symptoms[:12], 2))
+    for pair in pairs + pairs:
+        assert small.count(pair) == db.count(pair)
+    assert len(small.counts) == 10
+    assert len(db.counts) == len(pairs)
+    # Single symptoms come from item_counts, never the memo
+    assert small.count([db.symptoms[0]]) == db.item_counts[0]
+    assert len(small.counts) == 10
+
+
+def test_support_counts_evicts_oldest(db):
+    counts = SupportCounts(db.bits, max_entries=2)
+    for itemset in [(0, 1), (0, 2), (0, 3)]:
+        assert counts[itemset] == db.counts[itemset]
+    assert list(counts) == [(0, 2), (0, 3)]
+
+    unmemoized = SupportCounts(db.bits, max_entries=0)
+    assert unmemoized[(0, 1)] == db.counts[(0, 1)]
+    assert len(unmemoized) == 0
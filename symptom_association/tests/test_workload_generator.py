@@ -0,0 +1,65 @@
+"""Seeded synthetic workloads (workload_generator)"""
+
+import numpy as np
+import pytest
+
+from workload_generator import (NOISE_SYMPTOMS, DiseasePatterns, generate_chunk, generate_matrix,
+                                generate_store)
+
+
+def test_same_seed_same_rows():
+    first = generate_matrix(3000, chunk_rows=1000, seed=7)
+    again = generate_matrix(3000, chunk_rows=1000, seed=7)
+    np.testing.assert_array_equal(first.matrix, again.matrix)
+    assert list(first.diseases) == list(again.diseases)
+    assert not np.array_equal(first.matrix, generate_matrix(3000, chunk_rows=1000, seed=8).matrix)
+
+
+def test_store_matches_matrix(tmp_path):
+    patterns = DiseasePatterns.synthetic(40, 6, skew=1.0, seed=3)
+    store = generate_store(str(tmp_path / 'store'), 2500, patterns, chunk_rows=1000, seed=5)
+    tm = generate_matrix(2500, patterns, chunk_rows=1000, seed=5)
+
+    columns = [tm.symptoms.index(symptom) for symptom in store.symptoms]
+    np.testing.assert_array_equal(store.to_matrix().matrix, tm.matrix[:, columns])
+    assert list(store.to_matrix().diseases) == list(tm.diseases)
+    assert store.meta['generator']['seed'] == 5
+
+
+def test_chunk_layout():
+    rows, codes, disease_codes = generate_chunk(DiseasePatterns.clinical(), 2000,
+                                                np.random.default_rng(0), noise=0.5)
+    keys = rows.astype(np.int64) << 32 | codes
+    assert np.all(np.diff(keys) > 0)  # sorted by row then code, no duplicates
+    assert len(disease_codes) == 2000 and rows.max() < 2000
+
+
+def test_noise_adds_distinct_new_symptoms():
+    patterns = DiseasePatterns.clinical()
+    # The pattern draws come before the noise draws, so both chunks share them
+    clean = generate_chunk(patterns, 5000, np.random.default_rng(1), noise=0.0)
+    noisy = generate_chunk(patterns, 5000, np.random.default_rng(1), noise=1.0)
+
+    clean_keys = set(zip(clean[0].tolist(), clean[1].tolist()))
+    noisy_keys = set(zip(noisy[0].tolist(), noisy[1].tolist()))
+    assert clean_keys < noisy_keys
+    np.testing.assert_array_equal(np.bincount(noisy[0], minlength=5000),
+                                  np.bincount(clean[0], minlength=5000) + NOISE_SYMPTOMS)
+
+
+def test_noise_only_and_full_rows():
+    patterns = DiseasePatterns.synthetic(11, 3, seed=0)
+    # No pattern symptoms: every row is exactly its noise
+    rows, _, _ = generate_chunk(patterns, 500, np.random.default_rng(2), density=0.0, noise=1.0)
+    np.testing.assert_array_equal(np.bincount(rows, minlength=500), NOISE_SYMPTOMS)
+    # Every symptom already present: noise has nothing left to add (and must not loop)
+    rows, _, _ = generate_chunk(patterns, 500, np.random.default_rng(2), density=100.0, noise=1.0)
+    np.testing.assert_array_equal(np.bincount(rows, minlength=500), 11)
+
+
+def test_synthetic_skew():
+    uniform = generate_matrix(20_000, DiseasePatterns.synthetic(200, 50, skew=0.0, seed=1), seed=1)
+    skewed = generate_matrix(20_000, DiseasePatterns.synthetic(200, 50, skew=1.5, seed=1), seed=1)
+    assert skewed.item_counts().max() > 2 * uniform.item_counts().max()
+    with pytest.raises(ValueError):
+        DiseasePatterns.synthetic(5, 3)
@@ -0,0 +1,246 @@
+"""
+Top-K Association Rule Miner
+Returns the K best rules by lift, confidence or support directly, in the
+spirit of TopKRules (Fournier-Viger et al., 2012), instead of hand-tuning
+min_support until generate_association_rules returns a usable rule set.
+
+Itemsets are enumerated depth-first over packed tidsets (as in eclat) and
+their rules are offered to a min-heap holding the K best seen so far. Once
+the heap is full its weakest rule becomes an internal bar that is raised as
+better rules arrive:
+- rank_by='support': the bar is a support count, so whole ECLAT subtrees
+  below it are pruned (support is anti-monotone), exactly as TopKRules;
+- rank_by='confidence': the bar is the confidence cutoff of
+  rule_generator.confident_splits, so consequent growth stops early; once it
+  reaches 1.0 ties are broken by support and the support bar applies too;
+- rank_by='lift': lift(A -> C) <= 1 / support(A u C), but a superset can
+  always have a higher lift, so no subtree can be pruned. Every itemset
+  above the support floor, up to max_len (TOPK_LIFT_MAX_LEN by default), is
+  mined first. Their rules are then offered rarest itemset first, stopping
+  at the first itemset too common to beat the bar; within an itemset the
+  bar also becomes a confidence cutoff (see _TopKHeap.confidence_cutoff).
+Rules are offered to the heap one at a time and only the K best are kept.
+Lift mode also holds every frequent itemset up to max_len in memory.
+
+    rules = top_k_rules(tm, k=100, rank_by='lift', min_confidence=0.6)
+"""
+
+import heapq
+
+import numpy as np
+
+from bitset import popcount, min_count_for
+from eclat import _mine_class, frequent_single_items
+from rule_generator import confident_splits
+from rule_metrics import rules_frame
+from vertical import SupportCounts, as_vertical
+
+
+RANK_METRICS = ('lift', 'confidence', 'support')
+
+# Support floor for rank_by='lift' / 'confidence' when min_support is None.
+# Without one, rules seen in a single patient trivially reach confidence 1
+# and lift n_rows; this is a noise guard, not a tuning threshold.
+TOPK_MIN_SUPPORT = 0.01
+
+# Default max_len for rank_by='lift'. Its search is exhaustive below the
+# floor, and rule generation over the deep itemsets dominates: on dataset.csv
+# at the default floor, K=200 takes ~1s at 4 symptoms, ~5s at 5, and did not
+# finish within 10 minutes unbounded
+TOPK_LIFT_MAX_LEN = 4
+
+# Relative slack on lift upper bounds so float rounding never prunes a tie
+LIFT_MARGIN = 1e-9
+
+
+class _TopKHeap:
+    """K best rules keyed by (rank metric, tie-breaker), weakest on top"""
+
+    def __init__(self, k, rank_by, n_rows, min_count, min_confidence, min_lift):
+        self.k = k
+        self.rank_by = rank_by
+        self.n_rows = n_rows
+        self.floor_count = min_count
+        self.min_confidence = min_confidence
+        self.min_lift = min_lift
+        self.heap = []
+
+    @property
+    def full(self):
+        return len(self.heap) >= self.k
+
+    @property
+    def min_count(self):
+        """Support bar: itemsets below it cannot enter the heap"""
+        if self.full:
+            weakest = self.heap[0][0]
+            if self.rank_by == 'support':
+                return max(self.floor_count, weakest[0])
+            if self.rank_by == 'confidence' and weakest[0] >= 1.0:
+                # No confidence beats 1.0, so only a higher support can
+                return max(self.floor_count, weakest[1] + 1)
+        return self.floor_count
+
+    def confidence_cutoff(self, count):
+        """
+        Confidence bar passed to confident_splits for an itemset with this count
+
+        For lift, a rule A -> C of the itemset has lift <= n_rows / count(A),
+        and growing the consequent only grows count(A), so rules below
+        weakest_lift * count / n_rows cannot lead to a rule that enters the heap.
+        """
+        if not self.full or self.rank_by == 'support':
+            return self.min_confidence
+        weakest = self.heap[0][0][0]
+        if self.rank_by == 'lift':
+            weakest = weakest * count / self.n_rows / (1.0 + LIFT_MARGIN)
+        return max(self.min_confidence, weakest)
+
+    def can_improve(self, itemset, supports):
+        """
+        Whether some rule of itemset may enter the heap
+
+        For lift, count(A) >= count(J - {y}) for every y in C and vice versa.
+        Whichever side holds the item whose removal leaves the most common
+        (m-1)-subset, count(A) * count(C) >= largest * smallest of those counts.
+        """
+        count = supports[itemset]
+        if count < self.min_count:
+            return False
+        if self.full and self.rank_by == 'lift':
+            drop_one = [supports[itemset[:i] + itemset[i + 1:]] for i in range(len(itemset))]
+            bound = self.n_rows * count / (min(drop_one) * max(drop_one)) * (1.0 + LIFT_MARGIN)
+            weakest_lift, weakest_count = self.heap[0][0]
+            return bound > weakest_lift or (bound >= weakest_lift and count > weakest_count)
+        return True
+
+    def exhausted(self, count):
+        """Whether no itemset with this count or more can improve a lift heap"""
+        return self.full and self.n_rows / count * (1.0 + LIFT_MARGIN) < self.heap[0][0][0]
+
+    def offer(self, key, rule):
+        if self.full:
+            if key <= self.heap[0][0]:
+                return
+            heapq.heapreplace(self.heap, (key, rule))
+        else:
+            heapq.heappush(self.heap, (key, rule))
+
+    def add_rules(self, itemset, supports):
+        if not self.can_improve(itemset, supports):
+            return
+        count = supports[itemset]
+        for antecedent, consequent in confident_splits(itemset, supports,
+                                                       self.confidence_cutoff(count)):
+            confidence = count / supports[antecedent]
+            lift = confidence * self.n_rows / supports[consequent]
+            if self.min_lift is not None and lift < self.min_lift:
+                continue
+            if self.rank_by == 'lift':
+                key = (lift, count)
+            elif self.rank_by == 'confidence':
+                key = (confidence, count)
+            else:
+                key = (count, confidence)
+            self.offer(key, (antecedent, consequent))
+
+    def rules(self):
+        """Retained (antecedent, consequent) tuples, best first"""
+        return [rule for _, rule in sorted(self.heap, reverse=True)]
+
+
+def _search(prefix, items, bits, counts, supports, top, max_len):
+    """
+    eclat._mine_class with the heap's support bar in place of a fixed min_count
+
+    The bar is re-read at every level, so subtrees explored after the heap
+    fills are pruned harder than those explored before.
+    """
+    depth = len(prefix) + 1
+    for i in range(len(items)):
+        count = int(counts[i])
+        if count < top.min_count:
+            continue
+        itemset = prefix + (int(items[i]),)
+        key = tuple(sorted(itemset))
+        supports[key] = count
+        if len(key) > 1:
+            top.add_rules(key, supports)
+
+        if max_len is not None and depth >= max_len:
+            continue
+        if i + 1 == len(items):
+            continue
+
+        child_bits = bits[i + 1:] & bits[i]
+        child_counts = popcount(child_bits)
+        keep = child_counts >= top.min_count
+        if keep.any():
+            _search(itemset, items[i + 1:][keep], child_bits[keep], child_counts[keep],
+                    supports, top, max_len)
+
+
+def top_k_rules(df, k=100, rank_by='lift', min_confidence=0.6, min_lift=None,
+                min_support=None, max_len=None):
+    """
+    The k best association rules by rank_by, without a fixed min_support
+
+    df may be a bool DataFrame, TransactionMatrix or VerticalDatabase.
+    min_support is only a floor: rank_by='support' needs none (default: any
+    co-occurrence), while 'lift' / 'confidence' default to TOPK_MIN_SUPPORT.
+    max_len caps the symptoms per rule; for 'lift' it defaults to
+    TOPK_LIFT_MAX_LEN (pass a larger value to search deeper).
+    Returns an mlxtend-style rules frame (same columns as
+    generate_association_rules) sorted by rank_by descending, with at most k
+    rows. Ties are broken by support.
+
+    Lift favours rare itemsets, so its top rules sit near the floor and the
+    search cost grows quickly as min_support drops; confidence and support
+    rankings stay cheap at any floor.
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"rank_by must be one of {RANK_METRICS}, got {rank_by!r}")
+    if min_support is None and rank_by != 'support':
+        min_support = TOPK_MIN_SUPPORT
+    if max_len is None and rank_by == 'lift':
+        max_len = TOPK_LIFT_MAX_LEN
+
+    db = as_vertical(df)
+    bits, columns, n_rows = db.bits, db.symptoms, db.n_rows
+    min_count = max(min_count_for(min_support, n_rows), 1) if min_support else 1
+
+    top = _TopKHeap(k, rank_by, n_rows, min_count, min_confidence, min_lift)
+    # Search-local memo: lift mode counts many candidates near the floor, which
+    # would otherwise stay in the database's shared memo for the whole run
+    supports = SupportCounts(bits)
+
+    items, counts = frequent_single_items(bits, min_count, db.item_counts)
+    if n_rows and len(items) and rank_by == 'lift':
+        found = []
+        _mine_class((), items, bits[items], counts, min_count, max_len, found)
+        found.sort(key=lambda entry: entry[1])
+        supports.update((tuple(sorted(itemset)), count) for itemset, count in found)
+        for itemset, count in found:
+            if top.exhausted(count):
+                break
+            if len(itemset) > 1:
+                top.add_rules(tuple(sorted(itemset)), supports)
+    elif n_rows and len(items):
+        _search((), items, bits[items], counts, supports, top, max_len)
+
+    antecedents, consequents = [], []
+    support, antecedent_support, consequent_support = [], [], []
+    for antecedent, consequent in top.rules():
+        antecedents.append(frozenset(columns[i] for i in antecedent))
+        consequents.append(frozenset(columns[i] for i in consequent))
+        support.append(supports[tuple(sorted(antecedent + consequent))])
+        antecedent_support.append(supports[antecedent])
+        consequent_support.append(supports[consequent])
+
+    scale = 1.0 / n_rows if n_rows else 0.0
+    return rules_frame(antecedents, consequents,
+                       np.array(support, dtype=float) * scale,
+                       np.array(antecedent_support, dtype=float) * scale,
+                       np.array(consequent_support, dtype=float) * scale)
@@ -0,0 +1,188 @@
+"""
+On-Disk Transaction Store
+Compact CSR layout for transaction data that does not fit in memory.
+
+A store is a directory with:
+- indices.u32: symptom codes of every transaction, row after row
+- indptr.i64: row offsets into indices (n_rows + 1 entries)
+- diseases.u32: disease code per row
+- meta.json: symptom / disease vocabularies (code order) and row counts
+
+Writers append chunk by chunk; readers memory-map the arrays and yield
+TransactionMatrix chunks, so memory stays bounded by the chunk size.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from transactions import TransactionMatrix
+
+
+STORE_VERSION = 1
+
+INDICES_FILE = 'indices.u32'
+INDPTR_FILE = 'indptr.i64'
+DISEASES_FILE = 'diseases.u32'
+META_FILE = 'meta.json'
+
+
+class TransactionStoreWriter:
+    """
+    Append-only writer for a transaction store
+
+        with TransactionStoreWriter('data/transactions') as writer:
+            for rows, codes, disease_codes in chunks:
+                writer.append(rows, codes, disease_codes)
+            writer.close(symptoms, diseases)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        # Invalidate a previous store before truncating its arrays
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        self._indices = open(os.path.join(path, INDICES_FILE), 'wb')
+        self._indptr = open(os.path.join(path, INDPTR_FILE), 'wb')
+        self._diseases = open(os.path.join(path, DISEASES_FILE), 'wb')
+        self._indptr.write(np.zeros(1, dtype=np.int64).tobytes())
+        self.n_rows = 0
+        self.n_entries = 0
+        self.n_chunks = 0
+        self.closed = False
+
+    def append(self, rows, codes, disease_codes):
+        """
+        Append one chunk
+
+        rows/codes are (row within chunk, symptom code) pairs sorted by row;
+        disease_codes has one entry per chunk row and fixes the chunk length.
+        """
+        n_chunk_rows = len(disease_codes)
+        row_counts = np.bincount(rows, minlength=n_chunk_rows)
+        offsets = self.n_entries + np.cumsum(row_counts, dtype=np.int64)
+
+        self._indices.write(np.asarray(codes, dtype=np.uint32).tobytes())
+        self._indptr.write(offsets.tobytes())
+        self._diseases.write(np.asarray(disease_codes, dtype=np.uint32).tobytes())
+
+        self.n_rows += n_chunk_rows
+        self.n_entries += len(codes)
+        self.n_chunks += 1
+
+    def close(self, symptoms, diseases, extra=None):
+        """Flush the arrays and write meta.json (vocabularies in code order)"""
+        for f in (self._indices, self._indptr, self._diseases):
+            f.close()
+
+        meta = {
+            'version': STORE_VERSION,
+            'n_rows': self.n_rows,
+            'n_entries': self.n_entries,
+            'n_chunks': self.n_chunks,
+            'symptoms': list(symptoms),
+            'diseases': list(diseases),
+        }
+        if extra:
+            meta.update(extra)
+
+        # Write meta last and atomically: a store without meta.json is incomplete
+        tmp_path = os.path.join(self.path, META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.closed:
+            for f in (self._indices, self._indptr, self._diseases):
+                f.close()
+
+
+class TransactionStore:
+    """
+    Read-only view of a transaction store
+
+    Columns of the matrices it yields follow the sorted symptom vocabulary,
+    matching preprocess_dataset / build_transaction_matrix.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        meta_path = os.path.join(path, META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No transaction store at {path} (missing {META_FILE})")
+
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        if self.meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported transaction store version: {self.meta.get('version')}")
+
+        self.n_rows = self.meta['n_rows']
+        self.disease_names = np.array(self.meta['diseases'], dtype=object)
+
+        # Codes are in first-seen order; expose the sorted vocabulary and a
+        # code -> column remapping
+        code_symptoms = self.meta['symptoms']
+        order = sorted(range(len(code_symptoms)), key=code_symptoms.__getitem__)
+        self.symptoms = [code_symptoms[code] for code in order]
+        self.code_to_column = np.empty(len(code_symptoms), dtype=np.int64)
+        self.code_to_column[order] = np.arange(len(code_symptoms))
+
+        self.indices = self._map(INDICES_FILE, np.uint32, self.meta['n_entries'])
+        self.indptr = self._map(INDPTR_FILE, np.int64, self.n_rows + 1)
+        self.disease_codes = self._map(DISEASES_FILE, np.uint32, self.n_rows)
+
+    def _map(self, name, dtype, length):
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode='r', shape=(length,))
+
+    @property
+    def n_items(self):
+        return len(self.symptoms)
+
+    def item_counts(self):
+        """Rows containing each symptom, streamed over the indices"""
+        counts = np.zeros(self.n_items, dtype=np.int64)
+        step = 1 << 24
+        for start in range(0, len(self.indices), step):
+            codes = self.code_to_column[self.indices[start:start + step]]
+            counts += np.bincount(codes, minlength=self.n_items)
+        return counts
+
+    def read_rows(self, start, stop):
+        """Rows [start, stop) as a dense TransactionMatrix"""
+        stop = min(stop, self.n_rows)
+        lo, hi = int(self.indptr[start]), int(self.indptr[stop])
+
+        row_lengths = np.diff(self.indptr[start:stop + 1])
+        rows = np.repeat(np.arange(stop - start), row_lengths)
+        columns = self.code_to_column[self.indices[lo:hi]]
+
+        matrix = np.zeros((stop - start, self.n_items), dtype=bool)
+        matrix[rows, columns] = True
+
+        ids = np.arange(start + 1, stop + 1)
+        patient_ids = np.array([f'P{i:04d}' for i in ids], dtype=object)
+        diseases = self.disease_names[self.disease_codes[start:stop]]
+
+        return TransactionMatrix(matrix, self.symptoms, diseases, patient_ids)
+
+    def iter_chunks(self, chunk_rows=100_000):
+        """Yield consecutive TransactionMatrix chunks of up to chunk_rows rows"""
+        for start in range(0, self.n_rows, chunk_rows):
+            yield self.read_rows(start, start + chunk_rows)
+
+    def to_matrix(self):
+        """Whole store as one TransactionMatrix (only for data that fits in RAM)"""
+        return self.read_rows(0, self.n_rows)
+
+    def __repr__(self):
+        return f"TransactionStore({self.path!r}, rows={self.n_rows}, symptoms={self.n_items})"
@@ -0,0 +1,127 @@
+"""
+Transaction Matrix
+Canonical in-memory representation of patient symptom transactions,
+shared by the data loaders and every frequent itemset miner.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+NON_SYMPTOM_COLUMNS = ['patient_id', 'disease', 'num_symptoms', 'symptoms']
+
+
+class TransactionMatrix:
+    """
+    Boolean transaction matrix (rows = patients, columns = symptoms)
+
+    Attributes:
+    - matrix: (n_rows x n_items) bool ndarray
+    - symptoms: column vocabulary, one name per matrix column
+    - diseases: optional per-row disease labels
+    - patient_ids: optional per-row patient identifiers
+    """
+
+    def __init__(self, matrix, symptoms, diseases=None, patient_ids=None):
+        matrix = np.asarray(matrix)
+        if matrix.dtype != np.bool_:
+            matrix = matrix.astype(bool)
+        if matrix.ndim != 2 or matrix.shape[1] != len(symptoms):
+            raise ValueError(
+                f"matrix shape {matrix.shape} does not match {len(symptoms)} symptoms")
+
+        self.matrix = matrix
+        self.symptoms = list(symptoms)
+        self.diseases = diseases
+        self.patient_ids = patient_ids
+
+    @classmethod
+    def from_frame(cls, df, symptom_cols=None):
+        """Build from a 0/1 frame such as processed_medical_data.csv"""
+        if symptom_cols is None:
+            symptom_cols = [col for col in df.columns if col not in NON_SYMPTOM_COLUMNS]
+
+        matrix = df[symptom_cols].to_numpy() == 1
+        diseases = df['disease'].to_numpy() if 'disease' in df.columns else None
+        patient_ids = df['patient_id'].to_numpy() if 'patient_id' in df.columns else None
+
+        return cls(matrix, symptom_cols, diseases, patient_ids)
+
+    @property
+    def n_rows(self):
+        return self.matrix.shape[0]
+
+    @property
+    def n_items(self):
+        return self.matrix.shape[1]
+
+    @property
+    def density(self):
+        """Fraction of (row, symptom) cells that are set"""
+        if self.matrix.size == 0:
+            return 0.0
+        return float(np.count_nonzero(self.matrix)) / self.matrix.size
+
+    def item_counts(self):
+        """Number of rows containing each symptom"""
+        return np.count_nonzero(self.matrix, axis=0)
+
+    def take_rows(self, rows):
+        """Subset of rows (boolean mask or index array)"""
+        return TransactionMatrix(
+            self.matrix[rows],
+            self.symptoms,
+            self.diseases[rows] if self.diseases is not None else None,
+            self.patient_ids[rows] if self.patient_ids is not None else None,
+        )
+
+    def drop_empty(self):
+        """
+        Drop rows without symptoms and symptoms that never occur
+
+        Matches what TransactionEncoder produced from the transaction lists,
+        so supports stay identical. Returns self when nothing is dropped.
+        """
+        row_mask = self.matrix.any(axis=1)
+        col_mask = self.matrix.any(axis=0)
+        result = self
+
+        if not row_mask.all():
+            result = result.take_rows(row_mask)
+        if not col_mask.all():
+            keep = np.flatnonzero(col_mask)
+            result = TransactionMatrix(
+                result.matrix[:, keep],
+                [self.symptoms[i] for i in keep],
+                result.diseases,
+                result.patient_ids,
+            )
+
+        return result
+
+    def to_frame(self):
+        """Bool DataFrame view for mlxtend miners (shares the matrix buffer)"""
+        return pd.DataFrame(self.matrix, columns=self.symptoms, copy=False)
+
+    def to_binary_frame(self):
+        """0/1 frame with patient_id and disease, as written to processed_medical_data.csv"""
+        df_binary = pd.DataFrame(self.matrix.view(np.uint8), columns=self.symptoms)
+        if self.diseases is not None:
+            df_binary.insert(0, 'disease', self.diseases)
+        if self.patient_ids is not None:
+            df_binary.insert(0, 'patient_id', self.patient_ids)
+        return df_binary
+
+    def to_sparse(self):
+        """CSR copy of the matrix (requires scipy)"""
+        from scipy import sparse
+        return sparse.csr_matrix(self.matrix)
+
+    def transactions(self):
+        """List-of-lists form, for code that still expects transactions"""
+        symptoms = np.array(self.symptoms, dtype=object)
+        return [list(symptoms[row]) for row in self.matrix]
+
+    def __repr__(self):
+        return (f"TransactionMatrix(rows={self.n_rows}, symptoms={self.n_items}, "
+                f"density={self.density:.4f})")
@@ -0,0 +1,177 @@
+"""
+Vertical Database
+Bit-packed symptom columns shared by the miners, rule metrics and itemset
+queries.
+
+One uint64 tidset per symptom (bit r set when row r has the symptom, see
+bitset.pack_columns): a bit per cell instead of the bool matrix's byte.
+Itemset counts are popcounts of ANDed tidsets. Single-symptom counts are
+computed once when the database is built, and the last MEMO_MAX_ENTRIES
+other itemset counts are memoized, so the rule metrics and ad-hoc queries
+working on one database rarely count the same itemset twice.
+
+    db = VerticalDatabase.from_matrix(tm)
+    db.support(['cough', 'high_fever'])
+    db.rules_frame([['cough']], [['high_fever']])
+    eclat(db, min_support=0.05, use_colnames=True)
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from bitset import n_words, pack_columns, popcount, unpack_columns
+from rule_metrics import rule_metrics, rules_frame
+from transactions import TransactionMatrix
+
+
+MEMO_MAX_ENTRIES = 1 << 18  # Itemset counts kept per database (~50 MB of tuples)
+
+
+class SupportCounts(OrderedDict):
+    """
+    {sorted item index tuple: count}, counting missing itemsets from the tidsets
+
+    With max_entries, the oldest counted itemsets are dropped once the memo
+    is full; a dropped itemset is simply counted again.
+    """
+
+    def __init__(self, bits, max_entries=None):
+        super().__init__()
+        self.bits = bits
+        self.max_entries = max_entries
+
+    def __missing__(self, itemset):
+        tidset = self.bits[itemset[0]]
+        for item in itemset[1:]:
+            tidset = tidset & self.bits[item]
+        count = int(popcount(tidset))
+        if self.max_entries is not None:
+            if self.max_entries < 1:
+                return count
+            while len(self) >= self.max_entries:
+                self.popitem(last=False)
+        self[itemset] = count
+        return count
+
+
+class VerticalDatabase:
+    """
+    Packed tidsets of every symptom
+
+    Attributes:
+    - bits: (n_items x n_words) uint64, row i the tidset of symptom i
+    - symptoms: column vocabulary, one name per tidset
+    - n_rows: transactions; supports are counts / n_rows
+    - item_counts: rows containing each symptom (computed once)
+    - counts: SupportCounts memo shared by every count() / support() call,
+      holding at most memo_max_entries itemsets
+    """
+
+    def __init__(self, bits, symptoms, n_rows, memo_max_entries=MEMO_MAX_ENTRIES):
+        bits = np.ascontiguousarray(bits, dtype=np.uint64)
+        if bits.ndim != 2 or len(bits) != len(symptoms) or bits.shape[1] != n_words(n_rows):
+            raise ValueError(f"bits shape {bits.shape} does not match {len(symptoms)} symptoms "
+                             f"x {n_rows} rows")
+        self.bits = bits
+        self.symptoms = list(symptoms)
+        self.n_rows = int(n_rows)
+        self.positions = {symptom: i for i, symptom in enumerate(self.symptoms)}
+        self.item_counts = popcount(bits)
+        self.counts = SupportCounts(bits, memo_max_entries)
+
+    @classmethod
+    def from_matrix(cls, data):
+        """Pack a TransactionMatrix, bool DataFrame or bool array (columns = symptoms)"""
+        if isinstance(data, TransactionMatrix):
+            matrix, symptoms = data.matrix, data.symptoms
+        elif isinstance(data, pd.DataFrame):
+            matrix, symptoms = data.to_numpy(dtype=bool), list(data.columns)
+        else:
+            matrix = np.asarray(data, dtype=bool)
+            symptoms = list(range(matrix.shape[1]))
+        return cls(pack_columns(matrix), symptoms, matrix.shape[0])
+
+    @property
+    def n_items(self):
+        return len(self.symptoms)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    @property
+    def item_supports(self):
+        return self.item_counts / self.n_rows if self.n_rows else np.zeros(self.n_items)
+
+    def to_matrix(self):
+        """(n_rows x n_items) bool matrix"""
+        return unpack_columns(self.bits, self.n_rows)
+
+    def to_frame(self):
+        """Bool DataFrame, for the mlxtend miners"""
+        return pd.DataFrame(self.to_matrix(), columns=self.symptoms, copy=False)
+
+    def codes(self, itemset):
+        """Sorted symptom index tuple of an itemset given by names"""
+        try:
+            return tuple(sorted(self.positions[item] for item in itemset))
+        except KeyError as e:
+            raise ValueError(f"Unknown symptom {e.args[0]!r}") from None
+
+    def tidset(self, itemset):
+        """Packed rows containing every symptom of a non-empty itemset"""
+        codes = self.codes(itemset)
+        if not codes:
+            raise ValueError("itemset must not be empty")
+        tidset = self.bits[codes[0]]
+        for code in codes[1:]:
+            tidset = tidset & self.bits[code]
+        return tidset
+
+    def rows(self, itemset):
+        """Indices of the rows containing every symptom of itemset"""
+        return np.flatnonzero(unpack_columns(self.tidset(itemset)[None, :], self.n_rows)[:, 0])
+
+    def count(self, itemset):
+        """Rows containing every symptom of itemset (memoized)"""
+        codes = self.codes(itemset)
+        if len(codes) < 2:
+            return int(self.item_counts[codes[0]]) if codes else self.n_rows
+        return self.counts[codes]
+
+    def support(self, itemset):
+        return self.count(itemset) / self.n_rows if self.n_rows else 0.0
+
+    def supports(self, itemsets):
+        """Support of each itemset, as a float array"""
+        counts = np.fromiter((self.count(itemset) for itemset in itemsets), dtype=np.int64,
+                             count=len(itemsets))
+        return counts / self.n_rows if self.n_rows else np.zeros(len(counts))
+
+    def rule_metrics(self, antecedents, consequents):
+        """rule_metrics.rule_metrics of antecedent -> consequent rules given by names"""
+        return rule_metrics(
+            self.supports([tuple(a) + tuple(c) for a, c in zip(antecedents, consequents)]),
+            self.supports(antecedents),
+            self.supports(consequents))
+
+    def rules_frame(self, antecedents, consequents):
+        """mlxtend-style rules frame of antecedent -> consequent rules given by names"""
+        return rules_frame(
+            [frozenset(a) for a in antecedents], [frozenset(c) for c in consequents],
+            self.supports([tuple(a) + tuple(c) for a, c in zip(antecedents, consequents)]),
+            self.supports(antecedents),
+            self.supports(consequents))
+
+    def __repr__(self):
+        return (f"VerticalDatabase(rows={self.n_rows}, symptoms={self.n_items}, "
+                f"{self.nbytes / (1024 * 1024):.1f} MB)")
+
+
+def as_vertical(data):
+    """data itself if it is a VerticalDatabase, else VerticalDatabase.from_matrix(data)"""
+    if isinstance(data, VerticalDatabase):
+        return data
+    return VerticalDatabase.from_matrix(data)
@@ -0,0 +1,255 @@
+"""
+Synthetic Workload Generator
+Vectorized, seeded patient/symptom generator for load and scaling tests.
+
+Patients get a disease, then symptoms from its pattern: each core symptom
+with CORE_PROB, each common one with COMMON_PROB, each rare one with
+RARE_PROB (all scaled by density), and with probability noise NOISE_SYMPTOMS
+distinct extra symptoms it does not already have - the data_generator model.
+Sampling is done per disease block: all of a chunk's patients with one
+disease draw one (patients x pattern symptoms) uniform matrix, so the work
+is NumPy calls per disease rather than Python per patient.
+
+Patterns are either data_generator.DISEASE_PATTERNS (DiseasePatterns.clinical) or
+synthetic: n_diseases patterns over n_symptoms symptoms, with symptom and
+disease popularity following a Zipf law of exponent skew (0 = uniform).
+
+Output streams chunk by chunk into a transaction store (CSR, see
+transaction_store), so 10M+ patients are generated in bounded memory and
+can be mined with partition_miner.mine_out_of_core. Every chunk has its own
+seed derived from (seed, chunk index): the same arguments always produce
+the same store.
+
+    python workload_generator.py --rows 10000000 --symptoms 2000 --diseases 500 \\
+        --output data/synthetic_store
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from transaction_store import TransactionStore, TransactionStoreWriter
+from transactions import TransactionMatrix
+
+
+CORE_PROB = 0.9
+COMMON_PROB = 0.5
+RARE_PROB = 0.1
+NOISE_PROB = 0.05  # Patients with noise symptoms
+NOISE_SYMPTOMS = 2  # Random extra symptoms per noisy patient
+
+# Pattern sizes for synthetic diseases
+CORE_SIZE = 4
+COMMON_SIZE = 4
+RARE_SIZE = 3
+
+CHUNK_ROWS = 1_000_000
+
+
+class DiseasePatterns:
+    """
+    Disease -> core/common/rare symptom codes, plus disease weights
+
+    symptoms and diseases are the vocabularies; core/common/rare are lists
+    (one per disease) of int arrays of symptom codes.
+    """
+
+    def __init__(self, symptoms, diseases, core, common, rare, disease_weights=None,
+                 symptom_weights=None):
+        self.symptoms = list(symptoms)
+        self.diseases = list(diseases)
+        self.core, self.common, self.rare = core, common, rare
+        n = len(self.diseases)
+        self.disease_weights = (np.full(n, 1.0 / n) if disease_weights is None
+                                else np.asarray(disease_weights) / np.sum(disease_weights))
+        self.symptom_weights = symptom_weights
+
+    @classmethod
+    def clinical(cls):
+        """The hand-written patterns of data_generator"""
+        from data_generator import DISEASE_PATTERNS, SYMPTOMS
+
+        symptoms = list(SYMPTOMS)
+        positions = {symptom: i for i, symptom in enumerate(symptoms)}
+
+        def codes(names):
+            return np.array([positions[name] for name in names], dtype=np.int64)
+
+        diseases = list(DISEASE_PATTERNS)
+        return cls(symptoms, diseases,
+                   [codes(DISEASE_PATTERNS[d]['core']) for d in diseases],
+                   [codes(DISEASE_PATTERNS[d]['common']) for d in diseases],
+                   [codes(DISEASE_PATTERNS[d]['rare']) for d in diseases])
+
+    @classmethod
+    def synthetic(cls, n_symptoms, n_diseases, skew=1.0, seed=0):
+        """
+        n_diseases random patterns over n_symptoms symptoms
+
+        Symptom i is drawn into patterns with weight 1 / (i + 1) ** skew and
+        disease j occurs with weight 1 / (j + 1) ** skew, so skew > 0 gives
+        a few very common symptoms and diseases and long tails.
+        """
+        pattern_size = CORE_SIZE + COMMON_SIZE + RARE_SIZE
+        if n_symptoms < pattern_size:
+            raise ValueError(f"n_symptoms must be at least {pattern_size}, got {n_symptoms}")
+
+        rng = np.random.default_rng(seed)
+        symptom_weights = 1.0 / np.arange(1, n_symptoms + 1) ** skew
+        symptom_weights /= symptom_weights.sum()
+
+        core, common, rare = [], [], []
+        for _ in range(n_diseases):
+            picks = rng.choice(n_symptoms, pattern_size, replace=False, p=symptom_weights)
+            core.append(np.sort(picks[:CORE_SIZE]))
+            common.append(np.sort(picks[CORE_SIZE:CORE_SIZE + COMMON_SIZE]))
+            rare.append(np.sort(picks[CORE_SIZE + COMMON_SIZE:]))
+
+        width = len(str(max(n_symptoms, n_diseases)))
+        return cls([f'symptom_{i:0{width}d}' for i in range(n_symptoms)],
+                   [f'disease_{j:0{width}d}' for j in range(n_diseases)],
+                   core, common, rare,
+                   disease_weights=1.0 / np.arange(1, n_diseases + 1) ** skew,
+                   symptom_weights=symptom_weights)
+
+
+def generate_chunk(patterns, n_rows, rng, density=1.0, noise=NOISE_PROB):
+    """
+    One chunk of patients as (rows, codes, disease_codes)
+
+    rows/codes are (row, symptom code) pairs sorted by row then code with
+    no duplicates, the layout TransactionStoreWriter.append takes.
+    """
+    disease_codes = rng.choice(len(patterns.diseases), n_rows, p=patterns.disease_weights)
+    order = np.argsort(disease_codes, kind='stable')
+    bounds = np.searchsorted(disease_codes[order], np.arange(len(patterns.diseases) + 1))
+
+    keys = []
+    for disease in np.flatnonzero(np.diff(bounds)):
+        block = order[bounds[disease]:bounds[disease + 1]]
+        pattern = np.concatenate([patterns.core[disease], patterns.common[disease],
+                                  patterns.rare[disease]])
+        probs = np.concatenate([np.full(len(patterns.core[disease]), CORE_PROB),
+                                np.full(len(patterns.common[disease]), COMMON_PROB),
+                                np.full(len(patterns.rare[disease]), RARE_PROB)])
+        hits = rng.random((len(block), len(pattern))) < np.minimum(probs * density, 1.0)
+        block_rows, slots = np.nonzero(hits)
+        keys.append(block[block_rows].astype(np.int64) << 32 | pattern[slots])
+
+    keys = np.sort(np.concatenate(keys)) if keys else np.zeros(0, dtype=np.int64)
+    # Clinical patterns can list a symptom twice
+    if len(keys):
+        keys = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    noisy = np.flatnonzero(rng.random(n_rows) < noise)
+    if len(noisy):
+        keys = _add_noise(keys, noisy, patterns, rng)
+    return keys >> 32, (keys & 0xFFFFFFFF).astype(np.uint32), disease_codes.astype(np.uint32)
+
+
+def _contains(sorted_keys, keys):
+    """Mask of the keys present in sorted_keys"""
+    if not len(sorted_keys):
+        return np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[positions] == keys
+
+
+def _add_noise(keys, noisy, patterns, rng):
+    """
+    Sorted keys plus NOISE_SYMPTOMS distinct new symptoms per noisy row
+
+    Symptoms are drawn one slot at a time from symptom_weights, redrawing
+    those a row already has: sampling without replacement from the
+    symptoms the patient does not have, as data_generator did.
+    """
+    n_symptoms = len(patterns.symptoms)
+    present = np.bincount(keys >> 32, minlength=noisy.max() + 1)[noisy]
+    wanted = np.minimum(NOISE_SYMPTOMS, n_symptoms - present)
+    rows = noisy.astype(np.int64) << 32
+    picks = np.full((len(noisy), NOISE_SYMPTOMS), -1, dtype=np.int64)
+    for slot in range(NOISE_SYMPTOMS):
+        pending = np.flatnonzero(wanted > slot)
+        while len(pending):
+            codes = rng.choice(n_symptoms, len(pending), p=patterns.symptom_weights)
+            clash = (_contains(keys, rows[pending] | codes)
+                     | (picks[pending, :slot] == codes[:, None]).any(axis=1))
+            picks[pending[~clash], slot] = codes[~clash]
+            pending = pending[clash]
+    # keys is sorted already, so a stable (run-merging) sort is nearly linear
+    return np.sort(np.concatenate([keys, (rows[:, None] | picks)[picks >= 0]]), kind='stable')
+
+
+def _chunk_rngs(seed, n_rows, chunk_rows):
+    """(chunk length, generator) per chunk, seeded from (seed, chunk index)"""
+    for i, start in enumerate(range(0, n_rows, chunk_rows)):
+        yield min(chunk_rows, n_rows - start), np.random.default_rng([seed, i])
+
+
+def generate_store(path, n_rows, patterns=None, density=1.0, noise=NOISE_PROB,
+                   chunk_rows=CHUNK_ROWS, seed=0):
+    """Stream n_rows synthetic patients into a transaction store at path"""
+    patterns = patterns or DiseasePatterns.clinical()
+    print(f"\n[*] Generating {n_rows:,} patients x {len(patterns.symptoms)} symptoms, "
+          f"{len(patterns.diseases)} diseases -> {path}")
+    start = time.perf_counter()
+
+    with TransactionStoreWriter(path) as writer:
+        for n_chunk, rng in _chunk_rngs(seed, n_rows, chunk_rows):
+            writer.append(*generate_chunk(patterns, n_chunk, rng, density, noise))
+            print(f"   Chunk {writer.n_chunks}: {writer.n_rows:,} rows "
+                  f"({writer.n_entries / writer.n_rows:.2f} symptoms/patient)")
+        writer.close(patterns.symptoms, patterns.diseases,
+                     extra={'generator': {'seed': seed, 'density': density, 'noise': noise,
+                                          'chunk_rows': chunk_rows}})
+
+    store = TransactionStore(path)
+    print(f"[OK] Transaction store: {store.n_rows:,} rows x {store.n_items} symptoms "
+          f"in {time.perf_counter() - start:.1f}s")
+    return store
+
+
+def generate_matrix(n_rows, patterns=None, density=1.0, noise=NOISE_PROB,
+                    chunk_rows=CHUNK_ROWS, seed=0):
+    """
+    In-memory TransactionMatrix with the same rows generate_store writes
+
+    Columns are in vocabulary order, not sorted like a store's.
+    """
+    patterns = patterns or DiseasePatterns.clinical()
+    matrix = np.zeros((n_rows, len(patterns.symptoms)), dtype=bool)
+    diseases = np.empty(n_rows, dtype=np.uint32)
+    offset = 0
+    for n_chunk, rng in _chunk_rngs(seed, n_rows, chunk_rows):
+        rows, codes, disease_codes = generate_chunk(patterns, n_chunk, rng, density, noise)
+        matrix[offset + rows, codes] = True
+        diseases[offset:offset + n_chunk] = disease_codes
+        offset += n_chunk
+    return TransactionMatrix(matrix, patterns.symptoms,
+                             np.array(patterns.diseases, dtype=object)[diseases])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic transaction store")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="patients to generate")
+    parser.add_argument('--symptoms', type=int, default=None,
+                        help="synthetic symptom count (default: data_generator's clinical patterns)")
+    parser.add_argument('--diseases', type=int, default=100,
+                        help="synthetic disease count (with --symptoms)")
+    parser.add_argument('--density', type=float, default=1.0,
+                        help="scale on the core/common/rare symptom probabilities")
+    parser.add_argument('--skew', type=float, default=1.0,
+                        help="Zipf exponent of symptom/disease popularity (0 = uniform)")
+    parser.add_argument('--noise', type=float, default=NOISE_PROB,
+                        help=f"fraction of patients with {NOISE_SYMPTOMS} random extra symptoms")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='data/synthetic_store')
+    args = parser.parse_args()
+
+    if args.symptoms:
+        patterns = DiseasePatterns.synthetic(args.symptoms, args.diseases, args.skew, args.seed)
+    else:
+        patterns = DiseasePatterns.clinical()
+    generate_store(args.output, args.rows, patterns, args.density, args.noise,
+                   args.chunk_rows, args.seed)